@@ -0,0 +1,249 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Fixtures and baseline handling for the CLI benchmark suite.
+
+Every console script declared in ``hirc-duckdb-demo/pyproject.toml`` and
+``smart-crowd-counter/pyproject.toml`` is run end to end in a fresh
+interpreter (exactly like its installed entry point) against a stub
+``snow`` on ``PATH``.  A run checks each script's exit code and
+``snow`` call count, and reports the median of ``--bench-rounds`` runs
+next to ``baseline.json``.  With ``--bench-compare`` a script also fails
+when it is slower than its baseline by more than ``--bench-threshold``
+(relative) *and* ``--bench-min-delta`` seconds (absolute, to absorb
+timer noise); wall times depend on the machine, so that gate is opt-in.
+
+Each script is also timed "warm": handed to a ``hirc-demo-daemon`` /
+``scc-daemon`` started once for the session, so cold and warm latency
+are reported side by side.  The warm hirc daemon runs ``--backend fake``
+(one reused in-process session, no ``snow`` spawn); the stub's latency
+stands in for ``snow`` start-up and login, while per-statement round
+trips cost the same on either path and are left out.
+
+``--update-baseline`` rewrites ``baseline.json`` from the current run
+instead of comparing.  Baselines are machine specific -- record one on
+the machine that runs the comparison.
+"""
+
+import json
+import os
+import platform
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).parent
+REPO_ROOT = BENCH_DIR.parent
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+PACKAGES = ("hirc-duckdb-demo", "smart-crowd-counter")
+
+# Union of the .env variables the commands require; values are never
+# sent anywhere because every `snow` call hits the stub.
+FAKE_ENV = {
+    "SNOWFLAKE_DEFAULT_CONNECTION_NAME": "bench",
+    "SNOWFLAKE_USER": "BENCH_USER",
+    "SNOWFLAKE_WAREHOUSE": "BENCH_WH",
+    "SA_ROLE": "BENCH_SA_ROLE",
+    "EXTERNAL_VOLUME_NAME": "BENCH_VOLUME",
+    "DEMO_DATABASE": "BENCH_DB",
+    "DEMO_SCHEMA": "BENCH_SCHEMA",
+    "DEMO_STAGE": "BENCH_STAGE",
+    "AI_MODEL": "claude-sonnet-4-5",
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-compare", action="store_true",
+                    help="Fail scripts slower than benchmarks/baseline.json (machine specific)")
+    group.addoption("--update-baseline", action="store_true",
+                    help="Write benchmarks/baseline.json from this run instead of comparing")
+    group.addoption("--bench-rounds", type=int, default=5,
+                    help="Runs per script; the median is reported (default: 5)")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="Allowed slowdown against the baseline, relative (default: 0.25)")
+    group.addoption("--bench-min-delta", type=float, default=0.05,
+                    help="Slowdowns below this many seconds never fail (default: 0.05)")
+    group.addoption("--snow-latency", type=float,
+                    default=float(os.environ.get("FAKE_SNOW_LATENCY", "0.05")),
+                    help="Seconds the stub snow sleeps per call (default: $FAKE_SNOW_LATENCY or 0.05)")
+
+
+def _declared_scripts() -> dict[str, tuple[str, str]]:
+    """Return ``{script: (package_dir, "module:function")}`` from both pyprojects."""
+    try:
+        import tomllib
+    except ModuleNotFoundError:  # Python 3.10
+        import tomli as tomllib
+
+    scripts = {}
+    for package in PACKAGES:
+        data = tomllib.loads((REPO_ROOT / package / "pyproject.toml").read_text())
+        for name, target in data["project"].get("scripts", {}).items():
+            scripts[name] = (package, target)
+    return scripts
+
+
+SCRIPTS = _declared_scripts()
+
+# In-process tests import both packages from the tree, like the scripts'
+# PYTHONPATH below.
+sys.path[:0] = [str(REPO_ROOT / p) for p in PACKAGES]
+
+
+@pytest.fixture(scope="session")
+def fake_snow(tmp_path_factory, pytestconfig):
+    """Install the stub ``snow`` in a temp bin dir; return that dir and the latency."""
+    bin_dir = tmp_path_factory.mktemp("bin")
+    snow = bin_dir / "snow"
+    snow.write_text(f"#!{sys.executable}\n" + (BENCH_DIR / "fake_snow.py").read_text())
+    snow.chmod(snow.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return {"bin_dir": bin_dir, "latency": pytestconfig.getoption("--snow-latency")}
+
+
+def _base_env(fake_snow: dict) -> dict[str, str]:
+    env = {k: v for k, v in os.environ.items()
+           if k not in FAKE_ENV and not k.startswith(("HIRC_DEMO_", "SCC_"))}
+    env.update(FAKE_ENV)
+    env["PATH"] = f"{fake_snow['bin_dir']}{os.pathsep}{env.get('PATH', '')}"
+    env["PYTHONPATH"] = os.pathsep.join(str(REPO_ROOT / p) for p in PACKAGES)
+    env["FAKE_SNOW_LATENCY"] = str(fake_snow["latency"])
+    return env
+
+
+@pytest.fixture
+def script_env(fake_snow, tmp_path):
+    """Environment for one cold script run: stub snow on PATH, fake .env values."""
+    env = _base_env(fake_snow)
+    # Never hand work to a daemon the developer happens to be running.
+    env["HIRC_DEMO_NO_DAEMON"] = env["SCC_NO_DAEMON"] = "1"
+    env["HIRC_DEMO_BACKEND"] = "snow"
+    env["FAKE_SNOW_LOG"] = str(tmp_path / "snow-calls.jsonl")
+    return env
+
+
+@pytest.fixture(scope="session")
+def stand_in(tmp_path_factory):
+    """Serve generated S_1K bench tables from a local Iceberg REST catalog stand-in."""
+    pytest.importorskip("pyiceberg", reason="needs the bench extra (uv sync --extra bench)")
+    from hirc_demo.bench import StandInCatalog, generate
+
+    warehouse = tmp_path_factory.mktemp("warehouse")
+    generate(warehouse, 1_000)
+    catalog = StandInCatalog(warehouse).start()
+    yield catalog
+    catalog.stop()
+
+
+@pytest.fixture(scope="session")
+def daemons(fake_snow, tmp_path_factory):
+    """Start hirc-demo-daemon and scc-daemon on private sockets for the session."""
+    run_dir = tmp_path_factory.mktemp("daemons")
+    sockets = {
+        "HIRC_DEMO_DAEMON_SOCKET": (run_dir / "hirc-demo.sock", "hirc_demo.daemon"),
+        "SCC_DAEMON_SOCKET": (run_dir / "scc.sock", "smart_crowd_counter.daemon"),
+    }
+    env = _base_env(fake_snow)
+    env.update({name: str(path) for name, (path, _) in sockets.items()})
+    procs = []
+    for path, module in sockets.values():
+        runner = f"from {module} import daemon; daemon()"
+        args = ["start", "--foreground", "--idle-timeout", "600"]
+        if module.startswith("hirc_demo"):
+            # The warm hirc daemon keeps one (fake) connector session open
+            # instead of spawning snow per step.
+            args += ["--backend", "fake"]
+        procs.append(subprocess.Popen(
+            [sys.executable, "-c", runner, *args],
+            env=env, cwd=run_dir, stderr=subprocess.DEVNULL,
+        ))
+    deadline = time.monotonic() + 30
+    while not all(path.exists() for path, _ in sockets.values()):
+        if time.monotonic() > deadline or any(p.poll() is not None for p in procs):
+            pytest.fail("daemons did not start")
+        time.sleep(0.05)
+    yield {name: str(path) for name, (path, _) in sockets.items()}
+    for proc in procs:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+@pytest.fixture
+def warm_env(script_env, daemons):
+    """Environment for one script run handed to the warm daemons."""
+    env = dict(script_env)
+    del env["HIRC_DEMO_NO_DAEMON"], env["SCC_NO_DAEMON"], env["HIRC_DEMO_BACKEND"]
+    env.update(daemons)
+    return env
+
+
+class Results:
+    """Medians collected during the session, compared to or saved as the baseline.
+
+    ``cold`` holds plain runs, ``warm`` runs handed to the daemons.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.medians: dict[str, dict[str, float]] = {"cold": {}, "warm": {}}
+        try:
+            self.baseline = json.loads(BASELINE_FILE.read_text())
+        except (OSError, ValueError):
+            self.baseline = {}
+
+    def baseline_for(self, mode: str, script: str) -> float | None:
+        if self.baseline.get("snow_latency") != self.config.getoption("--snow-latency"):
+            return None
+        return self.baseline.get(mode, {}).get(script)
+
+    def save(self) -> None:
+        data = {
+            "snow_latency": self.config.getoption("--snow-latency"),
+            "rounds": self.config.getoption("--bench-rounds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(terse=True),
+        }
+        for mode, medians in self.medians.items():
+            data[mode] = {k: round(v, 3) for k, v in sorted(medians.items())}
+        BASELINE_FILE.write_text(json.dumps(data, indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def bench_results(pytestconfig):
+    return pytestconfig._bench_results
+
+
+def pytest_configure(config):
+    config._bench_results = Results(config)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    results = session.config._bench_results
+    if session.config.getoption("--update-baseline") and results.medians["cold"]:
+        results.save()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config._bench_results
+    cold, warm = results.medians["cold"], results.medians["warm"]
+    if not cold and not warm:
+        return
+    tr = terminalreporter
+    tr.section("CLI benchmarks (median wall time)")
+    tr.write_line(f"stub snow latency {config.getoption('--snow-latency')}s, "
+                  f"{config.getoption('--bench-rounds')} rounds")
+    tr.write_line(f"  {'script':<24} {'cold':>8} {'warm':>8} {'saved':>8}  baseline cold/warm")
+    for script in sorted(set(cold) | set(warm)):
+        c, w = cold.get(script), warm.get(script)
+        saved = f"{c - w:8.3f}" if c is not None and w is not None else f"{'-':>8}"
+        base = [results.baseline_for(m, script) for m in ("cold", "warm")]
+        base_text = "/".join("-" if b is None else f"{b:.3f}" for b in base)
+        tr.write_line(
+            f"  {script:<24} {'-' if c is None else f'{c:.3f}':>8}"
+            f" {'-' if w is None else f'{w:.3f}':>8} {saved}  {base_text}"
+        )
+    if config.getoption("--update-baseline"):
+        tr.write_line(f"baseline written to {BASELINE_FILE.relative_to(REPO_ROOT)}")
@@ -0,0 +1,137 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Stand-in for the ``snow`` CLI used by the benchmark suite.
+
+Installed on ``PATH`` as ``snow`` by ``conftest.py``.  Sleeps
+``FAKE_SNOW_LATENCY`` seconds to simulate snowflake-cli start-up, login
+and the statement round trips, appends its argv as one JSON line to
+``FAKE_SNOW_LOG`` and fails like ``snow sql`` would when ``-f`` names a
+missing file.  ``FAKE_SNOW_FAIL`` makes it fail any ``-f`` file whose
+text contains that string (one attendee's database in a fleet, say).
+
+``FAKE_SNOW_OBJECTS`` names a JSON file ``{"databases": [...], "roles":
+[...]}`` of rows (``name``, ``created_on``, ``owner``) standing in for
+the account: ``SHOW DATABASES|ROLES LIKE '...'`` prints the matching rows
+(as JSON with ``--format json``) and ``DROP DATABASE|ROLE IF EXISTS``
+removes them, so ``scc-gc``/``hirc-demo-gc`` can run end to end.
+A script that PUTs files to ``@SCC_ANALYZE`` and calls ``AI_COMPLETE``
+(``scc-analyze --backend cortex``) gets one row per file back, with
+counts derived from the file size.  A script ending in the telemetry
+query-history block gets one history row per statement before it (with
+``--format json``), the latency spread evenly across them.  Nothing is
+ever sent to Snowflake.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+_SHOW = re.compile(r"SHOW\s+(DATABASES|ROLES)\s+LIKE\s+'([^']*)'", re.IGNORECASE)
+_DROP = re.compile(r"DROP\s+(DATABASE|ROLE)\s+IF\s+EXISTS\s+([\w$]+)", re.IGNORECASE)
+_PUT = re.compile(r"PUT\s+'file://([^']+)'\s+@SCC_ANALYZE/(\d+)/", re.IGNORECASE)
+
+
+def _analyze(sql: str) -> list[dict]:
+    """One AI_COMPLETE result row per file the script PUTs to @SCC_ANALYZE."""
+    rows = []
+    for path, folder in _PUT.findall(sql):
+        total = 5 + os.path.getsize(path) % 50
+        rows.append({
+            "RELATIVE_PATH": f"{folder}/{os.path.basename(path)}",
+            "RESPONSE": json.dumps({"total_attendees": total, "raised_hands": total // 3}),
+        })
+    return rows
+
+
+def _history(sql: str, latency: float) -> list[dict]:
+    """Query-history rows for the statements before the telemetry block."""
+    script = sql[:sql.index("-- >>> telemetry")]
+    statements = [s.strip() for s in re.split(r";\s*\n", script) if s.strip()]
+    statements = [s for s in statements
+                  if any(line.strip() and not line.strip().startswith("--")
+                         for line in s.splitlines())]
+    each = latency / max(len(statements), 1)
+    start = datetime.now(timezone.utc) - timedelta(seconds=latency)
+    rows = []
+    for i, text in enumerate(statements):
+        begin = start + timedelta(seconds=i * each)
+        first = next(line for line in text.splitlines()
+                     if line.strip() and not line.strip().startswith("--"))
+        rows.append({
+            "QUERY_ID": f"fake-{i:04d}",
+            "QUERY_TYPE": first.split()[0].upper(),
+            "QUERY_TEXT": text,
+            "EXECUTION_STATUS": "SUCCESS",
+            "START_TIME": begin.isoformat(),
+            "END_TIME": (begin + timedelta(seconds=each)).isoformat(),
+            "TOTAL_ELAPSED_TIME": int(each * 1000),
+            "COMPILATION_TIME": int(each * 200),
+            "EXECUTION_TIME": int(each * 800),
+            "QUEUED_TIME": 0,
+            "ROWS_PRODUCED": 0,
+        })
+    return rows
+
+
+def _account(sql: str, store: str) -> list[dict]:
+    """Apply the script's SHOW/DROP statements to ``store``; return the SHOW rows."""
+    rows: list[dict] = []
+    with open(store, "r+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        objects = json.load(f)
+        for kind, pattern in _SHOW.findall(sql):
+            like = re.compile("^" + re.escape(pattern).replace("%", ".*").replace("_", ".") + "$",
+                              re.IGNORECASE)
+            rows = [o for o in objects.get(kind.lower(), []) if like.match(o["name"])]
+        dropped = {(kind.lower() + "s", name.upper()) for kind, name in _DROP.findall(sql)}
+        if dropped:
+            for kind in ("databases", "roles"):
+                objects[kind] = [o for o in objects.get(kind, [])
+                                 if (kind, o["name"].upper()) not in dropped]
+            f.seek(0)
+            f.truncate()
+            json.dump(objects, f, indent=2)
+    return rows
+
+
+def main(argv: list[str]) -> int:
+    time.sleep(float(os.environ.get("FAKE_SNOW_LATENCY", "0")))
+    log = os.environ.get("FAKE_SNOW_LOG")
+    if log:
+        with open(log, "a") as f:
+            f.write(json.dumps(argv) + "\n")
+    if "-f" in argv:
+        path = argv[argv.index("-f") + 1]
+        if not os.path.isfile(path):
+            print(f"Error: file {path} does not exist", file=sys.stderr)
+            return 1
+        fail = os.environ.get("FAKE_SNOW_FAIL")
+        if fail:
+            with open(path) as f:
+                if fail in f.read():
+                    print(f"Error: SQL compilation error: '{fail}' (FAKE_SNOW_FAIL)",
+                          file=sys.stderr)
+                    return 1
+        with open(path) as f:
+            sql = f.read()
+        rows = _analyze(sql) if "AI_COMPLETE" in sql else []
+        if os.environ.get("FAKE_SNOW_OBJECTS"):
+            rows = _account(sql, os.environ["FAKE_SNOW_OBJECTS"])
+        if "--format" in argv and argv[argv.index("--format") + 1] == "json":
+            if "QUERY_HISTORY_BY_SESSION" in sql:
+                latency = float(os.environ.get("FAKE_SNOW_LATENCY", "0"))
+                print(json.dumps([rows, _history(sql, latency)] if rows
+                                 else [_history(sql, latency)]))
+                return 0
+            print(json.dumps(rows))
+            return 0
+        print(f"+ {os.path.basename(path)}: statement executed successfully")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,140 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""End-to-end wall time of every declared console script.
+
+Each script runs in a fresh interpreter exactly as its installed entry
+point would (``from module import func; sys.exit(func())``), so a run
+covers interpreter start-up, imports, ``_require_env`` (.env loading),
+``_get_sql_dir`` resolution and the ``snow sql`` subprocess hop(s).
+The ``warm`` variant runs the same command with the daemons listening.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import BENCH_DIR, REPO_ROOT, SCRIPTS
+
+ADMIN = ["--admin-role", "ACCOUNTADMIN"]
+# Rounds share a working directory, so hirc steps would be skipped as
+# unchanged after the first one.
+APPLY = ADMIN + ["--force"]
+DEMO = ["--demo-role", "BENCH_DEMO_ROLE"]
+# Fleets provision one demo per line of attendees.txt, unthrottled.
+FLEET = ["{bench}/attendees.txt", "--rate", "0", "--report", "{tmp}/fleet.json"]
+
+# Arguments for a real (non --dry-run) invocation, and the number of
+# `snow` calls it should make when run cold.  Every declared script must appear here
+# or in SKIPPED so new entry points cannot silently escape the suite.
+ARGS: dict[str, tuple[list[str], int]] = {
+    "hirc-demo-setup": (APPLY, 1),
+    "hirc-demo-data": (APPLY, 1),
+    "hirc-demo-rbac": (APPLY, 1),
+    "hirc-demo-revoke-rbac": (APPLY, 1),
+    "hirc-demo-cleanup": (APPLY, 1),
+    "hirc-demo-run": (["setup", "data", "rbac", *APPLY], 3),
+    "hirc-demo-plan": (["setup", "data", "rbac", *ADMIN], 0),
+    "hirc-demo-fleet": (["{repo}/example-manifests/hirc-duckdb-demo-manifest.md", *FLEET,
+                         "--batch"], 4),
+    # No FAKE_SNOW_OBJECTS: discovery finds nothing to drop.
+    "hirc-demo-gc": (ADMIN + ["--yes"], 1),
+    # Against the stand-in Iceberg REST catalog; DuckDB only, no snow.
+    "hirc-demo-query": (["SELECT status, count(*) FROM snowflake_catalog.S_1K.ORDERS"
+                         " GROUP BY ALL", "--output", "{tmp}/orders.parquet"], 0),
+    # Summarize the recorded scc-up and hirc-demo-run runs in telemetry.jsonl.
+    "hirc-demo-telemetry": (["--log", "{bench}/telemetry.jsonl", "--all"], 0),
+    "scc-create-role": (ADMIN + DEMO, 1),
+    "scc-setup": (DEMO, 1),
+    "scc-create-warehouse": (ADMIN + DEMO + ["--warehouse", "BENCH_WH"], 1),
+    "scc-cleanup": (DEMO, 1),
+    "scc-cleanup-role": (ADMIN + DEMO, 1),
+    "scc-up": (ADMIN + DEMO + ["--create-warehouse", "--report", "{tmp}/scc-up.json"], 5),
+    "scc-reprocess": (DEMO + ["--all"], 1),
+    "scc-fleet": (["{repo}/example-manifests/smart-crowd-counter-manifest.md", *FLEET], 16),
+    "scc-gc": (ADMIN + ["--yes"], 2),
+    # Cortex backend: one snow call per batch of two photos, two workers.
+    "scc-analyze": (["{bench}/photos", *DEMO, "--batch-size", "2", "--workers", "2"], 2),
+    "scc-telemetry": (["--log", "{bench}/telemetry.jsonl", "--all"], 0),
+}
+
+# hirc scripts that spawn snow even under the warm daemon.
+SPAWN_SNOW = {"hirc-demo-fleet", "hirc-demo-gc"}
+# Scripts pointed at the stand-in catalog through HIRC_DEMO_CATALOG_ENDPOINT.
+NEEDS_CATALOG = {"hirc-demo-query"}
+
+SKIPPED: dict[str, str] = {
+    "hirc-demo-bench": "a DuckDB benchmark itself; needs the bench extra, not snow",
+    "hirc-demo-replay": "one-shot: marks the working manifest COMPLETE; times as hirc-demo-run",
+    "scc-replay": "one-shot: writes the working manifest and .env; times as scc-up",
+    "hirc-demo-daemon": "manages the daemon; timed through the warm runs",
+    "scc-daemon": "manages the daemon; timed through the warm runs",
+}
+
+
+def _command(script: str, tmp) -> list[str]:
+    _, target = SCRIPTS[script]
+    module, func = target.split(":")
+    paths = {"{tmp}": tmp, "{repo}": REPO_ROOT, "{bench}": BENCH_DIR}
+    args = []
+    for arg in ARGS[script][0]:
+        for placeholder, path in paths.items():
+            arg = arg.replace(placeholder, str(path))
+        args.append(arg)
+    runner = f"import sys; from {module} import {func}; sys.argv[0] = {script!r}; sys.exit({func}())"
+    return [sys.executable, "-c", runner, *args]
+
+
+def _expected_snow_calls(script: str, mode: str) -> int:
+    # The warm hirc daemon runs SQL over its in-process session instead;
+    # fleet and gc always spawn snow (they need parallel sessions or JSON).
+    if mode == "warm" and script.startswith("hirc-demo-") and script not in SPAWN_SNOW:
+        return 0
+    return ARGS[script][1]
+
+
+def test_every_script_is_covered():
+    missing = set(SCRIPTS) - set(ARGS) - set(SKIPPED)
+    assert not missing, f"add benchmark args (or a skip reason) for: {', '.join(sorted(missing))}"
+    stale = (set(ARGS) | set(SKIPPED)) - set(SCRIPTS)
+    assert not stale, f"no longer declared in any pyproject.toml: {', '.join(sorted(stale))}"
+
+
+@pytest.mark.parametrize("mode", ["cold", "warm"])
+@pytest.mark.parametrize("script", sorted(SCRIPTS))
+def test_script_wall_time(script, mode, request, tmp_path, pytestconfig, bench_results):
+    if script in SKIPPED:
+        pytest.skip(SKIPPED[script])
+    env = request.getfixturevalue("script_env" if mode == "cold" else "warm_env")
+    if script in NEEDS_CATALOG:
+        env = dict(env, HIRC_DEMO_CATALOG_ENDPOINT=request.getfixturevalue("stand_in").endpoint)
+
+    cmd = _command(script, tmp_path)
+    calls_log = tmp_path / "snow-calls.jsonl"
+    samples = []
+    for _ in range(pytestconfig.getoption("--bench-rounds")):
+        calls_log.unlink(missing_ok=True)
+        start = time.perf_counter()
+        result = subprocess.run(cmd, env=env, cwd=tmp_path, capture_output=True, text=True)
+        samples.append(time.perf_counter() - start)
+        assert result.returncode == 0, result.stdout + result.stderr
+        calls = [json.loads(line) for line in calls_log.read_text().splitlines()] \
+            if calls_log.exists() else []
+        assert len(calls) == _expected_snow_calls(script, mode), calls
+
+    median = statistics.median(samples)
+    bench_results.medians[mode][script] = median
+
+    baseline = bench_results.baseline_for(mode, script)
+    if (baseline is None or not pytestconfig.getoption("--bench-compare")
+            or pytestconfig.getoption("--update-baseline")):
+        return
+    allowed = max(baseline * (1 + pytestconfig.getoption("--bench-threshold")),
+                  baseline + pytestconfig.getoption("--bench-min-delta"))
+    assert median <= allowed, (
+        f"{script} ({mode}): median {median:.3f}s exceeds baseline {baseline:.3f}s "
+        f"(allowed {allowed:.3f}s)"
+    )
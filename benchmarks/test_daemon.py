@@ -0,0 +1,49 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Requests the warm hirc-demo daemon cannot run must not take it down."""
+
+import click
+import pytest
+
+from hirc_demo import daemon
+
+
+@pytest.fixture
+def hirc_daemon(daemons, monkeypatch):
+    monkeypatch.setenv("HIRC_DEMO_DAEMON_SOCKET", daemons["HIRC_DEMO_DAEMON_SOCKET"])
+    monkeypatch.delenv("HIRC_DEMO_NO_DAEMON", raising=False)
+    return lambda message: daemon._exchange(daemon._connect(10), message)
+
+
+def _request(tmp_path, target: str) -> dict:
+    return {"op": "run", "target": target, "prog": "hirc-demo-new",
+            "argv": [], "cwd": str(tmp_path), "env": {}}
+
+
+def test_unknown_command_falls_back(hirc_daemon, tmp_path):
+    # A client newer than the daemon names a command the daemon never loaded.
+    for target in ("hirc_demo.cli:no_such_cmd", "hirc_demo.no_such_module:run"):
+        assert hirc_daemon(_request(tmp_path, target)) == \
+            {"error": "unknown command", "fallback": True}
+    assert "pid" in hirc_daemon({"op": "status"})
+
+
+def test_bad_request_keeps_serving(hirc_daemon):
+    reply = hirc_daemon({"op": "run"})
+    assert reply["exit"] == 1 and "target" in reply["error"]
+    assert "pid" in hirc_daemon({"op": "status"})
+
+
+def test_client_runs_unknown_command_locally(hirc_daemon, capsys):
+    ran = []
+
+    def no_such_cmd():
+        ran.append(True)
+
+    no_such_cmd.__module__ = "hirc_demo.cli"
+    command = click.command(cls=daemon.DaemonCommand)(no_such_cmd)
+    with pytest.raises(SystemExit) as exit_info:
+        command.main([], "hirc-demo-new")
+    assert exit_info.value.code == 0
+    assert ran == [True]
+    assert "does not know this command" in capsys.readouterr().err
@@ -0,0 +1,43 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""In-process executor state that must not leak between daemon callers."""
+
+import os
+
+from conftest import FAKE_ENV
+from hirc_demo import executor, fake_connector
+from hirc_demo.daemon import _Server
+
+
+def test_sessions_are_keyed_by_snowflake_env(monkeypatch):
+    backend = executor.ConnectorExecutor("fake", fake_connector.connect)
+    monkeypatch.setenv("SNOWFLAKE_ROLE", "ANALYST")
+    analyst = backend.session("bench")
+    assert backend.session("bench") is analyst
+
+    # Another caller with the same connection name but other settings
+    monkeypatch.setenv("SNOWFLAKE_ROLE", "ADMIN")
+    admin = backend.session("bench")
+    assert admin is not analyst
+
+    monkeypatch.setenv("SNOWFLAKE_ROLE", "ANALYST")
+    assert backend.session("bench") is analyst
+    backend.close()
+
+
+def test_daemon_request_leaves_no_timings(tmp_path):
+    server = _Server(tmp_path / "daemon.sock", idle_timeout=60, backend="fake")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    try:
+        code = server._run({
+            "target": "hirc_demo.cli:run",
+            "prog": "hirc-demo-run",
+            "argv": ["setup", "data", "--admin-role", "ACCOUNTADMIN", "--force"],
+            "cwd": str(tmp_path),
+            "env": {**os.environ, **FAKE_ENV},
+        }, [devnull] * 3)
+    finally:
+        os.close(devnull)
+    assert code == 0
+    assert (tmp_path / ".snow-utils" / "hirc-demo-timings.json").exists()
+    assert executor.timings == []
@@ -0,0 +1,47 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``export_query`` round trips: write each format in batches, read it back."""
+
+import duckdb
+import pytest
+
+from hirc_demo.export import FORMATS, export_query
+
+ROWS = 10_000
+SQL = f"""
+SELECT i AS id,
+       'fruit-' || i || CASE WHEN i % 7 = 0 THEN ' "quoted", ünïcode' ELSE '' END AS name,
+       (i % 1000 / 100)::DECIMAL(10,2) AS price,
+       DATE '2025-01-01' + (i % 365)::INTEGER AS sold_on,
+       CASE WHEN i % 5 = 0 THEN NULL ELSE i % 2 = 0 END AS in_stock
+FROM range({ROWS}) t(i)
+"""
+READERS = {"parquet": "read_parquet", "csv": "read_csv", "ndjson": "read_json"}
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_round_trip(fmt, tmp_path):
+    conn = duckdb.connect()
+    path = tmp_path / f"out.{fmt}"
+    with open(path, "wb") as sink:
+        stats = export_query(conn, SQL, sink, fmt, batch_rows=3_000)
+    assert (stats.rows, stats.batches) == (ROWS, 4)
+    assert stats.bytes_written == path.stat().st_size
+
+    # CSV and JSON readers infer types; cast back to the source's.
+    back = conn.execute(
+        "SELECT id, name, price::DECIMAL(10,2), sold_on::DATE, in_stock::BOOLEAN"
+        f" FROM {READERS[fmt]}(?) ORDER BY id", [str(path)]
+    ).fetchall()
+    assert len(back) == ROWS
+    assert back == conn.execute(f"SELECT * FROM ({SQL}) ORDER BY id").fetchall()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_empty_result(fmt, tmp_path):
+    path = tmp_path / f"empty.{fmt}"
+    with open(path, "wb") as sink:
+        stats = export_query(duckdb.connect(), f"SELECT * FROM ({SQL}) LIMIT 0", sink, fmt)
+    assert stats.rows == 0
+    if fmt == "ndjson":
+        assert path.read_bytes() == b""
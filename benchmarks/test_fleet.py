@@ -0,0 +1,53 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-fleet`` failure handling against the stub ``snow``.
+
+One attendee failing must not stop the others, and the failed-attendees
+file must feed straight back in, Snowflake user column included.
+"""
+
+import json
+import subprocess
+import sys
+
+from conftest import REPO_ROOT
+from smart_crowd_counter.fleet import read_attendees
+
+RUNNER = ("import sys; from smart_crowd_counter.fleet import fleet; "
+          "sys.argv[0] = 'scc-fleet'; sys.exit(fleet())")
+MANIFEST = REPO_ROOT / "example-manifests" / "smart-crowd-counter-manifest.md"
+
+
+def _fleet(env, tmp_path, attendees: str) -> tuple[subprocess.CompletedProcess, dict]:
+    (tmp_path / "attendees.csv").write_text(attendees)
+    result = subprocess.run(
+        [sys.executable, "-c", RUNNER, str(MANIFEST), "attendees.csv", "--rate", "0"],
+        env=env, cwd=tmp_path, capture_output=True, text=True,
+    )
+    report = json.loads((tmp_path / ".snow-utils" / "scc-fleet-report.json").read_text())
+    return result, {a["name"]: a for a in report["attendees"]}
+
+
+def test_failed_attendee_is_retryable(script_env, tmp_path):
+    env = dict(script_env, FAKE_SNOW_FAIL="DAVE_CROWD_COUNTER_DB")
+    result, attendees = _fleet(env, tmp_path, "CAROL,carol_sf\nDAVE,dave_sf\nEVE\n")
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert {name: a["status"] for name, a in attendees.items()} == \
+        {"CAROL": "ok", "DAVE": "failed", "EVE": "ok"}
+    assert attendees["DAVE"]["failed_step"] == "database"
+    assert "FAKE_SNOW_FAIL" in attendees["DAVE"]["output"][-1]
+
+    failed_file = tmp_path / ".snow-utils" / "scc-fleet-failed.txt"
+    assert f"scc-fleet {MANIFEST} {failed_file.relative_to(tmp_path)}" in result.stderr
+    (retry,) = read_attendees(failed_file.read_text().splitlines())
+    assert (retry.name, retry.user) == ("DAVE", "dave_sf")
+
+
+def test_spawn_error_is_recorded(script_env, tmp_path):
+    # No snow on PATH: every attendee fails at its first step, still reported.
+    env = dict(script_env, PATH=str(tmp_path))
+    result, attendees = _fleet(env, tmp_path, "CAROL\nDAVE\n")
+    assert result.returncode == 1, result.stdout + result.stderr
+    for attendee in attendees.values():
+        assert (attendee["status"], attendee["failed_step"]) == ("failed", "role")
+        assert attendee["output"][-1].startswith("FileNotFoundError")
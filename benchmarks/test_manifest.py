@@ -0,0 +1,141 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""The snow-utils manifest parser, run against both shipped example manifests.
+
+``hirc_demo/manifest.py`` and ``smart_crowd_counter/manifest.py`` are the
+same module copied into each self-contained skill; every test runs
+against both copies, and ``test_copies_are_identical`` keeps them in sync.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+from hirc_demo import manifest as hirc_manifest
+from smart_crowd_counter import manifest as scc_manifest
+
+HIRC_EXAMPLE = REPO_ROOT / "example-manifests" / "hirc-duckdb-demo-manifest.md"
+SCC_EXAMPLE = REPO_ROOT / "example-manifests" / "smart-crowd-counter-manifest.md"
+
+
+@pytest.fixture(params=[hirc_manifest, scc_manifest], ids=["hirc_demo", "smart_crowd_counter"])
+def mod(request):
+    return request.param
+
+
+def test_copies_are_identical():
+    hirc = REPO_ROOT / "hirc-duckdb-demo" / "hirc_demo" / "manifest.py"
+    scc = REPO_ROOT / "smart-crowd-counter" / "smart_crowd_counter" / "manifest.py"
+    assert hirc.read_text() == scc.read_text(), (
+        f"{hirc.relative_to(REPO_ROOT)} and {scc.relative_to(REPO_ROOT)} must stay identical;"
+        " apply the change to both"
+    )
+
+
+def test_hirc_example_blocks(mod):
+    m = mod.load(HIRC_EXAMPLE)
+    assert m.is_shared and m.instruction.startswith("CORTEX_CODE_INSTRUCTION")
+    assert m.shared_by == "ALICE"
+    assert [(b.skill, b.key) for b in m.blocks] == [
+        ("snow-utils-pat", "ALICE_HIRC_DUCKDB_DEMO_RUNNER"),
+        ("snow-utils-networks", "ALICE_HIRC_DUCKDB_DEMO_RUNNER"),
+        ("snow-utils-volumes", "ALICE_HIRC_DUCKDB_DEMO_VOL"),
+        ("hirc-duckdb-demo", "ALICE_HIRC_DUCKDB_DEMO"),
+    ]
+    demo = m.block("hirc-duckdb-demo")
+    assert demo.title == "HIRC DuckDB Demo: ALICE_HIRC_DUCKDB_DEMO"
+    assert demo.get("Database") == "ALICE_HIRC_DUCKDB_DEMO"
+    assert demo.status == "REMOVED"
+    assert HIRC_EXAMPLE.read_text().splitlines()[demo.end - 1].startswith("<!-- END --")
+    assert len(demo.tables) == 1 and len(demo.tables[0].rows) == 5
+    assert m.sections["admin_role"].values == {"hirc-duckdb-demo": "ACCOUNTADMIN"}
+    assert "snow-utils-pat: https://github.com/kameshsampath/snow-utils-skills/snow-utils-pat" \
+        in m.sections["dependent_skills"].items
+
+
+def test_scc_example_blocks(mod):
+    m = mod.load(SCC_EXAMPLE)
+    assert m.shared_by == "BOB"
+    assert m.sections["shared_info"].values["notes"].splitlines()[0].startswith(
+        "Smart Crowd Counter - Streamlit app")
+    (block,) = m.blocks
+    assert (block.skill, block.key, block.status) == ("smart-crowd-counter", None, None)
+    assert block.get("Demo Role") == "BOB_SCC_ACCESS"
+    assert block.fields["Warehouse"].adapt == "Use your warehouse"
+    assert block.tables[0].headers == ["#", "Type", "Name", "Location", "Notes"]
+
+
+@pytest.mark.parametrize("example, count", [(HIRC_EXAMPLE, 12), (SCC_EXAMPLE, 5)])
+def test_adapt_markers(mod, example, count):
+    m = mod.load(example)
+    assert len(m.marks) == count
+    # Every marked value still carries the sharer's prefix.
+    assert m.unadapted() == m.marks
+    lines = example.read_text().splitlines()
+    assert all("# ADAPT:" in lines[mark.line - 1] for mark in m.marks)
+    assert all("# ADAPT" not in mark.value for mark in m.marks)
+
+
+def test_scc_table_markers(mod):
+    table_marks = [(m.label, m.value) for m in mod.load(SCC_EXAMPLE).marks if "table" in m.label]
+    assert table_marks == [("Role (table)", "BOB_SCC_ACCESS"),
+                           ("Database (table)", "BOB_CROWD_COUNTER_DB")]
+
+
+def test_prefix_swap(mod):
+    m = mod.adapt(mod.load(HIRC_EXAMPLE), "carol")
+    assert m.unadapted() == []
+    assert [(b.skill, b.key) for b in m.blocks][-1] == ("hirc-duckdb-demo", "CAROL_HIRC_DUCKDB_DEMO")
+    volume = m.block("snow-utils-volumes")
+    assert volume.get("S3 Bucket") == "carol-hirc-duckdb-demo"
+    assert volume.get("IAM Role ARN") == \
+        "arn:aws:iam::123456789012:role/carol-hirc-duckdb-demo-snowflake-role"
+    # Unmarked text mentioning the value follows it; the shared_by line does not.
+    demo = m.block("hirc-duckdb-demo")
+    assert demo.title == "HIRC DuckDB Demo: CAROL_HIRC_DUCKDB_DEMO"
+    assert demo.tables[0].rows[0]["Name"] == "CAROL_HIRC_DUCKDB_DEMO"
+    assert m.shared_by == "ALICE"
+
+
+def test_rename_and_unknown_rename(mod):
+    m = mod.adapt(mod.load(SCC_EXAMPLE), "CAROL", {"BOB_WH": "COMPUTE_WH"})
+    block = m.block("smart-crowd-counter")
+    assert (block.get("Warehouse"), block.get("Demo Role")) == ("COMPUTE_WH", "CAROL_SCC_ACCESS")
+    with pytest.raises(mod.ManifestError, match="BOB_SCHEMA not marked # ADAPT:"):
+        mod.adapt(mod.load(SCC_EXAMPLE), renames={"BOB_SCHEMA": "X"})
+
+
+@pytest.mark.parametrize("text, error", [
+    ("<!-- START -- a:x -->\n<!-- START -- b:y -->\n", "START for b inside the a block"),
+    ("<!-- START -- a:x -->\n<!-- END -- a:y -->\n", "END for a without a matching START"),
+    ("<!-- START -- a:x -->\n**Status:** COMPLETE\n", "START for a has no matching END"),
+    ("## s\n| a | b |\n| 1 | 2 |\n", "table row without a header separator"),
+    ("## s\n| a | b |\n|---|---|\n| 1 |\n", "table row has 1 cells, header has 2"),
+])
+def test_malformed(mod, text, error):
+    with pytest.raises(mod.ManifestError, match=error):
+        mod.parse(text)
+
+
+@pytest.mark.parametrize("module, example, extra", [
+    ("hirc_demo.replay", HIRC_EXAMPLE, ["--skip-dependency-check"]),
+    ("smart_crowd_counter.replay", SCC_EXAMPLE, []),
+])
+def test_replay_refuses_unadapted_values(script_env, tmp_path, module, example, extra):
+    runner = f"import sys; from {module} import replay; sys.exit(replay())"
+
+    def replay(*args):
+        return subprocess.run([sys.executable, "-c", runner, str(example), *extra, *args],
+                              env=script_env, cwd=tmp_path, capture_output=True, text=True)
+
+    refused = replay("--dry-run")
+    assert refused.returncode == 1
+    assert "still use the shared_by prefix" in refused.stderr
+    assert "--as-user" in refused.stderr
+
+    adapted = replay("--as-user", "CAROL", "--dry-run")
+    assert adapted.returncode == 0, adapted.stdout + adapted.stderr
+    assert "CAROL_" in adapted.stdout
+    assert not (tmp_path / ".snow-utils" / "snow-utils-manifest.md").exists()
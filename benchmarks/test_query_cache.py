@@ -0,0 +1,147 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``DataFileCache`` against the bench stand-in Iceberg REST catalog.
+
+Each test generates its own S_1K warehouse (one data file per table) and
+changes it through pyiceberg, so snapshots and schemas evolve the way a
+Snowflake-managed table would behind Horizon.
+"""
+
+import shutil
+
+import pytest
+
+pytest.importorskip("pyiceberg", reason="needs the bench extra (uv sync --extra bench)")
+
+import duckdb  # noqa: E402
+from hirc_demo.bench import DATABASE, StandInCatalog, generate  # noqa: E402
+from hirc_demo import query  # noqa: E402
+from hirc_demo.query import DEFAULT_ALIAS, DataFileCache, attach_catalog  # noqa: E402
+from pyiceberg.catalog.sql import SqlCatalog  # noqa: E402
+
+ORDERS = f"{DEFAULT_ALIAS}.S_1K.ORDERS"
+PRODUCTS = f"{DEFAULT_ALIAS}.S_1K.PRODUCTS"
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    path = tmp_path / "warehouse"
+    generate(path, 1_000)
+    return path
+
+
+@pytest.fixture
+def catalog(warehouse):
+    stand_in = StandInCatalog(warehouse).start()
+    yield stand_in
+    stand_in.stop()
+
+
+def _connect(stand_in: StandInCatalog) -> duckdb.DuckDBPyConnection:
+    conn = duckdb.connect()
+    attach_catalog(conn, DATABASE, stand_in.endpoint)
+    return conn
+
+
+def _table(warehouse, name: str):
+    catalog = SqlCatalog("bench", uri=f"sqlite:///{warehouse / 'catalog.db'}",
+                         warehouse=warehouse.as_uri())
+    return catalog.load_table(("S_1K", name))
+
+
+def _count(conn, view: str) -> int:
+    return conn.execute(f"SELECT count(*) FROM {view}").fetchone()[0]
+
+
+def test_repeat_scan_is_served_locally(catalog, warehouse, tmp_path):
+    cache = DataFileCache(tmp_path / "cache")
+    conn = _connect(catalog)
+    _, first = cache.register(conn, ORDERS)
+    assert (first.files, first.hits, first.downloaded) == (1, 0, 1)
+
+    # With the remote data files gone, only local copies can answer.
+    shutil.move(warehouse / "S_1K" / "ORDERS" / "data", tmp_path / "moved")
+    conn = _connect(catalog)
+    view, again = cache.register(conn, ORDERS)
+    assert again.snapshot_id == first.snapshot_id
+    assert (again.files, again.hits, again.downloaded, again.bytes_downloaded) == (1, 1, 0, 0)
+    assert _count(conn, view) == 1_000
+
+
+def test_misses_are_streamed_in_chunks(catalog, warehouse, tmp_path, monkeypatch):
+    chunks = []
+    read_chunks = query._read_chunks
+
+    def recording(*args):
+        for chunk in read_chunks(*args):
+            chunks.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(query, "_CHUNK_BYTES", 4096)
+    monkeypatch.setattr(query, "_read_chunks", recording)
+    cache = DataFileCache(tmp_path / "cache")
+    files, stats = cache.local_files(_connect(catalog), ORDERS)
+    assert len(chunks) > 1 and max(chunks) <= 4096
+    assert sum(chunks) == stats.bytes_downloaded
+    (source,) = (warehouse / "S_1K" / "ORDERS" / "data").glob("*.parquet")
+    assert files[0].read_bytes() == source.read_bytes()
+    assert not list((tmp_path / "cache" / "objects").glob("*.part"))
+
+
+def test_lru_eviction_keeps_cache_under_limit(catalog, tmp_path):
+    conn = _connect(catalog)
+    sizes = {}
+    for table in (ORDERS, PRODUCTS):
+        _, stats = DataFileCache(tmp_path / "sizes").register(conn, table)
+        sizes[table] = stats.bytes_downloaded
+
+    # Room for either table's files, not both.
+    limit = max(sizes.values())
+    cache = DataFileCache(tmp_path / "cache", max_bytes=limit)
+    cache.register(conn, ORDERS)
+    _, stats = cache.register(conn, PRODUCTS)
+    assert stats.evicted == 1
+    assert cache.total_bytes == sizes[PRODUCTS] <= limit
+
+    # ORDERS was evicted, so it is downloaded again and PRODUCTS, now least
+    # recently used, makes room for it.
+    _, stats = cache.register(conn, ORDERS)
+    assert (stats.downloaded, stats.evicted) == (1, 1)
+    assert cache.total_bytes == sizes[ORDERS] <= limit
+    on_disk = list((tmp_path / "cache" / "objects").glob("*/*.parquet"))
+    assert len(on_disk) == 1
+
+    # The index survives a restart.
+    assert DataFileCache(tmp_path / "cache", max_bytes=limit).total_bytes == sizes[ORDERS]
+
+
+def test_new_snapshot_invalidates_cached_file_set(catalog, warehouse, tmp_path):
+    cache = DataFileCache(tmp_path / "cache")
+    _, first = cache.register(_connect(catalog), PRODUCTS)
+
+    table = _table(warehouse, "PRODUCTS")
+    table.append(table.scan().to_arrow())
+
+    conn = _connect(catalog)
+    view, stats = cache.register(conn, PRODUCTS)
+    assert stats.snapshot_id != first.snapshot_id
+    # The unchanged file is reused; only the appended one is fetched.
+    assert (stats.files, stats.hits, stats.downloaded) == (2, 1, 1)
+    assert _count(conn, view) == 2_000
+    assert [k for k in cache._index["snapshots"] if k.startswith(PRODUCTS + "@")] == [
+        f"{PRODUCTS}@{stats.snapshot_id}/0"
+    ]
+
+
+def test_schema_change_falls_back_to_remote_scan(catalog, warehouse, tmp_path):
+    cache = DataFileCache(tmp_path / "cache")
+    cache.register(_connect(catalog), PRODUCTS)
+
+    with _table(warehouse, "PRODUCTS").update_schema() as update:
+        update.rename_column("name", "label")
+
+    conn = _connect(catalog)
+    view, stats = cache.register(conn, PRODUCTS)
+    assert stats.files == 0
+    columns = [d[0] for d in conn.execute(f"SELECT * FROM {view} LIMIT 0").description]
+    assert columns == ["product_id", "label", "category", "price"]
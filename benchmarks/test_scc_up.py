@@ -0,0 +1,59 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-up`` failure handling against the stub ``snow``.
+
+Without ``--create-warehouse`` the DAG is ``role`` then ``database`` and
+``warehouse_grants`` together, then ``setup`` (needs ``database``).
+Failing ``database`` must skip ``setup`` while the already running
+``warehouse_grants`` still finishes.  ``--batch`` runs every step as one
+submission, and each step reports that submission's time.
+"""
+
+import json
+import subprocess
+import sys
+
+RUNNER = ("import sys; from smart_crowd_counter.orchestrator import up; "
+          "sys.argv[0] = 'scc-up'; sys.exit(up())")
+
+
+def test_failed_step_skips_dependents(script_env, tmp_path):
+    env = dict(script_env, FAKE_SNOW_FAIL="CREATE DATABASE IF NOT EXISTS")
+    report = tmp_path / ".snow-utils" / "scc-up-report.json"
+    result = subprocess.run(
+        [sys.executable, "-c", RUNNER, "--admin-role", "ACCOUNTADMIN",
+         "--demo-role", "BENCH_DEMO_ROLE"],
+        env=env, cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "FAKE_SNOW_FAIL" in result.stderr
+
+    steps = {s["name"]: s for s in json.loads(report.read_text())["steps"]}
+    assert {name: s["status"] for name, s in steps.items()} == {
+        "role": "ok",
+        "database": "failed",
+        "warehouse_grants": "ok",
+        "setup": "skipped",
+    }
+    assert steps["database"]["returncode"] == 1
+    assert steps["setup"]["started_at"] is None
+
+    calls = [json.loads(line) for line in (tmp_path / "snow-calls.jsonl").read_text().splitlines()]
+    assert len(calls) == 3, calls
+
+
+def test_batch_report_times_every_step(script_env, tmp_path):
+    report = tmp_path / ".snow-utils" / "scc-up-report.json"
+    result = subprocess.run(
+        [sys.executable, "-c", RUNNER, "--admin-role", "ACCOUNTADMIN",
+         "--demo-role", "BENCH_DEMO_ROLE", "--batch"],
+        env=script_env, cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    data = json.loads(report.read_text())
+    assert data["batch"] and "serial_seconds" not in data
+    assert {s["status"] for s in data["steps"]} == {"ok"}
+    assert {s["seconds"] for s in data["steps"]} == {data["total_seconds"]}
+    # The summary table shows each step's time, not "-".
+    assert not any(line.endswith(" -") for line in result.stdout.splitlines())
@@ -0,0 +1,100 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Applied-step state (``hirc_demo.state``): what the commands skip and re-run.
+
+The commands run end to end against the stub ``snow``, as in
+``test_cli_scripts.py``; a step that is skipped makes no ``snow`` call.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+from hirc_demo import state
+
+ADMIN = ["--admin-role", "ACCOUNTADMIN"]
+
+
+@pytest.fixture
+def hirc(script_env, tmp_path):
+    """Run a hirc-demo command in ``tmp_path``; return (snow calls, output)."""
+    calls_log = tmp_path / "snow-calls.jsonl"
+
+    def run(func: str, *args: str) -> tuple[int, str]:
+        calls_log.unlink(missing_ok=True)
+        runner = f"import sys; from hirc_demo.cli import {func}; sys.exit({func}())"
+        result = subprocess.run([sys.executable, "-c", runner, *args], env=script_env,
+                                cwd=tmp_path, capture_output=True, text=True)
+        assert result.returncode == 0, result.stdout + result.stderr
+        calls = len(calls_log.read_text().splitlines()) if calls_log.exists() else 0
+        return calls, result.stdout
+
+    return run
+
+
+def _applied(tmp_path) -> set[str]:
+    return set(json.loads((tmp_path / ".snow-utils" / "hirc-demo-state.json").read_text()))
+
+
+def test_unchanged_step_is_skipped(hirc):
+    assert hirc("setup", *ADMIN)[0] == 1
+    calls, out = hirc("setup", *ADMIN)
+    assert calls == 0
+    assert "Skipping demo_setup.sql: unchanged since" in out
+    assert hirc("setup", *ADMIN, "--force")[0] == 1
+
+
+def test_changed_template_reruns(hirc, tmp_path):
+    # Commands prefer ./sql over the package's copy.
+    shutil.copytree(REPO_ROOT / "hirc-duckdb-demo" / "sql", tmp_path / "sql")
+    assert hirc("setup", *ADMIN)[0] == 1
+    before = json.loads((tmp_path / ".snow-utils" / "hirc-demo-state.json").read_text())
+
+    template = tmp_path / "sql" / "demo_setup.sql"
+    template.write_text(template.read_text() + "\nSHOW SCHEMAS;\n")
+    assert hirc("setup", *ADMIN)[0] == 1
+    after = json.loads((tmp_path / ".snow-utils" / "hirc-demo-state.json").read_text())
+    assert after["demo_setup"]["sha256"] != before["demo_setup"]["sha256"]
+
+
+def test_changed_variables_rerun(hirc):
+    assert hirc("setup", *ADMIN)[0] == 1
+    assert hirc("setup", "--admin-role", "SYSADMIN")[0] == 1
+
+
+def test_cleanup_invalidates_dependent_steps(hirc, tmp_path):
+    assert hirc("run", "setup", "data", "rbac", *ADMIN)[0] == 3
+    assert hirc("run", "setup", "data", "rbac", *ADMIN)[0] == 0
+    assert _applied(tmp_path) == {"demo_setup", "sample_data", "rbac"}
+
+    assert hirc("cleanup", *ADMIN)[0] == 1
+    assert _applied(tmp_path) == {"cleanup"}
+    assert hirc("run", "setup", "data", "rbac", *ADMIN)[0] == 3
+
+
+def test_revoke_rbac_invalidates_rbac(hirc, tmp_path):
+    assert hirc("run", "setup", "data", "rbac", *ADMIN)[0] == 3
+    assert hirc("revoke_rbac", *ADMIN)[0] == 1
+    assert _applied(tmp_path) == {"demo_setup", "sample_data", "revoke_rbac"}
+    calls, out = hirc("run", "setup", "data", "rbac", *ADMIN)
+    assert calls == 1
+    assert "Skipping sample_data.sql" in out
+
+
+def test_status_within_one_flow(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state.record("rbac", "abc", "snow")
+    assert state.status("rbac", "abc") == ("unchanged", state.load()["rbac"])
+    assert state.status("rbac", "def")[0] == "changed"
+    # revoke_rbac earlier in the same flow undoes rbac before it is recorded.
+    assert state.status("rbac", "abc", earlier=["revoke_rbac"])[0] == "invalidated"
+    assert state.status("cleanup", "abc")[0] == "new"
+
+    state.record("sample_data", "123", "snow")
+    assert set(state.load()) == {"sample_data"}
+    state.forget("cleanup")
+    assert state.load() == {}
@@ -0,0 +1,457 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``hirc-demo-bench`` -- benchmark DuckDB over Iceberg through a local REST catalog.
+
+The demo itself only runs a ``LIMIT 5`` sample, which says nothing about
+catalog attach latency, metadata resolution or scan throughput.
+``hirc-demo-bench`` measures the same ``ATTACH ... TYPE iceberg`` path
+without a Snowflake account:
+
+- :class:`StandInCatalog` serves the read side of the Iceberg REST
+  catalog API (config, namespaces, tables) from a pyiceberg SQLite
+  catalog whose metadata and data files live under ``--warehouse``, and
+  counts the requests it serves;
+- :func:`generate` writes ``ORDERS`` (``--scale`` rows, in ``order_date``
+  order) and a 1,000-row ``PRODUCTS`` table into one namespace per scale
+  (``S_10K``, ``S_1M``, ...) and reuses them on later runs;
+- every combination of scale, ``--threads`` and ``--cache`` opens a fresh
+  DuckDB connection, attaches the stand-in with
+  :func:`~hirc_demo.query.attach_catalog` (``sql/demo.sql`` without the
+  secret), resolves both tables' metadata and runs the query set in
+  ``sql/bench/`` once cold and ``--repeat`` times warm.
+
+Cache settings:
+
+- ``off`` -- DuckDB's external file cache and Parquet metadata cache
+  disabled, so every run reads the data files again;
+- ``duckdb`` -- both enabled;
+- ``datafile`` -- tables served from :class:`~hirc_demo.query.DataFileCache`
+  views, as ``hirc-demo-query --cached`` does (the first combination
+  fills the cache).
+
+Storage is the local filesystem, so the numbers isolate DuckDB and
+Iceberg metadata overhead from network transfer.  The stand-in and the
+table generator need pyiceberg (``uv sync --extra bench``).  ``--serve``
+keeps the stand-in running so ``hirc-demo-query`` can be pointed at it
+with ``HIRC_DEMO_CATALOG_ENDPOINT``.  A benchmark owns its process, so
+this command never runs inside ``hirc-demo-daemon``.
+"""
+
+import importlib.util
+import json
+import shutil
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import click
+import duckdb
+
+from hirc_demo.cli import _get_sql_dir, parse_rows
+from hirc_demo.query import DEFAULT_ALIAS, DataFileCache, _quote, attach_catalog
+
+DATABASE = "HIRC_BENCH"
+CACHE_MODES = ("off", "duckdb", "datafile")
+TABLES = ("ORDERS", "PRODUCTS")
+PRODUCTS = 1_000
+TARGET_FILE_BYTES = 16 * 1024**2
+DEFAULT_WAREHOUSE = ".snow-utils/hirc-demo-bench"
+
+_CATALOG = "bench"
+
+_PRODUCTS_SQL = f"""
+SELECT i::INTEGER AS product_id,
+       'product-' || i AS name,
+       ['Fruit', 'Vegetable', 'Dairy', 'Bakery', 'Pantry', 'Frozen', 'Drinks', 'Snacks']
+         [1 + i % 8] AS category,
+       (1 + hash(i, 'price') % 5000 / 100)::DECIMAL(10,2) AS price
+FROM range({PRODUCTS}) t(i)
+"""
+
+_ORDERS_SQL = f"""
+SELECT i AS order_id,
+       (hash(i, 'product') % {PRODUCTS})::INTEGER AS product_id,
+       (hash(i, 'customer') % 100000)::INTEGER AS customer_id,
+       DATE '2025-01-01' + (hash(i, 'date') % 365)::INTEGER AS order_date,
+       (1 + hash(i, 'quantity') % 10)::INTEGER AS quantity,
+       (hash(i, 'amount') % 100000 / 100)::DECIMAL(10,2) AS amount,
+       ['PLACED', 'SHIPPED', 'DELIVERED', 'RETURNED']
+         [1 + (hash(i, 'status') % 4)::INTEGER] AS status,
+       ['AMER', 'EMEA', 'APJ'][1 + (hash(i, 'region') % 3)::INTEGER] AS region
+FROM range({{rows}}) t(i)
+ORDER BY order_date, order_id
+"""
+
+
+def namespace(rows: int) -> str:
+    """Namespace holding the tables for ``rows`` ORDERS rows (``S_100K``)."""
+    for suffix, size in (("B", 1_000_000_000), ("M", 1_000_000), ("K", 1_000)):
+        if rows % size == 0:
+            return f"S_{rows // size}{suffix}"
+    return f"S_{rows}"
+
+
+# -- stand-in catalog ---------------------------------------------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    stand_in: "StandInCatalog"
+
+    def _reply(self) -> None:
+        status, body = self.stand_in.route(self.command, self.path)
+        if not isinstance(body, bytes):
+            body = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_HEAD = do_POST = _reply
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def _error(status: int, kind: str, message: str) -> tuple[int, dict]:
+    return status, {"error": {"message": message, "type": kind, "code": status}}
+
+
+class StandInCatalog:
+    """Read-only Iceberg REST catalog over a pyiceberg SQLite catalog."""
+
+    def __init__(self, warehouse: Path, port: int = 0):
+        self.warehouse = Path(warehouse).resolve()
+        self.requests = 0
+        self._lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"stand_in": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "StandInCatalog":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _query(self, sql: str, *params: str) -> list[tuple]:
+        with sqlite3.connect(self.warehouse / "catalog.db") as db:
+            return db.execute(sql, (_CATALOG, *params)).fetchall()
+
+    def route(self, method: str, path: str) -> tuple[int, dict | bytes | None]:
+        """Answer one REST request: ``(status, JSON body or raw metadata)``."""
+        with self._lock:
+            self.requests += 1
+        parts = [unquote(p) for p in urlparse(path).path.strip("/").split("/")]
+        if parts[:1] != ["v1"]:
+            return _error(404, "NotFoundException", f"no route for {path}")
+        parts = parts[1:]
+        if parts == ["config"]:
+            return 200, {"defaults": {}, "overrides": {}}
+        if parts == ["oauth", "tokens"] and method == "POST":
+            return 200, {"access_token": "stand-in", "token_type": "bearer", "expires_in": 3600}
+        if parts[:1] != ["namespaces"] or len(parts) > 4:
+            return _error(404, "NotFoundException", f"no route for {path}")
+
+        namespaces = {row[0] for row in self._query(
+            "SELECT table_namespace FROM iceberg_tables WHERE catalog_name = ?"
+            " UNION SELECT namespace FROM iceberg_namespace_properties WHERE catalog_name = ?",
+            _CATALOG)}
+        if len(parts) == 1:
+            return 200, {"namespaces": [[ns] for ns in sorted(namespaces)]}
+        ns = parts[1]
+        if ns not in namespaces:
+            return _error(404, "NoSuchNamespaceException", f"namespace {ns} does not exist")
+        if len(parts) == 2:
+            return 200, {"namespace": [ns], "properties": {}}
+        if parts[2] != "tables":
+            return _error(404, "NotFoundException", f"no route for {path}")
+        if len(parts) == 3:
+            names = self._query("SELECT table_name FROM iceberg_tables"
+                                " WHERE catalog_name = ? AND table_namespace = ?"
+                                " ORDER BY table_name", ns)
+            return 200, {"identifiers": [{"namespace": [ns], "name": n} for n, in names]}
+        found = self._query("SELECT metadata_location FROM iceberg_tables"
+                            " WHERE catalog_name = ? AND table_namespace = ? AND table_name = ?",
+                            ns, parts[3])
+        if not found:
+            return _error(404, "NoSuchTableException", f"table {ns}.{parts[3]} does not exist")
+        if method == "HEAD":
+            return 204, None
+        location = found[0][0]
+        metadata = Path(unquote(urlparse(location).path)).read_bytes()
+        return 200, (b'{"metadata-location": ' + json.dumps(location).encode()
+                     + b', "metadata": ' + metadata + b', "config": {}}')
+
+
+# -- data generation ----------------------------------------------------------
+
+
+def generate(warehouse: Path, rows: int) -> tuple[str, bool]:
+    """Create ORDERS and PRODUCTS for ``rows`` unless present; return (namespace, created)."""
+    from pyiceberg.catalog.sql import SqlCatalog
+
+    warehouse = Path(warehouse).resolve()
+    warehouse.mkdir(parents=True, exist_ok=True)
+    catalog = SqlCatalog(_CATALOG, uri=f"sqlite:///{warehouse / 'catalog.db'}",
+                         warehouse=warehouse.as_uri())
+    ns = namespace(rows)
+    if all(catalog.table_exists((ns, table)) for table in TABLES):
+        return ns, False
+    catalog.create_namespace_if_not_exists(ns)
+    for table, sql in (("PRODUCTS", _PRODUCTS_SQL), ("ORDERS", _ORDERS_SQL.format(rows=rows))):
+        if catalog.table_exists((ns, table)):
+            catalog.drop_table((ns, table))
+        data = duckdb.sql(sql).fetch_arrow_table()
+        created = catalog.create_table(
+            (ns, table), schema=data.schema,
+            properties={"write.target-file-size-bytes": str(TARGET_FILE_BYTES)})
+        created.append(data)
+    return ns, True
+
+
+# -- benchmark ----------------------------------------------------------------
+
+
+@dataclass
+class Result:
+    """One timed step of one scale/threads/cache combination."""
+
+    scale: str
+    threads: int
+    cache: str
+    step: str
+    first_s: float
+    warm_s: float | None = None
+    rows_per_s: float | None = None
+    requests: int = 0
+
+
+def load_queries(names: tuple[str, ...] = ()) -> dict[str, str]:
+    """Read ``sql/bench/*.sql`` as ``{name: sql}``, optionally only ``names``."""
+    queries = {p.stem: p.read_text() for p in sorted((_get_sql_dir() / "bench").glob("*.sql"))}
+    if not queries:
+        raise click.ClickException(f"No queries in {_get_sql_dir() / 'bench'}")
+    unknown = [n for n in names if n not in queries]
+    if unknown:
+        raise click.BadParameter(f"unknown {', '.join(unknown)}; choose from"
+                                 f" {', '.join(queries)}", param_hint="--query")
+    return {n: sql for n, sql in queries.items() if not names or n in names}
+
+
+def _timed(stand_in: StandInCatalog, action) -> tuple[float, int]:
+    before = stand_in.requests
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start, stand_in.requests - before
+
+
+def run_combination(stand_in: StandInCatalog, rows: int, threads: int, cache: str,
+                    queries: dict[str, str], repeat: int) -> list[Result]:
+    """Attach on a fresh connection, resolve metadata and run every query."""
+    ns = namespace(rows)
+    conn = duckdb.connect()
+    try:
+        conn.execute("SET enable_progress_bar = false")
+        conn.execute(f"SET threads = {threads}")
+        enabled = "true" if cache == "duckdb" else "false"
+        conn.execute(f"SET enable_external_file_cache = {enabled}")
+        conn.execute(f"SET parquet_metadata_cache = {enabled}")
+        for ext in ("iceberg", "httpfs"):
+            conn.execute(f"LOAD {ext}")
+
+        def result(step: str, first: tuple[float, int], warm: float | None = None) -> Result:
+            return Result(namespace(rows), threads, cache, step, round(first[0], 4),
+                          None if warm is None else round(warm, 4),
+                          round(rows / warm) if warm else None,
+                          first[1])
+
+        results = [result("attach", _timed(
+            stand_in, lambda: attach_catalog(conn, DATABASE, stand_in.endpoint)))]
+        conn.execute(f"USE {DEFAULT_ALIAS}.{ns}")
+
+        def resolve() -> None:
+            if cache == "datafile":
+                files = DataFileCache(stand_in.warehouse / "datafile-cache")
+                for table in TABLES:
+                    files.register(conn, f"{DEFAULT_ALIAS}.{ns}.{table}")
+            else:
+                for table in TABLES:
+                    conn.execute("SELECT count(*) FROM"
+                                 f" iceberg_metadata({DEFAULT_ALIAS}.{ns}.{table})").fetchall()
+
+        results.append(result("metadata", _timed(stand_in, resolve)))
+        for name, sql in queries.items():
+            first = _timed(stand_in, lambda: conn.execute(sql).fetchall())
+            warm = [_timed(stand_in, lambda: conn.execute(sql).fetchall())[0]
+                    for _ in range(repeat)]
+            results.append(result(name, first, statistics.median(warm)))
+        return results
+    finally:
+        conn.close()
+
+
+def _parse_list(value: str, parse, param_hint: str) -> list:
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    if not items:
+        raise click.BadParameter("expected a comma-separated list", param_hint=param_hint)
+    return [parse(v) for v in items]
+
+
+def _threads(value: str) -> int:
+    if not value.isdigit() or int(value) < 1:
+        raise click.BadParameter(f"expected a positive integer, got '{value}'",
+                                 param_hint="--threads")
+    return int(value)
+
+
+def _cache(value: str) -> str:
+    if value not in CACHE_MODES:
+        raise click.BadParameter(f"expected one of {', '.join(CACHE_MODES)}, got '{value}'",
+                                 param_hint="--cache")
+    return value
+
+
+def _fmt(value: float | None, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def _echo_result(r: Result) -> None:
+    click.echo(f"{r.scale:<8} {r.threads:>3} {r.cache:<9} {r.step:<16} {r.first_s:>9.4f}"
+               f" {_fmt(r.warm_s, '9.4f'):>9} {_fmt(r.rows_per_s, ',.0f'):>14} {r.requests:>5}")
+
+
+def _summary(results: list[Result]) -> None:
+    click.echo(f"\n{'Scale':<8} {'Thr':>3} {'Cache':<9} {'Attach s':>9} {'Metadata s':>10}"
+               f" {'First q s':>9} {'Warm q s':>9} {'Median rows/s':>14}")
+    combos: dict[tuple, list[Result]] = {}
+    for r in results:
+        combos.setdefault((r.scale, r.threads, r.cache), []).append(r)
+    for (scale, threads, cache), steps in combos.items():
+        attach, metadata, *queries = steps
+        rows_per_s = statistics.median(q.rows_per_s or 0 for q in queries)
+        click.echo(
+            f"{scale:<8} {threads:>3} {cache:<9} {attach.first_s:>9.4f} {metadata.first_s:>10.4f}"
+            f" {queries[0].first_s:>9.4f} {sum(q.warm_s for q in queries):>9.4f}"
+            f" {rows_per_s:>14,.0f}")
+
+
+@click.command()
+@click.option("--scale", "scales", default="10k,100k", show_default=True,
+              help="ORDERS row counts to generate and query, comma-separated (10k, 1m, ...)")
+@click.option("--threads", "thread_counts", default="1,4", show_default=True,
+              help="DuckDB thread counts, comma-separated")
+@click.option("--cache", "cache_modes", default="off,duckdb", show_default=True,
+              help=f"Cache settings, comma-separated: {', '.join(CACHE_MODES)}")
+@click.option("--query", "query_names", multiple=True, metavar="NAME",
+              help="Only this query from sql/bench (e.g. 05_join); repeatable")
+@click.option("--repeat", default=3, show_default=True, type=click.IntRange(1),
+              help="Warm runs per query; the median is reported")
+@click.option("--warehouse", default=DEFAULT_WAREHOUSE, show_default=True,
+              type=click.Path(file_okay=False), help="Catalog, metadata and data file directory")
+@click.option("--regenerate", is_flag=True,
+              help="Delete --warehouse and generate every table again")
+@click.option("--serve", is_flag=True,
+              help="Generate the tables, then keep the stand-in catalog running until Ctrl-C")
+@click.option("--port", default=0, type=click.IntRange(0, 65535),
+              help="Port for --serve (default: any free port)")
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON")
+@click.option("--dry-run", is_flag=True, help="Show the combinations without running them")
+def bench(scales: str, thread_counts: str, cache_modes: str, query_names: tuple[str, ...],
+          repeat: int, warehouse: str, regenerate: bool, serve: bool, port: int, as_json: bool,
+          dry_run: bool) -> None:
+    """Benchmark DuckDB over Iceberg through a local REST catalog stand-in.
+
+    Generates ORDERS and PRODUCTS at each --scale, serves them from a
+    local Iceberg REST catalog and, for every scale, thread count and
+    cache setting, reports ATTACH time, metadata resolution, and per
+    query the cold and warm latency, rows scanned per second and
+    catalog requests.
+
+    \b
+    Example:
+      hirc-demo-bench --scale 100k,1m --threads 1,2,4 --cache off,duckdb,datafile
+    """
+    rows_list = _parse_list(scales, lambda v: parse_rows(v, "--scale"), "--scale")
+    threads_list = _parse_list(thread_counts, _threads, "--threads")
+    cache_list = _parse_list(cache_modes, _cache, "--cache")
+    queries = load_queries(query_names)
+    combos = [(rows, threads, cache) for rows in rows_list
+              for threads in threads_list for cache in cache_list]
+
+    if dry_run:
+        click.echo(f"Would generate {', '.join(namespace(r) for r in rows_list)} in {warehouse}"
+                   f" and run {len(queries)} queries ({', '.join(queries)}) in"
+                   f" {len(combos)} combination(s), {repeat} warm run(s) each:")
+        for rows, threads, cache in combos:
+            click.echo(f"  {namespace(rows):<8} threads={threads:<3} cache={cache}")
+        return
+
+    missing = [m for m in ("pyiceberg", "sqlalchemy") if importlib.util.find_spec(m) is None]
+    if missing:
+        click.echo(f"hirc-demo-bench needs {', '.join(missing)}: install the bench extra"
+                   " (uv sync --extra bench)", err=True)
+        sys.exit(1)
+
+    warehouse_path = Path(warehouse)
+    if regenerate and warehouse_path.exists():
+        shutil.rmtree(warehouse_path)
+    for rows in rows_list:
+        start = time.perf_counter()
+        ns, created = generate(warehouse_path, rows)
+        if created:
+            click.echo(f"Generated {ns} ({rows:,} orders) in {time.perf_counter() - start:.2f}s",
+                       err=True)
+
+    stand_in = StandInCatalog(warehouse_path, port if serve else 0)
+    if serve:
+        sample = f"SELECT count(*) FROM {DEFAULT_ALIAS}.{namespace(rows_list[0])}.ORDERS"
+        click.echo(f"Stand-in catalog for {DATABASE} at {stand_in.endpoint} (Ctrl-C to stop):")
+        click.echo(f"  HIRC_DEMO_CATALOG_ENDPOINT={stand_in.endpoint} DEMO_DATABASE={DATABASE}"
+                   f" hirc-demo-query {_quote(sample)}")
+        try:
+            stand_in.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    stand_in.start()
+    results: list[Result] = []
+    if not as_json:
+        click.echo(f"{'Scale':<8} {'Thr':>3} {'Cache':<9} {'Step':<16} {'First s':>9}"
+                   f" {'Warm s':>9} {'Rows/s':>14} {'Reqs':>5}")
+    try:
+        for rows, threads, cache in combos:
+            try:
+                combo = run_combination(stand_in, rows, threads, cache, queries, repeat)
+            except duckdb.Error as e:
+                click.echo(f"{namespace(rows)} threads={threads} cache={cache} failed: {e}",
+                           err=True)
+                sys.exit(1)
+            results.extend(combo)
+            if not as_json:
+                for r in combo:
+                    _echo_result(r)
+    finally:
+        stand_in.stop()
+
+    if as_json:
+        click.echo(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        _summary(results)
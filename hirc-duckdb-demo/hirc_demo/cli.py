@@ -5,15 +5,26 @@
 Each command loads .env, reads required variables, and runs the
 corresponding SQL file via `snow sql` subprocess. This eliminates
 the error-prone `set -a && source .env && set +a` boilerplate.
+
+``--backend connector`` runs the same SQL in-process over one reused
+Snowflake session instead (see :mod:`hirc_demo.executor`), and
+``hirc-demo-run`` chains several steps through that single session.
+
+A step whose rendered SQL is unchanged since it last succeeded is
+skipped (``--force`` re-applies it); ``hirc-demo-plan`` shows which
+steps would run (see :mod:`hirc_demo.state`).
 """
 
 import os
-import subprocess
+import re
 import sys
 from pathlib import Path
 
 import click
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
+
+from hirc_demo import executor, state
+from hirc_demo.daemon import DaemonCommand
 
 
 def _get_sql_dir() -> Path:
@@ -26,9 +37,29 @@ def _get_sql_dir() -> Path:
     return sql_dir
 
 
+_dotenv_cache: dict[str, tuple[int, dict[str, str]]] = {}
+
+
+def _load_dotenv() -> None:
+    """Like ``load_dotenv()``, but reuse the parsed file while its mtime is unchanged.
+
+    Matters under ``hirc-demo-daemon``, where one process serves many calls.
+    """
+    path = find_dotenv()
+    if not path:
+        return
+    mtime = os.stat(path).st_mtime_ns
+    cached = _dotenv_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        values = {k: v for k, v in dotenv_values(path).items() if v is not None}
+        cached = _dotenv_cache[path] = (mtime, values)
+    for key, val in cached[1].items():
+        os.environ.setdefault(key, val)
+
+
 def _require_env(*names: str) -> dict[str, str]:
     """Read required env vars, abort with clear message if any missing."""
-    load_dotenv()
+    _load_dotenv()
     values = {}
     missing = []
     for name in names:
@@ -44,50 +75,118 @@ def _require_env(*names: str) -> dict[str, str]:
     return values
 
 
+_ROWS = re.compile(r"^(\d+)([kmb]?)$", re.IGNORECASE)
+_ROW_UNITS = {"": 1, "k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+
+# Synthetic data profiles -> approximate Parquet bytes per row, used to
+# turn --size-gb into a row count.
+SYNTHETIC_PROFILES = {"fruits": 10, "orders": 40, "events": 220}
+TARGET_FILE_SIZES = ("AUTO", "16MB", "32MB", "64MB", "128MB")
+
+
+def parse_rows(value: str, param_hint: str = "--rows") -> int:
+    """Parse a row count: ``250000``, ``10k``, ``5m`` or ``2b``."""
+    found = _ROWS.match(value.strip())
+    if not found or int(found[1]) == 0:
+        raise click.BadParameter(f"expected a row count like 10k, 5m or 2b, got '{value}'",
+                                 param_hint=param_hint)
+    return int(found[1]) * _ROW_UNITS[found[2].lower()]
+
+
+# -- shared click option for the execution backend -------------------------
+
+_backend_option = click.option(
+    "--backend",
+    type=click.Choice(executor.BACKENDS),
+    default="snow",
+    envvar="HIRC_DEMO_BACKEND",
+    show_default=True,
+    help="snow: subprocess per step; connector: one in-process session; fake: offline stand-in",
+)
+
+_force_option = click.option(
+    "--force",
+    is_flag=True,
+    help="Re-apply even if the rendered SQL is unchanged since the last successful run",
+)
+
+
+# Set by ``hirc-demo-run --batch``: steps are queued here instead of run.
+_batch: list[tuple[Path, dict[str, str], str]] | None = None
+# Set by ``hirc-demo-plan``: steps are collected here instead of run.
+_plan: list[tuple[Path, dict[str, str], str]] | None = None
+# Set by ``hirc-demo-run``: steps already applied (or queued) in this run,
+# so a later step they undo is never skipped.
+_earlier: list[str] | None = None
+
+
 def _run_snow_sql(
     sql_file: str,
     variables: dict[str, str],
     connection: str,
     dry_run: bool = False,
+    backend: str = "snow",
+    force: bool = False,
 ) -> None:
-    """Run a SQL file via snow sql with templating variables."""
+    """Run a SQL file via snow sql (or an in-process backend) with templating variables.
+
+    Skips the step when its rendered SQL matches the last successful run,
+    unless ``force``; the ``fake`` backend neither skips nor records.
+    """
     sql_path = _get_sql_dir() / sql_file
     if not sql_path.exists():
         click.echo(f"SQL file not found: {sql_path}", err=True)
         sys.exit(1)
 
-    cmd = [
-        "snow",
-        "sql",
-        "-c",
-        connection,
-        "-f",
-        str(sql_path),
-        "--enable-templating",
-        "ALL",
-    ]
+    if _plan is not None:
+        _plan.append((sql_path, variables, connection))
+        return
+
+    step = sql_path.stem
+    tracked = backend != "fake"
+    if tracked:
+        digest = state.fingerprint(executor.rendered_sql(sql_path, variables), connection)
+        status, entry = state.status(step, digest, _earlier or ())
+        if status == "unchanged" and not force:
+            click.echo(
+                f"{'Would skip' if dry_run else 'Skipping'} {sql_path.name}: unchanged since"
+                f" {entry['applied_at']} (--force to re-apply)"
+            )
+            return
+    if _earlier is not None:
+        _earlier.append(step)
 
-    for key, val in variables.items():
-        cmd.extend(["--variable", f"{key}={val}"])
+    if _batch is not None:
+        _batch.append((sql_path, variables, connection))
+        return
 
     if dry_run:
         click.echo("Would run:")
-        click.echo(f"  snow sql -c {connection} -f {sql_path}")
+        if backend == "snow":
+            click.echo(f"  snow sql -c {connection} -f {sql_path}")
+        else:
+            click.echo(f"  {sql_path} in-process via {backend} (connection {connection})")
         for key, val in variables.items():
             click.echo(f"    --variable {key}={val}")
         return
 
-    click.echo(f"Running: snow sql -f {sql_file}")
-    result = subprocess.run(cmd, env=os.environ)
-    if result.returncode != 0:
-        click.echo(f"Command failed with exit code {result.returncode}", err=True)
-        sys.exit(result.returncode)
+    returncode = executor.execute(backend, sql_path, variables, connection)
+    if returncode != 0:
+        if tracked:
+            state.forget(step)
+        click.echo(f"Command failed with exit code {returncode}", err=True)
+        sys.exit(returncode)
+    if tracked:
+        state.record(step, digest, backend)
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
-def setup(admin_role: str, dry_run: bool) -> None:
+@_backend_option
+@_force_option
+def setup(admin_role: str, dry_run: bool, backend: str, force: bool) -> None:
     """Create demo database with USAGE grants and set external volume.
 
     Runs sql/demo_setup.sql with admin_role (CLI arg, from manifest),
@@ -109,41 +208,100 @@ def setup(admin_role: str, dry_run: bool) -> None:
         },
         connection=env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
         dry_run=dry_run,
+        backend=backend,
+        force=force,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
+@click.option("--rows", help="Generate this many synthetic rows server-side (10k, 5m, 2b)"
+                             " instead of the 10 sample rows")
+@click.option("--size-gb", type=click.FloatRange(0, min_open=True),
+              help="Generate about this many GB of Parquet instead of the 10 sample rows")
+@click.option("--profile", type=click.Choice(list(SYNTHETIC_PROFILES)),
+              help="Synthetic columns: fruits (as FRUITS), orders or events (default: fruits)")
+@click.option("--skew", type=click.FloatRange(0),
+              help="Zipf exponent for key and category columns, 0 for uniform (default: 0)")
+@click.option("--file-size", type=click.Choice(TARGET_FILE_SIZES, case_sensitive=False),
+              help="Iceberg TARGET_FILE_SIZE of the synthetic table (default: AUTO)")
+@click.option("--seed", type=int, help="Random seed; same options, same data (default: 42)")
+@click.option("--table", help="Synthetic table name (default: the profile, upper-case)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
-def load_data(admin_role: str, dry_run: bool) -> None:
+@_backend_option
+@_force_option
+def load_data(admin_role: str, rows: str | None, size_gb: float | None, profile: str | None,
+              skew: float | None, file_size: str | None, seed: int | None, table: str | None,
+              dry_run: bool, backend: str, force: bool) -> None:
     """Create Iceberg table and load sample data.
 
     Runs sql/sample_data.sql with admin_role (CLI arg, from manifest),
     database_name, and external_volume_name from .env.
+
+    With --rows or --size-gb, runs sql/synthetic_data.sql instead: one
+    server-side INSERT ... SELECT over GENERATOR fills the --profile
+    table, drawing keys and categories with ZIPF when --skew > 0, in
+    clustering order and with the Iceberg TARGET_FILE_SIZE --file-size.
     """
     env = _require_env(
         "SNOWFLAKE_DEFAULT_CONNECTION_NAME",
         "DEMO_DATABASE",
         "EXTERNAL_VOLUME_NAME",
     )
+    if rows is not None and size_gb is not None:
+        raise click.UsageError("Pass only one of --rows and --size-gb")
+    if rows is None and size_gb is None:
+        given = [name for name, value in (("--profile", profile), ("--skew", skew),
+                                          ("--file-size", file_size), ("--seed", seed),
+                                          ("--table", table)) if value is not None]
+        if given:
+            raise click.UsageError(f"{', '.join(given)} only apply with --rows or --size-gb")
+        sql_file = "sample_data.sql"
+        variables = {}
+    else:
+        profile = profile or "fruits"
+        if rows is not None:
+            count = parse_rows(rows)
+        else:
+            per_row = SYNTHETIC_PROFILES[profile]
+            count = max(1, round(size_gb * 1024**3 / per_row))
+            click.echo(f"{size_gb:g} GB of {profile} at ~{per_row} bytes/row: {count:,} rows")
+        table = (table or profile).upper()
+        if not _IDENTIFIER.match(table):
+            raise click.BadParameter(f"'{table}' is not a plain identifier", param_hint="--table")
+        sql_file = "synthetic_data.sql"
+        variables = {
+            "table": table,
+            "profile": profile,
+            "rows": str(count),
+            "skew": f"{skew or 0:g}",
+            "seed": str(42 if seed is None else seed),
+            "target_file_size": (file_size or "AUTO").upper(),
+        }
     _run_snow_sql(
-        "sample_data.sql",
+        sql_file,
         variables={
             "admin_role": admin_role,
             "database_name": env["DEMO_DATABASE"],
             "external_volume_name": env["EXTERNAL_VOLUME_NAME"],
+            **variables,
         },
         connection=env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
         dry_run=dry_run,
+        backend=backend,
+        force=force,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--schema", default="PUBLIC", help="Schema name (default: PUBLIC)")
 @click.option("--table", default="FRUITS", help="Table name (default: FRUITS)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
-def grant_rbac(admin_role: str, schema: str, table: str, dry_run: bool) -> None:
+@_backend_option
+@_force_option
+def grant_rbac(admin_role: str, schema: str, table: str, dry_run: bool, backend: str,
+               force: bool) -> None:
     """Grant SELECT on Iceberg table to SA_ROLE.
 
     Runs sql/rbac.sql with admin_role (CLI arg, from manifest),
@@ -165,15 +323,20 @@ def grant_rbac(admin_role: str, schema: str, table: str, dry_run: bool) -> None:
         },
         connection=env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
         dry_run=dry_run,
+        backend=backend,
+        force=force,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--schema", default="PUBLIC", help="Schema name (default: PUBLIC)")
 @click.option("--table", default="FRUITS", help="Table name (default: FRUITS)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
-def revoke_rbac(admin_role: str, schema: str, table: str, dry_run: bool) -> None:
+@_backend_option
+@_force_option
+def revoke_rbac(admin_role: str, schema: str, table: str, dry_run: bool, backend: str,
+                force: bool) -> None:
     """Revoke SELECT on Iceberg table from SA_ROLE.
 
     Used by the "Re-run demo" flow to restore the RBAC-failure state
@@ -198,13 +361,17 @@ def revoke_rbac(admin_role: str, schema: str, table: str, dry_run: bool) -> None
         },
         connection=env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
         dry_run=dry_run,
+        backend=backend,
+        force=force,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
-def cleanup(admin_role: str, dry_run: bool) -> None:
+@_backend_option
+@_force_option
+def cleanup(admin_role: str, dry_run: bool, backend: str, force: bool) -> None:
     """Drop demo database and all its tables.
 
     Runs sql/cleanup.sql with admin_role (CLI arg, from manifest)
@@ -222,4 +389,153 @@ def cleanup(admin_role: str, dry_run: bool) -> None:
         },
         connection=env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
         dry_run=dry_run,
+        backend=backend,
+        force=force,
     )
+
+
+_RUN_STEPS = {
+    "setup": setup,
+    "data": load_data,
+    "rbac": grant_rbac,
+    "revoke-rbac": revoke_rbac,
+    "cleanup": cleanup,
+}
+
+
+def _invoke_steps(ctx: click.Context, steps: tuple[str, ...], schema: str, table: str,
+                  **params) -> None:
+    """Invoke the commands behind ``steps`` in order with shared ``params``."""
+    for step in steps:
+        step_params = dict(params)
+        if step in ("rbac", "revoke-rbac"):
+            step_params.update(schema=schema, table=table)
+        ctx.invoke(_RUN_STEPS[step], **step_params)
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("steps", nargs=-1, required=True, type=click.Choice(list(_RUN_STEPS)))
+@click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
+@click.option("--schema", default="PUBLIC", help="Schema name (default: PUBLIC)")
+@click.option("--table", default="FRUITS", help="Table name (default: FRUITS)")
+@click.option("--dry-run", is_flag=True, help="Preview command without executing")
+@click.option(
+    "--backend",
+    type=click.Choice(executor.BACKENDS),
+    default="connector",
+    envvar="HIRC_DEMO_BACKEND",
+    show_default=True,
+    help="snow: subprocess per step; connector: one in-process session; fake: offline stand-in",
+)
+@click.option("--batch", is_flag=True,
+              help="Submit all steps as one multi-statement script (one round trip)")
+@_force_option
+@click.pass_context
+def run(ctx: click.Context, steps: tuple[str, ...], admin_role: str, schema: str,
+        table: str, dry_run: bool, backend: str, batch: bool, force: bool) -> None:
+    """Run several demo steps back to back in one session.
+
+    STEPS are any of setup, data, rbac, revoke-rbac, cleanup, executed in
+    the order given. With the connector backend every step shares one
+    Snowflake login; --batch goes further and sends all steps as a single
+    submission. Steps unchanged since their last successful run are
+    skipped unless --force. A per-step timing summary (and the time saved
+    against the last recorded snow run) is printed at the end.
+    """
+    global _batch, _earlier
+    first = len(executor.timings)
+    _batch = [] if batch else None
+    _earlier = []
+    try:
+        _invoke_steps(ctx, steps, schema, table, admin_role=admin_role, dry_run=dry_run,
+                      backend=backend, force=force)
+        queued = _batch or []
+    finally:
+        _batch = _earlier = None
+
+    if queued and dry_run:
+        click.echo(f"Would run as one submission via {backend} (connection {queued[0][2]}):")
+        for sql_path, variables, _ in queued:
+            click.echo(f"  {sql_path}")
+            for key, val in variables.items():
+                click.echo(f"    --variable {key}={val}")
+    elif queued:
+        connection = queued[0][2]
+        returncode = executor.execute_batch(
+            backend, [(sql_path, variables) for sql_path, variables, _ in queued], connection
+        )
+        if backend != "fake":
+            for sql_path, variables, _ in queued:
+                if returncode != 0:
+                    state.forget(sql_path.stem)
+                    continue
+                rendered = executor.rendered_sql(sql_path, variables)
+                state.record(sql_path.stem, state.fingerprint(rendered, connection), backend)
+        if returncode != 0:
+            click.echo(f"Command failed with exit code {returncode}", err=True)
+            sys.exit(returncode)
+
+    step_timings = executor.timings[first:]
+    if step_timings:
+        click.echo("")
+        click.echo(f"{'Step':<16} {'Backend':<10} {'Seconds':>8} {'Saved':>8}")
+        for t in step_timings:
+            saved = f"{t.saved:.2f}" if t.saved is not None else "-"
+            click.echo(f"{t.step:<16} {t.backend:<10} {t.seconds:>8.2f} {saved:>8}")
+        total_saved = sum(t.saved for t in step_timings if t.saved is not None)
+        if total_saved:
+            click.echo(f"Total saved vs snow subprocess: {total_saved:.2f}s")
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("steps", nargs=-1, type=click.Choice(list(_RUN_STEPS)))
+@click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
+@click.option("--schema", default="PUBLIC", help="Schema name (default: PUBLIC)")
+@click.option("--table", default="FRUITS", help="Table name (default: FRUITS)")
+@click.option("--detailed-exitcode", is_flag=True,
+              help="Exit 2 when any step would be applied (0 when all are unchanged)")
+@click.pass_context
+def plan(ctx: click.Context, steps: tuple[str, ...], admin_role: str, schema: str,
+         table: str, detailed_exitcode: bool) -> None:
+    """Show which demo steps would change if applied.
+
+    Renders each step's SQL locally and compares its hash with the one
+    recorded in .snow-utils/hirc-demo-state.json when the step last
+    succeeded, in the order given (so `cleanup setup` plans setup as
+    undone by cleanup). Nothing is sent to Snowflake. STEPS default to
+    setup, data, rbac.
+    """
+    global _plan
+    steps = steps or ("setup", "data", "rbac")
+    _plan = []
+    try:
+        _invoke_steps(ctx, steps, schema, table, admin_role=admin_role, dry_run=True,
+                      backend="snow", force=False)
+        collected = _plan
+    finally:
+        _plan = None
+
+    earlier: list[str] = []
+    pending = 0
+    click.echo(f"{'Step':<12} {'SQL':<18} {'Status':<12} Detail")
+    for step, (sql_path, variables, connection) in zip(steps, collected):
+        name = sql_path.stem
+        digest = state.fingerprint(executor.rendered_sql(sql_path, variables), connection)
+        status, entry = state.status(name, digest, earlier)
+        if status == "unchanged":
+            detail = f"applied {entry['applied_at']} via {entry['backend']}"
+        else:
+            pending += 1
+            earlier.append(name)
+            if status == "new":
+                detail = "no successful run recorded"
+            elif status == "changed":
+                detail = f"rendered SQL differs from the run applied {entry['applied_at']}"
+            else:
+                undone_by = [p for p in earlier if name in state.INVALIDATES.get(p, ())]
+                detail = f"undone by {undone_by[-1]}.sql earlier in this plan"
+        click.echo(f"{step:<12} {sql_path.name:<18} {status:<12} {detail}")
+
+    click.echo(f"\n{pending} to apply, {len(collected) - pending} unchanged.")
+    if detailed_exitcode and pending:
+        sys.exit(2)
@@ -0,0 +1,388 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``hirc-demo-daemon`` -- keep one warm interpreter for the hirc-demo-* commands.
+
+Every ``hirc-demo-*`` call normally pays interpreter start-up, imports,
+``.env`` parsing and (with ``--backend connector``) a Snowflake login.
+``hirc-demo-daemon start`` runs a long-lived process listening on a Unix
+socket; while it is up, commands built with :class:`DaemonCommand` hand
+their argv, working directory and environment -- plus their
+stdin/stdout/stderr file descriptors via ``SCM_RIGHTS`` -- to the daemon,
+which runs the command in-process and sends back the exit code.  Output
+still appears on the caller's terminal, and ``snow`` subprocesses inherit
+the caller's stdio.
+
+Requests are served one at a time (a command owns the process-wide
+cwd, environment and fds while it runs), so connector sessions opened
+by :mod:`hirc_demo.executor` and parsed ``.env`` files stay warm between
+calls.  When no daemon is listening -- or ``HIRC_DEMO_NO_DAEMON`` is set
+-- commands run locally exactly as before.
+
+The daemon exits after ``--idle-timeout`` seconds without requests.  It
+keeps the code it started with, so restart it after upgrading the skill;
+a command it does not know is handed back and runs locally.
+"""
+
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+import click
+
+from hirc_demo import executor
+
+_PACKAGE = "hirc_demo"
+_SOCKET_ENV = "HIRC_DEMO_DAEMON_SOCKET"
+_DISABLE_ENV = "HIRC_DEMO_NO_DAEMON"
+_BACKEND_ENV = "HIRC_DEMO_BACKEND"
+_LOG_FILE = Path.home() / ".cache" / "hirc-demo" / "daemon.log"
+_MAX_REQUEST = 4 * 1024 * 1024
+
+# True inside the daemon process, so forwarded commands run locally.
+_serving = False
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path (``$HIRC_DEMO_DAEMON_SOCKET`` wins)."""
+    override = os.environ.get(_SOCKET_ENV, "").strip()
+    if override:
+        return Path(override)
+    return Path(tempfile.gettempdir()) / f"hirc-demo-{os.getuid()}.sock"
+
+
+# -- wire protocol ----------------------------------------------------------
+#
+# One request per connection: a JSON line (the first chunk carries the
+# caller's fds 0, 1 and 2), answered by a JSON line.
+
+
+def _recv_line(sock: socket.socket, first: bytes = b"") -> dict:
+    data = first
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > _MAX_REQUEST:
+            raise ValueError("request too large")
+    return json.loads(data)
+
+
+def _send_line(sock: socket.socket, message: dict) -> None:
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _connect(timeout: float | None = None) -> socket.socket:
+    """Connect to the running daemon; raises ``OSError`` when none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(2.0)
+        sock.connect(str(socket_path()))
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(timeout)
+    return sock
+
+
+def _exchange(sock: socket.socket, message: dict, fds: list[int] | None = None) -> dict:
+    payload = json.dumps(message).encode() + b"\n"
+    with sock:
+        if fds:
+            sent = socket.send_fds(sock, [payload], fds)
+            if sent < len(payload):
+                sock.sendall(payload[sent:])
+        else:
+            sock.sendall(payload)
+        return _recv_line(sock)
+
+
+def _call(message: dict, timeout: float | None = None) -> dict:
+    """Send a control request (status/stop) to the daemon and return its reply."""
+    return _exchange(_connect(timeout), message)
+
+
+# -- client side ------------------------------------------------------------
+
+
+class DaemonCommand(click.Command):
+    """A click command that runs in the warm daemon when one is listening."""
+
+    def main(self, args=None, prog_name=None, complete_var=None,
+             standalone_mode=True, **extra):
+        if not _serving and standalone_mode and not os.environ.get(_DISABLE_ENV):
+            request = {
+                "op": "run",
+                "target": f"{self.callback.__module__}:{self.callback.__name__}",
+                "prog": prog_name or os.path.basename(sys.argv[0]),
+                "argv": list(sys.argv[1:] if args is None else args),
+                "cwd": os.getcwd(),
+                "env": dict(os.environ),
+            }
+            try:
+                sock = _connect()
+            except OSError:
+                pass  # no daemon running: fall back to the local path
+            else:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                try:
+                    reply = _exchange(sock, request, fds=[0, 1, 2])
+                except (OSError, ValueError) as e:
+                    # The request may already be running; never run it twice.
+                    click.echo(f"Lost connection to hirc-demo-daemon: {e}", err=True)
+                    sys.exit(1)
+                if not reply.get("fallback"):
+                    sys.exit(reply.get("exit", 1))
+                click.echo("hirc-demo-daemon does not know this command (restart it after"
+                           " upgrading); running locally", err=True)
+        return super().main(args, prog_name, complete_var, standalone_mode, **extra)
+
+    def invoke(self, ctx: click.Context):
+        # Imported here: the telemetry module's own command needs this class.
+        from hirc_demo import telemetry
+
+        with telemetry.command(ctx.info_name or self.name):
+            return super().invoke(ctx)
+
+
+# -- server side ------------------------------------------------------------
+
+
+class _UnknownCommand(Exception):
+    """The daemon's code has no such command (it predates the caller's)."""
+
+
+def _resolve(target: str) -> click.Command:
+    module_name, _, attr = target.partition(":")
+    if module_name.split(".")[0] != _PACKAGE:
+        raise click.ClickException(f"refusing to run {target}")
+    try:
+        return getattr(importlib.import_module(module_name), attr)
+    except Exception as e:
+        raise _UnknownCommand(f"{target}: {e}") from e
+
+
+class _Server:
+    def __init__(self, path: Path, idle_timeout: float, backend: str | None):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.backend = backend
+        self.started = time.time()
+        self.requests = 0
+        self.busy_seconds = 0.0
+        self.running = True
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "socket": str(self.path),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "backend": self.backend,
+            "python": sys.version.split()[0],
+        }
+
+    def _run(self, request: dict, fds: list[int]) -> int:
+        command = _resolve(request["target"])
+
+        env = dict(request["env"])
+        if self.backend:
+            env.setdefault(_BACKEND_ENV, self.backend)
+        saved_env, saved_cwd = dict(os.environ), os.getcwd()
+        saved_fds = [os.dup(fd) for fd in (0, 1, 2)]
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            for target, fd in enumerate(fds[:3]):
+                os.dup2(fd, target)
+            os.environ.clear()
+            os.environ.update(env)
+            os.chdir(request["cwd"])
+            try:
+                command.main(request["argv"], request["prog"])
+                return 0
+            except SystemExit as e:
+                if e.code is None:
+                    return 0
+                if isinstance(e.code, int):
+                    return e.code
+                click.echo(e.code, err=True)
+                return 1
+            except Exception:
+                traceback.print_exc()
+                return 1
+        finally:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except OSError:
+                    pass  # caller went away (e.g. piped into head)
+            for target, fd in enumerate(saved_fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+            # Step timings belong to this request only; sessions stay warm.
+            executor.timings.clear()
+
+    def handle(self, conn: socket.socket) -> None:
+        fds: list[int] = []
+        try:
+            msg, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+            request = _recv_line(conn, msg)
+            op = request.get("op")
+            if op == "run":
+                start = time.perf_counter()
+                code = self._run(request, fds)
+                self.requests += 1
+                self.busy_seconds += time.perf_counter() - start
+                _send_line(conn, {"exit": code})
+            elif op == "status":
+                _send_line(conn, self.status())
+            elif op == "stop":
+                self.running = False
+                _send_line(conn, {"stopped": os.getpid()})
+            else:
+                _send_line(conn, {"error": f"unknown op {op!r}"})
+        except _UnknownCommand as e:
+            # Nothing ran yet, so the caller can safely run it locally.
+            print(f"unknown command {e}", file=sys.stderr, flush=True)
+            self._reply(conn, {"error": "unknown command", "fallback": True})
+        except (OSError, ValueError, click.ClickException) as e:
+            print(f"request failed: {e}", file=sys.stderr, flush=True)
+            self._reply(conn, {"exit": 1, "error": str(e)})
+        except Exception as e:
+            # One bad request must never end the serve loop.
+            traceback.print_exc()
+            self._reply(conn, {"exit": 1, "error": str(e)})
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    @staticmethod
+    def _reply(conn: socket.socket, message: dict) -> None:
+        try:
+            _send_line(conn, message)
+        except OSError:
+            pass
+
+    def serve(self) -> None:
+        global _serving
+        _serving = True
+        # Forwarded fds are often terminals shared with `snow` subprocesses;
+        # flush per line so output keeps its order.
+        sys.stdout.reconfigure(line_buffering=True)
+        self.path.unlink(missing_ok=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            listener.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+        listener.listen(16)
+        listener.settimeout(self.idle_timeout)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(f"listening on {self.path} (pid {os.getpid()})", file=sys.stderr, flush=True)
+        try:
+            while self.running:
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    print("idle timeout, exiting", file=sys.stderr, flush=True)
+                    break
+                with conn:
+                    self.handle(conn)
+        finally:
+            listener.close()
+            self.path.unlink(missing_ok=True)
+
+
+def _daemonize(log_file: Path) -> None:
+    """Detach from the terminal; stdio goes to ``log_file``."""
+    if os.fork():
+        os._exit(0)
+    os.setsid()
+    if os.fork():
+        os._exit(0)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    log = os.open(log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(log, 1)
+    os.dup2(log, 2)
+    os.close(devnull)
+    os.close(log)
+
+
+def _preload() -> None:
+    """Import every command module so the first forwarded call is warm too."""
+    for module in ("hirc_demo.cli", "hirc_demo.executor", "hirc_demo.export"):
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"preload skipped {module}: {e}", file=sys.stderr, flush=True)
+
+
+# -- hirc-demo-daemon -------------------------------------------------------
+
+
+@click.group()
+def daemon() -> None:
+    """Manage the warm hirc-demo daemon (optional; commands work without it)."""
+
+
+@daemon.command()
+@click.option("--idle-timeout", default=1800, show_default=True, type=click.IntRange(1),
+              help="Exit after this many seconds without requests")
+@click.option("--backend", type=click.Choice(executor.BACKENDS),
+              help="Default --backend for forwarded commands (callers' HIRC_DEMO_BACKEND wins)")
+@click.option("--foreground", is_flag=True, help="Stay attached to the terminal")
+def start(idle_timeout: int, backend: str | None, foreground: bool) -> None:
+    """Start the daemon in the background."""
+    try:
+        status = _call({"op": "status"}, timeout=5)
+    except OSError:
+        pass
+    else:
+        click.echo(f"Daemon already running (pid {status['pid']}) on {status['socket']}")
+        return
+
+    path = socket_path()
+    if not foreground:
+        click.echo(f"Starting daemon on {path} (log: {_LOG_FILE})")
+        _daemonize(_LOG_FILE)
+    _preload()
+    _Server(path, idle_timeout, backend).serve()
+
+
+@daemon.command()
+def stop() -> None:
+    """Stop the running daemon."""
+    try:
+        reply = _call({"op": "stop"}, timeout=30)
+    except OSError:
+        click.echo("No daemon running")
+        return
+    click.echo(f"Stopped daemon (pid {reply['stopped']})")
+
+
+@daemon.command()
+def status() -> None:
+    """Show whether the daemon is running and how busy it has been."""
+    try:
+        reply = _call({"op": "status"}, timeout=5)
+    except OSError:
+        click.echo(f"No daemon running (socket: {socket_path()})")
+        sys.exit(1)
+    for key, value in reply.items():
+        click.echo(f"{key}: {value}")
@@ -0,0 +1,321 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""SQL execution backends for hirc-duckdb-demo commands.
+
+``snow`` (the default) runs each SQL file through a ``snow sql``
+subprocess, as the commands always have.  ``connector`` runs it over a
+single ``snowflake.connector`` session that is opened once per process and
+reused by every later step, so multi-step flows pay interpreter start-up,
+snowflake-cli import and login only once.  ``fake`` swaps the connector
+for :mod:`hirc_demo.fake_connector` so the in-process path can be
+exercised offline.
+
+Templates are always rendered locally (no ``--enable-templating`` work
+in ``snow``) and the result is cached in ``.snow-utils/rendered/``, keyed
+by the file's path, mtime and a hash of the variables; an unchanged step
+reuses the rendered file without importing Jinja.  :func:`execute_batch`
+concatenates several rendered files into one multi-statement submission
+-- one ``snow sql`` call or one ``execute_stream`` -- so a whole flow
+costs a single round trip.
+
+Every executed step records its wall time in
+``.snow-utils/hirc-demo-timings.json`` so in-process runs can report the
+time saved against the last recorded ``snow`` run of the same step, and
+emits spawn, connect and per-statement spans via :mod:`hirc_demo.telemetry`.
+"""
+
+import hashlib
+import io
+import json
+import os
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import click
+
+if TYPE_CHECKING:
+    # hirc_demo.telemetry -> daemon -> executor: imported where used instead.
+    from hirc_demo.telemetry import Step
+
+BACKENDS = ("snow", "connector", "fake")
+
+_TIMINGS_FILE = Path(".snow-utils") / "hirc-demo-timings.json"
+_RENDER_DIR = Path(".snow-utils") / "rendered"
+
+
+@dataclass
+class StepTiming:
+    """Wall time of one executed SQL step."""
+
+    step: str
+    backend: str
+    seconds: float
+    baseline: float | None = None
+
+    @property
+    def saved(self) -> float | None:
+        """Seconds saved against the recorded ``snow`` baseline, if any."""
+        if self.baseline is None or self.backend == "snow":
+            return None
+        return self.baseline - self.seconds
+
+
+def render_sql(sql_path: Path, variables: dict[str, str]) -> str:
+    """Render a ``--!jinja`` SQL file the way ``snow sql --enable-templating`` does."""
+    from jinja2 import Environment, StrictUndefined
+
+    text = sql_path.read_text()
+    first, _, rest = text.partition("\n")
+    if first.strip() == "--!jinja":
+        text = rest
+    env = Environment(undefined=StrictUndefined, keep_trailing_newline=True)
+    return env.from_string(text).render(**variables)
+
+
+def rendered_sql(sql_path: Path, variables: dict[str, str]) -> Path:
+    """Return a rendered copy of ``sql_path``, rendering only on a cache miss."""
+    stat = sql_path.stat()
+    key = hashlib.sha256(json.dumps(
+        [str(sql_path.resolve()), stat.st_mtime_ns, stat.st_size, sorted(variables.items())]
+    ).encode()).hexdigest()[:16]
+    target = _RENDER_DIR / f"{sql_path.stem}-{key}.sql"
+    if not target.exists():
+        _write_atomic(target, render_sql(sql_path, variables))
+    return target
+
+
+def combine_rendered(rendered: list[Path]) -> Path:
+    """Concatenate rendered files into one multi-statement script."""
+    parts = []
+    for path in rendered:
+        text = path.read_text().rstrip()
+        if not text.endswith(";"):
+            text += ";"
+        parts.append(f"-- >>> {path.stem.rsplit('-', 1)[0]}.sql\n{text}\n")
+    combined = "\n".join(parts)
+    key = hashlib.sha256(combined.encode()).hexdigest()[:16]
+    target = _RENDER_DIR / f"batch-{key}.sql"
+    if not target.exists():
+        _write_atomic(target, combined)
+    return target
+
+
+def _write_atomic(target: Path, text: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(text)
+    tmp.replace(target)
+
+
+def _load_timings() -> dict:
+    try:
+        return json.loads(_TIMINGS_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_timing(timing: StepTiming) -> None:
+    data = _load_timings()
+    data.setdefault(timing.step, {})[timing.backend] = round(timing.seconds, 3)
+    try:
+        _TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _TIMINGS_FILE.write_text(json.dumps(data, indent=2) + "\n")
+    except OSError:
+        # Timing history is informational only; never fail a step over it.
+        pass
+
+
+class SnowExecutor:
+    """Run each locally rendered SQL file via a ``snow sql`` subprocess."""
+
+    name = "snow"
+
+    def command(self, rendered: Path, connection: str) -> list[str]:
+        return [
+            "snow",
+            "sql",
+            "-c",
+            connection,
+            "-f",
+            str(rendered),
+            "--enable-templating",
+            "NONE",
+        ]
+
+    def submit(self, rendered: Path, label: str, connection: str,
+               step: "Step | None" = None) -> int:
+        click.echo(f"Running: snow sql -f {label}")
+        if step is not None and step.enabled:
+            from hirc_demo import telemetry
+
+            cmd = self.command(telemetry.traced_script(rendered), connection)
+            return telemetry.run_snow(cmd, step).returncode
+        result = subprocess.run(self.command(rendered, connection), env=os.environ)
+        return result.returncode
+
+    def run(self, sql_path: Path, variables: dict[str, str], connection: str,
+            step: "Step | None" = None) -> int:
+        return self.submit(rendered_sql(sql_path, variables), sql_path.name, connection, step)
+
+
+def _session_key(connection: str) -> tuple[str, str]:
+    """Key a session by connection name and the environment the connector reads.
+
+    ``snowflake.connector`` resolves ``connection_name`` through
+    ``SNOWFLAKE_*`` variables (``.env`` values included, see
+    ``_load_dotenv``) and the config under ``HOME``, so two daemon callers
+    share a session only when all of those match.
+    """
+    env = sorted((k, v) for k, v in os.environ.items()
+                 if k.startswith("SNOWFLAKE_") or k == "HOME")
+    return connection, hashlib.sha256(json.dumps(env).encode()).hexdigest()[:16]
+
+
+class ConnectorExecutor:
+    """Run rendered SQL files over one reusable in-process Snowflake session."""
+
+    def __init__(self, name: str, connect: Callable[..., object]):
+        self.name = name
+        self._connect = connect
+        self._sessions: dict[tuple[str, str], object] = {}
+
+    def session(self, connection: str, step: "Step | None" = None) -> object:
+        """Return the open session for ``connection``, connecting on first use."""
+        key = _session_key(connection)
+        if key not in self._sessions:
+            started, start = time.time(), time.perf_counter()
+            self._sessions[key] = self._connect(connection_name=connection)
+            seconds = time.perf_counter() - start
+            click.echo(f"Connected to '{connection}' in {seconds:.2f}s")
+            if step is not None:
+                step.add("connect", connection, started, seconds)
+        return self._sessions[key]
+
+    def submit(self, rendered: Path, label: str, connection: str,
+               step: "Step | None" = None) -> int:
+        click.echo(f"Running in-process ({self.name}): {label}")
+        try:
+            cursors = self.session(connection, step).execute_stream(
+                io.StringIO(rendered.read_text()), remove_comments=True
+            )
+            started, start = time.time(), time.perf_counter()
+            # execute_stream yields each cursor once its statement has run.
+            for cursor in cursors:
+                if step is not None:
+                    query = " ".join(str(getattr(cursor, "query", "") or "").split())
+                    step.add("statement", (query.split() or ["UNKNOWN"])[0].upper(),
+                             started, time.perf_counter() - start,
+                             query_id=cursor.sfqid, text=query[:200], rows=cursor.rowcount)
+                if cursor.description:
+                    for row in cursor.fetchall():
+                        click.echo("  " + " | ".join(str(v) for v in row))
+                started, start = time.time(), time.perf_counter()
+        except Exception as e:  # connector errors carry the Snowflake message
+            click.echo(f"SQL failed: {e}", err=True)
+            if step is not None:
+                step.fail(1)
+            return 1
+        return 0
+
+    def run(self, sql_path: Path, variables: dict[str, str], connection: str,
+            step: "Step | None" = None) -> int:
+        return self.submit(rendered_sql(sql_path, variables), sql_path.name, connection, step)
+
+    def close(self) -> None:
+        for conn in self._sessions.values():
+            conn.close()
+        self._sessions.clear()
+
+
+def _snowflake_connect(**kwargs) -> object:
+    import snowflake.connector
+
+    return snowflake.connector.connect(**kwargs)
+
+
+def _fake_connect(**kwargs) -> object:
+    from hirc_demo.fake_connector import connect
+
+    return connect(**kwargs)
+
+
+_executors: dict[str, object] = {}
+timings: list[StepTiming] = []
+
+
+def get_executor(backend: str):
+    """Return the process-wide executor for ``backend`` (sessions are shared)."""
+    if backend not in _executors:
+        if backend == "snow":
+            _executors[backend] = SnowExecutor()
+        elif backend == "connector":
+            _executors[backend] = ConnectorExecutor(backend, _snowflake_connect)
+        elif backend == "fake":
+            _executors[backend] = ConnectorExecutor(backend, _fake_connect)
+        else:
+            raise click.BadParameter(f"Unknown backend: {backend}")
+    return _executors[backend]
+
+
+def _report(timing: StepTiming) -> None:
+    if timing.saved is not None:
+        click.echo(
+            f"  {timing.step}: {timing.seconds:.2f}s ({timing.backend}) vs"
+            f" {timing.baseline:.2f}s (snow) -- saved {timing.saved:.2f}s"
+        )
+    elif timing.backend != "snow":
+        click.echo(f"  {timing.step}: {timing.seconds:.2f}s ({timing.backend}),"
+                   " no snow baseline recorded yet")
+
+
+def execute(backend: str, sql_path: Path, variables: dict[str, str], connection: str) -> int:
+    """Run one SQL step on ``backend``, record and report its timing."""
+    from hirc_demo import telemetry
+
+    executor = get_executor(backend)
+    step = sql_path.stem
+    start = time.perf_counter()
+    with telemetry.step(step, backend) as span:
+        returncode = executor.run(sql_path, variables, connection, span)
+    timing = StepTiming(step, backend, time.perf_counter() - start)
+    if returncode != 0:
+        return returncode
+
+    timing.baseline = _load_timings().get(step, {}).get("snow")
+    _record_timing(timing)
+    timings.append(timing)
+    _report(timing)
+    return 0
+
+
+def execute_batch(backend: str, steps: list[tuple[Path, dict[str, str]]],
+                  connection: str) -> int:
+    """Run several SQL steps as one multi-statement submission on ``backend``.
+
+    The timing is compared with the sum of the steps' recorded ``snow``
+    runs (one subprocess each), when all of them are known.
+    """
+    from hirc_demo import telemetry
+
+    executor = get_executor(backend)
+    rendered = [rendered_sql(sql_path, variables) for sql_path, variables in steps]
+    names = [sql_path.stem for sql_path, _ in steps]
+    label = "+".join(names)
+    start = time.perf_counter()
+    with telemetry.step("batch", backend, steps=names) as span:
+        returncode = executor.submit(combine_rendered(rendered), f"{label} (batch)",
+                                     connection, span)
+    timing = StepTiming("batch", f"{backend}-batch", time.perf_counter() - start)
+    if returncode != 0:
+        return returncode
+
+    recorded = _load_timings()
+    baselines = [recorded.get(name, {}).get("snow") for name in names]
+    if all(b is not None for b in baselines):
+        timing.baseline = sum(baselines)
+    timings.append(timing)
+    _report(timing)
+    return 0
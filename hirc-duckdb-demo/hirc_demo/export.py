@@ -0,0 +1,258 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``hirc-demo-query`` -- stream a DuckDB query over the catalog to a file.
+
+``fetchall()`` (as in the notebook) turns the whole result into Python
+tuples before anything is written.  :func:`export_query` instead pulls
+Arrow record batches of at most ``batch_rows`` rows from DuckDB's
+streaming result and writes each one before fetching the next, so peak
+memory is bounded by the batch size (plus DuckDB's own
+``memory_limit``), not by the size of the result.
+
+Supported outputs are Parquet, CSV and NDJSON files, or stdout (``-``)
+for CSV and NDJSON.  Rows per second and bytes written are reported on
+stderr so they never mix with results streamed to stdout.
+"""
+
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import click
+import duckdb
+import pyarrow as pa
+
+from hirc_demo.cli import _require_env
+from hirc_demo.daemon import DaemonCommand
+from hirc_demo.query import (
+    DEFAULT_ALIAS,
+    DEFAULT_CACHE_DIR,
+    DataFileCache,
+    _quote,
+    attach_from_env,
+)
+
+FORMATS = ("parquet", "csv", "ndjson")
+DEFAULT_BATCH_ROWS = 65_536
+
+_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+@dataclass
+class ExportStats:
+    """Counters for one :func:`export_query` call."""
+
+    rows: int = 0
+    batches: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class _CountingWriter:
+    """Binary file wrapper that counts the bytes written through it."""
+
+    def __init__(self, raw: BinaryIO):
+        self._raw = raw
+        self.bytes_written = 0
+
+    def write(self, data) -> int:
+        self._raw.write(data)
+        n = memoryview(data).nbytes
+        self.bytes_written += n
+        return n
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    @property
+    def closed(self) -> bool:
+        return self._raw.closed
+
+    def writable(self) -> bool:
+        return True
+
+
+class _NdjsonWriter:
+    """Write record batches as one JSON object per line.
+
+    pyarrow has no JSON writer, so each batch is serialized by DuckDB's
+    ``to_json`` on a private connection (the query's own connection is
+    busy streaming the result).  The lines come back as one Arrow string
+    column whose data buffer is written to the sink as is -- no Python
+    object is created per row.
+    """
+
+    def __init__(self, sink: _CountingWriter, schema: pa.Schema):
+        self._sink = sink
+        self._conn = duckdb.connect()
+
+    def write_batch(self, batch: pa.RecordBatch) -> None:
+        self._conn.register("batch", batch)
+        lines = self._conn.execute(
+            "SELECT to_json(b)::VARCHAR || chr(10) AS line FROM batch b"
+        ).fetch_record_batch()
+        for chunk in lines:
+            column = chunk.column(0)
+            if not len(column):
+                continue
+            offsets = memoryview(column.buffers()[1]).cast(
+                "q" if pa.types.is_large_string(column.type) else "i"
+            )
+            start, end = offsets[column.offset], offsets[column.offset + len(column)]
+            self._sink.write(memoryview(column.buffers()[2])[start:end])
+
+    def close(self) -> None:
+        self._conn.close()
+        self._sink.flush()
+
+
+def _open_writer(fmt: str, sink: _CountingWriter, schema: pa.Schema):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(sink, schema)
+    if fmt == "csv":
+        import pyarrow.csv as pcsv
+
+        return pcsv.CSVWriter(sink, schema)
+    return _NdjsonWriter(sink, schema)
+
+
+def infer_format(output: str) -> str:
+    """Return the output format implied by ``output``'s extension (CSV for stdout)."""
+    if output == "-":
+        return "csv"
+    fmt = _EXTENSIONS.get(Path(output).suffix.lower())
+    if fmt is None:
+        raise click.BadParameter(
+            f"cannot infer format from '{output}'; pass --format", param_hint="--output"
+        )
+    return fmt
+
+
+def export_query(conn: duckdb.DuckDBPyConnection, sql: str, sink: BinaryIO, fmt: str,
+                 batch_rows: int = DEFAULT_BATCH_ROWS) -> ExportStats:
+    """Run ``sql`` and write its result to ``sink`` one record batch at a time."""
+    stats = ExportStats()
+    counter = _CountingWriter(sink)
+    start = time.perf_counter()
+    reader = conn.execute(sql).fetch_record_batch(batch_rows)
+    writer = _open_writer(fmt, counter, reader.schema)
+    try:
+        for batch in reader:
+            writer.write_batch(batch)
+            stats.rows += batch.num_rows
+            stats.batches += 1
+    finally:
+        writer.close()
+    stats.seconds = time.perf_counter() - start
+    stats.bytes_written = counter.bytes_written
+    return stats
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("sql", required=False)
+@click.option("--file", "-f", "sql_file", type=click.Path(exists=True, dir_okay=False),
+              help="Read the query from a file instead of the SQL argument")
+@click.option("--output", "-o", default="-", show_default=True,
+              help="Output file, or - for stdout")
+@click.option("--format", "fmt", type=click.Choice(FORMATS),
+              help="Output format (default: from the --output extension, csv for stdout)")
+@click.option("--batch-rows", default=DEFAULT_BATCH_ROWS, show_default=True,
+              type=click.IntRange(1), help="Rows per Arrow record batch")
+@click.option("--cached", "cached_tables", multiple=True, metavar="TABLE",
+              help="Serve TABLE (e.g. PUBLIC.FRUITS) from the local data file cache as a view"
+                   " named after the table (FRUITS); repeatable")
+@click.option("--threads", type=click.IntRange(1), help="DuckDB worker threads")
+@click.option("--memory-limit", help="DuckDB memory_limit, e.g. 2GB")
+@click.option("--dry-run", is_flag=True, help="Show what would run without executing")
+def query(sql: str | None, sql_file: str | None, output: str, fmt: str | None,
+          batch_rows: int, cached_tables: tuple[str, ...], threads: int | None,
+          memory_limit: str | None, dry_run: bool) -> None:
+    """Stream a DuckDB query over the demo catalog to Parquet, CSV or NDJSON.
+
+    Attaches DEMO_DATABASE as snowflake_catalog (like sql/demo.sql) and
+    writes the result batch by batch, so memory stays bounded however
+    many rows the query returns. Reports rows/s and bytes on stderr.
+
+    \b
+    Example:
+      hirc-demo-query "SELECT * FROM snowflake_catalog.PUBLIC.FRUITS" -o fruits.parquet
+    """
+    if bool(sql) == bool(sql_file):
+        raise click.UsageError("Pass exactly one of SQL or --file")
+    sql = sql or Path(sql_file).read_text()
+    fmt = fmt or infer_format(output)
+    if fmt == "parquet" and output == "-":
+        raise click.UsageError("Parquet cannot be streamed to stdout; pass --output FILE")
+
+    if dry_run:
+        click.echo("Would run:", err=True)
+        click.echo(f"  {sql.strip()}", err=True)
+        click.echo(f"  -> {output} ({fmt}, {batch_rows} rows per batch)", err=True)
+        for table in cached_tables:
+            click.echo(f"  {table} served from {DEFAULT_CACHE_DIR}", err=True)
+        return
+
+    env = _require_env("DEMO_DATABASE")
+    if not os.environ.get("HIRC_DEMO_CATALOG_ENDPOINT", "").strip():
+        env.update(_require_env("SNOWFLAKE_ACCOUNT_URL", "SA_ROLE", "SA_PAT"))
+
+    conn = duckdb.connect()
+    conn.execute("SET enable_progress_bar = false")
+    if threads:
+        conn.execute(f"SET threads = {threads}")
+    if memory_limit:
+        conn.execute(f"SET memory_limit = {_quote(memory_limit)}")
+    attach_from_env(conn, env)
+
+    if cached_tables:
+        cache = DataFileCache()
+        for table in cached_tables:
+            view, stats = cache.register(conn, f"{DEFAULT_ALIAS}.{table}")
+            click.echo(
+                f"{table}: view {view} ({stats.hits} cached, {stats.downloaded} downloaded)",
+                err=True,
+            )
+
+    try:
+        if output == "-":
+            stats = export_query(conn, sql, sys.stdout.buffer, fmt, batch_rows)
+        else:
+            with open(output, "wb") as sink:
+                stats = export_query(conn, sql, sink, fmt, batch_rows)
+    except duckdb.Error as e:
+        click.echo(f"Query failed: {e}", err=True)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    click.echo(
+        f"{stats.rows:,} rows in {stats.batches} batches, {stats.bytes_written:,} bytes"
+        f" -> {output} ({fmt}) in {stats.seconds:.2f}s"
+        f" = {stats.rows_per_second:,.0f} rows/s, peak RSS {_peak_rss_mib():.0f} MiB",
+        err=True,
+    )
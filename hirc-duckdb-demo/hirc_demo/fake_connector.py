@@ -0,0 +1,105 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Offline stand-in for ``snowflake.connector`` used by the ``fake`` backend.
+
+Implements just the surface :class:`hirc_demo.executor.ConnectorExecutor`
+touches (``connect``, ``execute_stream``, cursors and ``close``).  Every
+statement is recorded on the connection instead of being sent anywhere.
+Set ``HIRC_DEMO_FAKE_LATENCY`` (seconds) to simulate login and
+per-statement round trips when comparing backends.
+"""
+
+import os
+import time
+
+connections: list["FakeConnection"] = []
+
+
+def _latency() -> float:
+    try:
+        return float(os.environ.get("HIRC_DEMO_FAKE_LATENCY", "0"))
+    except ValueError:
+        return 0.0
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split SQL on ``;`` outside quotes, ``$$`` blocks and ``--`` comments."""
+    statements: list[str] = []
+    buf: list[str] = []
+    i, quote, dollar = 0, None, False
+    while i < len(sql):
+        ch = sql[i]
+        if dollar:
+            if sql.startswith("$$", i):
+                dollar = False
+                buf.append("$$")
+                i += 2
+                continue
+        elif quote:
+            if ch == quote:
+                quote = None
+        elif sql.startswith("$$", i):
+            dollar = True
+            buf.append("$$")
+            i += 2
+            continue
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end
+            continue
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == ";":
+            stmt = "".join(buf).strip()
+            if stmt:
+                statements.append(stmt)
+            buf = []
+            i += 1
+            continue
+        buf.append(ch)
+        i += 1
+    stmt = "".join(buf).strip()
+    if stmt:
+        statements.append(stmt)
+    return statements
+
+
+class FakeCursor:
+    """Result of one recorded statement; never returns rows."""
+
+    def __init__(self, query: str):
+        self.query = query
+        self.rowcount = 0
+        self.description = None
+        self.sfqid = f"fake-{id(self):x}"
+
+    def fetchall(self) -> list[tuple]:
+        return []
+
+
+class FakeConnection:
+    """Records executed statements instead of talking to Snowflake."""
+
+    def __init__(self, connection_name: str | None = None, **kwargs):
+        self.connection_name = connection_name
+        self.kwargs = kwargs
+        self.executed: list[str] = []
+        self.closed = False
+
+    def execute_stream(self, stream, remove_comments: bool = False):
+        """Yield one cursor per statement, as it is executed."""
+        for stmt in split_statements(stream.read()):
+            time.sleep(_latency())
+            self.executed.append(stmt)
+            yield FakeCursor(stmt)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def connect(**kwargs) -> FakeConnection:
+    """Mirror of ``snowflake.connector.connect`` returning a recording connection."""
+    time.sleep(_latency())
+    conn = FakeConnection(**kwargs)
+    connections.append(conn)
+    return conn
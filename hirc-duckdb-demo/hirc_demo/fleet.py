@@ -0,0 +1,351 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``hirc-demo-fleet`` -- provision one prefixed demo per workshop attendee.
+
+Takes a (shared) manifest and a list of attendee names and derives each
+attendee's values the way ``hirc-demo-replay --as-user`` does: every
+``# ADAPT:`` value has the manifest's ``shared_by`` prefix swapped for
+the attendee's name (``ALICE_HIRC_DUCKDB_DEMO`` -> ``BOB_HIRC_DUCKDB_DEMO``),
+and ``--rename`` pins values every attendee shares (one external volume
+for the whole room, say).
+
+All scripts are rendered locally up front, then each attendee's steps
+run as ``snow sql`` submissions on a bounded thread pool
+(``--max-parallel``) while a shared limiter spaces submissions at most
+``--rate`` per second, so the account never sees a burst of 300 logins.
+An attendee's steps run in order and stop at its first failure; other
+attendees carry on.  A progress line is printed as each attendee
+finishes, failures are collected into a JSON report and the failed names
+are written to a file that can be fed straight back in.
+
+Steps spawn whatever ``snow`` is first on ``PATH``, so a fleet can be
+exercised end to end against a stub executable.  The fleet does not
+read or write ``.snow-utils/hirc-demo-state.json``: that file tracks
+one user's demo, not the room's.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import click
+
+from hirc_demo.cli import _get_sql_dir, _load_dotenv, _require_env
+from hirc_demo.daemon import DaemonCommand
+from hirc_demo.executor import SnowExecutor, combine_rendered, rendered_sql
+from hirc_demo.manifest import ManifestError, adapt, load
+from hirc_demo.replay import _env_values, _parse_renames
+
+_FAILED_FILE = Path(".snow-utils") / "hirc-demo-fleet-failed.txt"
+_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+# step -> (SQL file, values it needs, takes --schema/--table); as in cli.py
+_STEPS = {
+    "setup": ("demo_setup.sql", ("DEMO_DATABASE", "SA_ROLE", "EXTERNAL_VOLUME_NAME"), False),
+    "data": ("sample_data.sql", ("DEMO_DATABASE", "EXTERNAL_VOLUME_NAME"), False),
+    "rbac": ("rbac.sql", ("DEMO_DATABASE", "SA_ROLE"), True),
+    "revoke-rbac": ("revoke_rbac.sql", ("DEMO_DATABASE", "SA_ROLE"), True),
+    "cleanup": ("cleanup.sql", ("DEMO_DATABASE",), False),
+}
+# value -> template variable
+_VARIABLES = {
+    "DEMO_DATABASE": "database_name",
+    "SA_ROLE": "sa_role",
+    "EXTERNAL_VOLUME_NAME": "external_volume_name",
+}
+
+
+@dataclass
+class Attendee:
+    """One attendee: derived values, rendered scripts and outcome."""
+
+    name: str
+    values: dict[str, str] = field(default_factory=dict)
+    scripts: list[tuple[str, Path]] = field(default_factory=list)
+    status: str = "pending"
+    step: str | None = None
+    started: float | None = None
+    seconds: float | None = None
+    returncode: int | None = None
+    output: str = field(default="", repr=False)
+
+
+class RateLimiter:
+    """Space calls to :meth:`wait` at least ``1/rate`` seconds apart, across threads.
+
+    A ``rate`` of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+            self.waited += slot - now
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_attendees(lines: Iterable[str]) -> list[Attendee]:
+    """Parse one attendee name per line; blank lines and ``#`` comments are ignored."""
+    attendees: list[Attendee] = []
+    seen: dict[str, int] = {}
+    errors = []
+    for lineno, raw in enumerate(lines, 1):
+        name = raw.split("#", 1)[0].strip()
+        if not name:
+            continue
+        if not _NAME.match(name):
+            errors.append(f"line {lineno}: '{name}' is not a valid prefix (letters, digits, _)")
+        elif name.upper() in seen:
+            errors.append(f"line {lineno}: {name} repeats line {seen[name.upper()]}")
+        else:
+            seen[name.upper()] = lineno
+            attendees.append(Attendee(name))
+    if errors:
+        raise click.BadParameter("\n".join(errors), param_hint="ATTENDEES")
+    if not attendees:
+        raise click.BadParameter("no attendees listed", param_hint="ATTENDEES")
+    return attendees
+
+
+def _provision(attendee: Attendee, connection: str, limiter: RateLimiter, t0: float) -> None:
+    attendee.status = "running"
+    attendee.started = time.perf_counter() - t0
+    snow = SnowExecutor()
+    for label, rendered in attendee.scripts:
+        limiter.wait()
+        try:
+            result = subprocess.run(
+                snow.command(rendered, connection),
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            )
+        except Exception as e:  # e.g. snow missing from PATH: this attendee fails
+            attendee.returncode = None
+            attendee.output += f"{type(e).__name__}: {e}\n"
+            attendee.step = label
+            break
+        attendee.returncode = result.returncode
+        attendee.output += result.stdout
+        if result.returncode != 0:
+            attendee.step = label
+            break
+    attendee.seconds = time.perf_counter() - t0 - attendee.started
+    attendee.status = "failed" if attendee.step else "ok"
+
+
+def _last_line(output: str) -> str:
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    return lines[-1] if lines else "(no output)"
+
+
+def run_fleet(attendees: list[Attendee], connection: str, max_parallel: int,
+              limiter: RateLimiter) -> float:
+    """Provision every attendee; a failure never stops the others.
+
+    Returns the total wall time in seconds.  On Ctrl-C, running attendees
+    finish and the ones not yet started are marked skipped.
+    """
+    t0 = time.perf_counter()
+    done = failed = 0
+    pool = ThreadPoolExecutor(max_workers=max_parallel)
+    futures = {pool.submit(_provision, a, connection, limiter, t0): a for a in attendees}
+    try:
+        for future in as_completed(futures):
+            attendee = futures[future]
+            future.result()
+            done += 1
+            failed += attendee.status == "failed"
+            running = sum(a.status == "running" for a in attendees)
+            click.echo(
+                f"[{time.perf_counter() - t0:6.2f}s] {attendee.status:<6} {attendee.name}"
+                f" ({attendee.seconds:.2f}s)  {done}/{len(attendees)} done, {failed} failed,"
+                f" {running} running"
+            )
+            if attendee.status == "failed":
+                click.echo(f"         {attendee.name} {attendee.step}:"
+                           f" {_last_line(attendee.output)}", err=True)
+    except KeyboardInterrupt:
+        click.echo("Interrupted: letting running attendees finish, skipping the rest", err=True)
+        pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        pool.shutdown(wait=True)
+    for attendee in attendees:
+        if attendee.status == "pending":
+            attendee.status = "skipped"
+    return time.perf_counter() - t0
+
+
+def _write_report(path: Path, source: Path, attendees: list[Attendee], total: float,
+                  max_parallel: int, rate: float, limiter: RateLimiter, batch: bool) -> None:
+    counts: dict[str, int] = {}
+    for a in attendees:
+        counts[a.status] = counts.get(a.status, 0) + 1
+    report = {
+        "command": "hirc-demo-fleet",
+        "manifest": str(source),
+        "batch": batch,
+        "max_parallel": max_parallel,
+        "rate": rate,
+        "total_seconds": round(total, 3),
+        "throttled_seconds": round(limiter.waited, 3),
+        "counts": counts,
+        "attendees": [
+            {
+                "name": a.name,
+                "status": a.status,
+                "values": a.values,
+                "failed_step": a.step,
+                "started_at": None if a.started is None else round(a.started, 3),
+                "seconds": None if a.seconds is None else round(a.seconds, 3),
+                "returncode": a.returncode,
+                "output": a.output.splitlines()[-20:] if a.status == "failed" else [],
+            }
+            for a in attendees
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("manifest_path", metavar="MANIFEST", type=click.Path(dir_okay=False))
+@click.argument("attendees_file", metavar="ATTENDEES", type=click.File("r"))
+@click.option("--step", "steps", multiple=True, type=click.Choice(list(_STEPS)),
+              help="Step to run per attendee, in order (repeatable; default: setup data rbac)")
+@click.option("--rename", "renames", multiple=True, metavar="OLD=NEW",
+              help="Give every attendee this value instead of a prefixed one (repeatable)")
+@click.option("--connection", help="Snow CLI connection (default: .env's)")
+@click.option("--schema", default="PUBLIC", help="Schema name (default: PUBLIC)")
+@click.option("--table", default="FRUITS", help="Table name (default: FRUITS)")
+@click.option("--max-parallel", default=8, show_default=True, type=click.IntRange(1),
+              help="Maximum attendees provisioning at once")
+@click.option("--rate", default=4.0, show_default=True, type=click.FloatRange(0),
+              help="Maximum snow sql submissions started per second (0: no limit)")
+@click.option("--batch", is_flag=True,
+              help="Send each attendee's steps as one submission instead of one per step")
+@click.option("--report", default=".snow-utils/hirc-demo-fleet-report.json", show_default=True,
+              type=click.Path(dir_okay=False), help="Where to write the per-attendee report")
+@click.option("--dry-run", is_flag=True, help="Show each attendee's values without running")
+def fleet(manifest_path: str, attendees_file, steps: tuple[str, ...], renames: tuple[str, ...],
+          connection: str | None, schema: str, table: str, max_parallel: int, rate: float,
+          batch: bool, report: str, dry_run: bool) -> None:
+    """Provision the demo for every attendee listed in ATTENDEES.
+
+    ATTENDEES is a file (or - for stdin) with one name per line; each
+    name replaces MANIFEST's shared_by prefix in the # ADAPT: values, so
+    every attendee gets their own database. Attendees provision
+    concurrently; a failure is recorded and the rest carry on. Values
+    the manifest lacks (e.g. EXTERNAL_VOLUME_NAME) come from .env.
+
+    \b
+    Example:
+      hirc-demo-fleet hirc-duckdb-demo-manifest.md attendees.txt \\
+        --rename ALICE_HIRC_DUCKDB_DEMO_VOL=WORKSHOP_VOL --max-parallel 16
+    """
+    source = Path(manifest_path)
+    steps = steps or ("setup", "data", "rbac")
+    attendees = read_attendees(attendees_file)
+    try:
+        manifest = load(source)
+        if not manifest.shared_by:
+            raise ManifestError(f"{source}: no shared_by in ## shared_info, so there is no"
+                                " prefix to swap for each attendee")
+        renamed = _parse_renames(renames)
+        for attendee in attendees:
+            admin_role, attendee.values = _env_values(adapt(manifest, attendee.name, renamed))
+    except ManifestError as e:
+        click.echo(f"Cannot provision fleet: {e}", err=True)
+        sys.exit(1)
+
+    if not connection:
+        env = _require_env("SNOWFLAKE_DEFAULT_CONNECTION_NAME")
+        connection = env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]
+    _load_dotenv()
+    needed = {name for step in steps for name in _STEPS[step][1]}
+    defaults = {name: os.environ[name].strip() for name in needed
+                if os.environ.get(name, "").strip()}
+    missing = sorted(needed - set(defaults) - set(attendees[0].values))
+    if missing:
+        click.echo(f"Missing values (not in {source} or .env): {', '.join(missing)}", err=True)
+        sys.exit(1)
+    owners: dict[str, str] = {}
+    for attendee in attendees:
+        attendee.values = {**defaults, **attendee.values}
+        database = attendee.values["DEMO_DATABASE"]
+        if database in owners:
+            click.echo(f"{attendee.name} and {owners[database]} would share database {database};"
+                       " it must carry the shared_by prefix, marked # ADAPT:, and not be"
+                       " pinned with --rename", err=True)
+            sys.exit(1)
+        owners[database] = attendee.name
+
+    sql_dir = _get_sql_dir()
+    for step in steps:
+        if not (sql_dir / _STEPS[step][0]).exists():
+            click.echo(f"SQL file not found: {sql_dir / _STEPS[step][0]}", err=True)
+            sys.exit(1)
+    for attendee in attendees:
+        rendered = []
+        for step in steps:
+            sql_file, names, takes_table = _STEPS[step]
+            variables = {"admin_role": admin_role,
+                         **{_VARIABLES[n]: attendee.values[n] for n in names}}
+            if takes_table:
+                variables.update(schema=schema, table=table)
+            rendered.append((step, rendered_sql(sql_dir / sql_file, variables)))
+        if batch:
+            attendee.scripts = [("+".join(steps), combine_rendered([r for _, r in rendered]))]
+        else:
+            attendee.scripts = rendered
+
+    submissions = sum(len(a.scripts) for a in attendees)
+    if dry_run:
+        click.echo(f"{'Attendee':<16} {'Database':<32} SA Role")
+        for a in attendees:
+            click.echo(f"{a.name:<16} {a.values['DEMO_DATABASE']:<32}"
+                       f" {a.values.get('SA_ROLE', '-')}")
+        limit = f"at most {rate:g}/s" if rate else "no rate limit"
+        click.echo(f"\nWould run {' '.join(steps)} for {len(attendees)} attendee(s) as"
+                   f" {submissions} snow sql submission(s) on connection {connection},"
+                   f" {max_parallel} at once, {limit}.")
+        return
+
+    click.echo(f"Provisioning {len(attendees)} attendee(s): {' '.join(steps)}"
+               f"{' (batched)' if batch else ''}")
+    limiter = RateLimiter(rate)
+    total = run_fleet(attendees, connection, max_parallel, limiter)
+    _write_report(Path(report), source, attendees, total, max_parallel, rate, limiter, batch)
+
+    ok = [a for a in attendees if a.status == "ok"]
+    failed = [a for a in attendees if a.status != "ok"]
+    click.echo(f"\nProvisioned {len(ok)}/{len(attendees)} attendee(s) in {total:.2f}s"
+               f" ({submissions / total:.1f} submissions/s, throttled {limiter.waited:.2f}s)")
+    click.echo(f"Report: {report}")
+    if not failed:
+        _FAILED_FILE.unlink(missing_ok=True)
+        return
+    click.echo(f"\n{'Attendee':<16} {'Status':<8} {'Step':<12} Error")
+    for a in failed:
+        error = _last_line(a.output) if a.status == "failed" else "-"
+        click.echo(f"{a.name:<16} {a.status:<8} {a.step or '-':<12} {error}")
+    _FAILED_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _FAILED_FILE.write_text("".join(f"{a.name}\n" for a in failed))
+    click.echo(f"\nRetry them with: hirc-demo-fleet {source} {_FAILED_FILE}", err=True)
+    sys.exit(1)
@@ -0,0 +1,268 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``hirc-demo-gc`` -- find and drop leftover demo databases.
+
+``hirc-demo-cleanup`` drops the one database named in ``.env``.  After a
+workshop (see ``hirc-demo-fleet``) the account holds one
+``*_HIRC_DUCKDB_DEMO`` database per attendee.  ``hirc-demo-gc`` lists
+them with ``SHOW DATABASES LIKE`` (``sql/gc/show.sql``), keeps the ones
+younger than ``--older-than`` and the one ``.env`` still points at,
+shows the candidates and, once confirmed, drops them in batches of
+``--batch-size`` databases per ``snow sql`` submission, with up to
+``--max-parallel`` batches running at once.
+
+A batch stops at its first failing statement, so after dropping the
+databases are listed again and each candidate is recorded as
+``dropped`` or ``failed`` in an append-only JSON lines audit log.  SA
+roles, external volumes and PATs belong to the snow-utils-* skills and
+are never touched.
+
+Every ``snow`` call goes to whatever ``snow`` is first on ``PATH``, so
+the whole cycle can be exercised against a stub executable.
+"""
+
+import getpass
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import click
+
+from hirc_demo.cli import _get_sql_dir, _load_dotenv, _require_env
+from hirc_demo.daemon import DaemonCommand
+from hirc_demo.executor import SnowExecutor, rendered_sql
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+_AGE = re.compile(r"^(\d+)([mhdw])$")
+_AGE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+@dataclass
+class Candidate:
+    """A database matched by name pattern."""
+
+    name: str
+    owner: str
+    created_on: datetime
+    status: str = "candidate"
+    batch: int | None = None
+
+
+def parse_age(value: str) -> timedelta:
+    """Parse ``30m``, ``12h``, ``7d`` or ``2w``."""
+    found = _AGE.match(value.strip())
+    if not found:
+        raise click.BadParameter(f"expected a number and m/h/d/w (e.g. 7d), got '{value}'",
+                                 param_hint="--older-than")
+    return timedelta(**{_AGE_UNITS[found[2]]: int(found[1])})
+
+
+def _age(created_on: datetime, now: datetime) -> str:
+    seconds = (now - created_on).total_seconds()
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return "<1m"
+
+
+def _snow(sql_path: Path, variables: dict, connection: str,
+          json_output: bool = False) -> subprocess.CompletedProcess:
+    cmd = SnowExecutor().command(rendered_sql(sql_path, variables), connection)
+    if json_output:
+        cmd += ["--format", "json"]
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def _rows(output: str) -> list[dict]:
+    """Rows of the SHOW in ``snow sql --format json`` output (one or many results)."""
+    data = json.loads(output or "[]")
+    results = data if data and all(isinstance(r, list) for r in data) else [data]
+    return [row for result in results for row in result
+            if isinstance(row, dict) and "name" in row and "created_on" in row]
+
+
+def discover(pattern: str, admin_role: str, sql_dir: Path, connection: str) -> list[Candidate]:
+    """List the databases whose name is LIKE ``pattern``."""
+    result = _snow(sql_dir / "gc" / "show.sql",
+                   {"admin_role": admin_role, "pattern": pattern}, connection, json_output=True)
+    if result.returncode != 0:
+        raise click.ClickException(f"SHOW DATABASES failed:\n{result.stderr.strip()}")
+    try:
+        rows = _rows(result.stdout)
+    except ValueError as e:
+        raise click.ClickException(f"SHOW DATABASES returned no JSON: {e}") from e
+    found = []
+    for row in rows:
+        created = datetime.fromisoformat(str(row["created_on"]).replace(" ", "T", 1))
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        found.append(Candidate(row["name"], row.get("owner") or "", created))
+    return found
+
+
+def _drop_batch(batch: list[Candidate], admin_role: str, sql_dir: Path,
+                connection: str) -> tuple[int, float, str]:
+    started = time.perf_counter()
+    result = _snow(sql_dir / "gc" / "drop_databases.sql", {
+        "admin_role": admin_role,
+        "databases": [{"name": c.name, "owner": c.owner} for c in batch],
+    }, connection)
+    return result.returncode, time.perf_counter() - started, result.stdout + result.stderr
+
+
+def drop(candidates: list[Candidate], admin_role: str, sql_dir: Path, connection: str,
+         batch_size: int, max_parallel: int) -> None:
+    """Drop ``candidates`` in batches, up to ``max_parallel`` submissions at once.
+
+    Each candidate's status is set from its batch's outcome; see :func:`verify`.
+    """
+    t0 = time.perf_counter()
+    batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        futures = []
+        for number, batch in enumerate(batches, 1):
+            for c in batch:
+                c.batch = number
+            futures.append(pool.submit(_drop_batch, batch, admin_role, sql_dir, connection))
+        for number, (batch, future) in enumerate(zip(batches, futures), 1):
+            returncode, seconds, output = future.result()
+            status = "ok" if returncode == 0 else "failed"
+            for c in batch:
+                c.status = "dropped" if returncode == 0 else "failed"
+            click.echo(f"[{time.perf_counter() - t0:6.2f}s] {status:<6} batch {number}"
+                       f"/{len(batches)}: {len(batch)} database(s) ({seconds:.2f}s)")
+            if returncode != 0:
+                click.echo(output.rstrip(), err=True)
+
+
+def verify(pattern: str, dropped: list[Candidate], admin_role: str, sql_dir: Path,
+           connection: str) -> None:
+    """List the databases again and mark every candidate still present as failed.
+
+    A failed batch stops at its first error, so databases before it are
+    gone and the rest are not; without a listing, batch outcomes stand.
+    """
+    try:
+        remaining = {c.name for c in discover(pattern, admin_role, sql_dir, connection)}
+    except click.ClickException as e:
+        click.echo(f"Could not verify the drops: {e.message}", err=True)
+        return
+    for c in dropped:
+        c.status = "failed" if c.name in remaining else "dropped"
+
+
+def _audit(path: Path, candidates: list[Candidate], connection: str, admin_role: str) -> None:
+    stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    user = getpass.getuser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as log:
+        for c in candidates:
+            log.write(json.dumps({
+                "at": stamp,
+                "command": "hirc-demo-gc",
+                "user": user,
+                "connection": connection,
+                "admin_role": admin_role,
+                "kind": "database",
+                "name": c.name,
+                "owner": c.owner,
+                "created_on": c.created_on.isoformat(),
+                "batch": c.batch,
+                "status": c.status,
+            }) + "\n")
+
+
+@click.command(cls=DaemonCommand)
+@click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
+@click.option("--database-like", default="%_HIRC_DUCKDB_DEMO", show_default=True,
+              help="SHOW DATABASES LIKE pattern")
+@click.option("--older-than", default="1d", show_default=True,
+              help="Only databases created at least this long ago (30m, 12h, 7d, 2w)")
+@click.option("--keep", "keep", multiple=True, metavar="NAME",
+              help="Never drop this database (repeatable)")
+@click.option("--connection", help="Snow CLI connection (default: .env's)")
+@click.option("--batch-size", default=25, show_default=True, type=click.IntRange(1),
+              help="Databases dropped per snow sql submission")
+@click.option("--max-parallel", default=4, show_default=True, type=click.IntRange(1),
+              help="Maximum submissions running at once")
+@click.option("--audit-log", default=".snow-utils/hirc-demo-gc-audit.jsonl", show_default=True,
+              type=click.Path(dir_okay=False), help="JSON lines log appended for every drop")
+@click.option("--yes", is_flag=True, help="Drop without asking for confirmation")
+@click.option("--dry-run", is_flag=True, help="List the candidates without dropping anything")
+def gc(admin_role: str, database_like: str, older_than: str, keep: tuple[str, ...],
+       connection: str | None, batch_size: int, max_parallel: int, audit_log: str, yes: bool,
+       dry_run: bool) -> None:
+    """Find demo databases by name and age, and drop them.
+
+    Lists databases LIKE --database-like created more than --older-than
+    ago, leaving out --keep names and the DEMO_DATABASE in .env. After
+    confirmation, drops them in parallel batches and appends the outcome
+    for every database to the audit log.
+    """
+    max_age = parse_age(older_than)
+    if "'" in database_like or not database_like.strip("%_"):
+        raise click.BadParameter(f"refusing pattern '{database_like}'",
+                                 param_hint="--database-like")
+    if not connection:
+        env = _require_env("SNOWFLAKE_DEFAULT_CONNECTION_NAME")
+        connection = env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]
+    _load_dotenv()
+    in_use = os.environ.get("DEMO_DATABASE", "").strip().upper()
+    kept = {name.upper() for name in keep}
+    sql_path = _get_sql_dir()
+    for sql_file in ("gc/show.sql", "gc/drop_databases.sql"):
+        if not (sql_path / sql_file).exists():
+            click.echo(f"SQL file not found: {sql_path / sql_file}", err=True)
+            sys.exit(1)
+
+    now = datetime.now(timezone.utc)
+    candidates, held = [], []
+    for c in sorted(discover(database_like, admin_role, sql_path, connection),
+                    key=lambda c: c.created_on):
+        if c.name.upper() == in_use:
+            held.append((c, "in .env"))
+        elif c.name.upper() in kept:
+            held.append((c, "--keep"))
+        elif now - c.created_on < max_age:
+            held.append((c, f"younger than {older_than}"))
+        elif not _IDENTIFIER.match(c.name):
+            held.append((c, "not a plain identifier"))
+        else:
+            candidates.append(c)
+
+    if not candidates:
+        click.echo(f"No database candidates older than {older_than} ({len(held)} kept).")
+        return
+    click.echo(f"{'Database':<40} {'Created':<17} {'Age':>5}  Owner")
+    for c in candidates:
+        click.echo(f"{c.name:<40} {c.created_on:%Y-%m-%d %H:%M} {_age(c.created_on, now):>5}"
+                   f"  {c.owner}")
+    click.echo(f"\n{len(candidates)} database(s) older than {older_than}; {len(held)} kept"
+               + (f" ({', '.join(f'{c.name}: {why}' for c, why in held[:5])}"
+                  f"{', ...' if len(held) > 5 else ''})" if held else ""))
+    if dry_run:
+        click.echo(f"Would drop them in batches of {batch_size}, {max_parallel} at once.")
+        return
+    if not yes:
+        click.confirm(f"Drop these {len(candidates)} database(s)?", abort=True)
+
+    t0 = time.perf_counter()
+    drop(candidates, admin_role, sql_path, connection, batch_size, max_parallel)
+    verify(database_like, candidates, admin_role, sql_path, connection)
+    _audit(Path(audit_log), candidates, connection, admin_role)
+
+    dropped = sum(c.status == "dropped" for c in candidates)
+    click.echo(f"\nDropped {dropped}/{len(candidates)} database(s) in"
+               f" {time.perf_counter() - t0:.2f}s. Audit log: {audit_log}")
+    failed = [c for c in candidates if c.status != "dropped"]
+    if failed:
+        for c in failed:
+            click.echo(f"  failed   {c.name} (still exists)", err=True)
+        sys.exit(1)
@@ -0,0 +1,355 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Parser for snow-utils manifests (``.snow-utils/snow-utils-manifest.md``).
+
+A manifest is markdown with a fixed shape:
+
+* ``## name`` sections outside any block (``shared_info``,
+  ``required_skills``, ``admin_role``, ...) holding ``key: value`` lines,
+  ``key: |`` multi-line values and ``- item`` lists;
+* ``<!-- START -- skill:key -->`` ... ``<!-- END -- skill:key -->``
+  blocks, one per skill run, holding a ``## Title``, ``**Label:** value``
+  fields and a resource table;
+* ``# ADAPT: note`` markers after values (or in table cells) that a
+  receiver of a shared manifest must adapt to their own account.
+
+:func:`parse` reads all of that in one pass and raises
+:class:`ManifestError` (with the line number) on malformed blocks and
+tables.  :func:`adapt` rewrites marked values -- swapping the
+``shared_by`` prefix for the receiver's, or renaming single values --
+and :meth:`Manifest.unadapted` lists marked values that still carry
+the sharer's prefix.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+WORKING_MANIFEST = Path(".snow-utils") / "snow-utils-manifest.md"
+
+_MARKER = re.compile(
+    r"^<!--\s*(?P<kind>START|END)\s+--\s+(?P<skill>[\w.-]+)(?::(?P<key>\S+?))?\s*-->\s*$"
+)
+_HEADING = re.compile(r"^(?P<level>#{1,6})\s+(?P<text>.*?)\s*$")
+_FIELD = re.compile(r"^\*\*(?P<label>[^*]+?):\*\*\s*(?P<value>.*?)\s*$")
+_KEY_VALUE = re.compile(r"^(?P<key>[\w.-]+):\s*(?P<value>.*?)\s*$")
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+_ADAPT = "# ADAPT:"
+
+
+class ManifestError(ValueError):
+    """A manifest that cannot be parsed or is not ready to replay."""
+
+
+@dataclass
+class Field:
+    """One ``**Label:** value`` line (``adapt`` holds the ``# ADAPT:`` note)."""
+
+    label: str
+    value: str
+    line: int
+    adapt: str | None = None
+
+
+@dataclass
+class Table:
+    """A markdown table; ``rows`` map header to cell text."""
+
+    headers: list[str]
+    rows: list[dict[str, str]]
+    line: int
+
+
+@dataclass
+class Section:
+    """A ``## name`` section outside the START/END blocks."""
+
+    name: str
+    line: int
+    values: dict[str, str] = field(default_factory=dict)
+    items: list[str] = field(default_factory=list)
+    tables: list[Table] = field(default_factory=list)
+
+
+@dataclass
+class Block:
+    """A ``<!-- START -- skill:key -->`` ... ``<!-- END -->`` block."""
+
+    skill: str
+    key: str | None
+    start: int
+    end: int = 0
+    title: str = ""
+    fields: dict[str, Field] = field(default_factory=dict)
+    tables: list[Table] = field(default_factory=list)
+
+    @property
+    def status(self) -> str | None:
+        status = self.fields.get("Status")
+        return status.value if status else None
+
+    def get(self, label: str) -> str | None:
+        found = self.fields.get(label)
+        return found.value if found else None
+
+
+@dataclass
+class Mark:
+    """A value carrying an ``# ADAPT:`` marker."""
+
+    label: str
+    value: str
+    note: str
+    line: int
+
+
+@dataclass
+class Manifest:
+    path: Path | None
+    text: str
+    instruction: str | None = None
+    sections: dict[str, Section] = field(default_factory=dict)
+    blocks: list[Block] = field(default_factory=list)
+    marks: list[Mark] = field(default_factory=list)
+
+    @property
+    def shared_by(self) -> str | None:
+        info = self.sections.get("shared_info")
+        return info.values.get("shared_by") if info else None
+
+    @property
+    def is_shared(self) -> bool:
+        return "shared_info" in self.sections or self.instruction is not None
+
+    def where(self, line: int) -> str:
+        return f"{self.path or '<manifest>'}:{line}"
+
+    def block(self, skill: str) -> Block | None:
+        """Return the one block for ``skill`` (None when absent)."""
+        found = [b for b in self.blocks if b.skill == skill]
+        if len(found) > 1:
+            keys = ", ".join(str(b.key) for b in found)
+            raise ManifestError(
+                f"{self.where(found[1].start)}: several {skill} sections ({keys});"
+                " keep one before replaying"
+            )
+        return found[0] if found else None
+
+    def unadapted(self) -> list[Mark]:
+        """Marked values still using the ``shared_by`` prefix."""
+        token = _token(self.shared_by)
+        if token is None:
+            return []
+        return [m for m in self.marks if token.search(m.value)]
+
+
+def _token(prefix: str | None) -> re.Pattern | None:
+    if not prefix:
+        return None
+    return re.compile(rf"(?<![A-Za-z0-9]){re.escape(prefix)}(?![A-Za-z0-9])", re.IGNORECASE)
+
+
+def _split_adapt(raw: str) -> tuple[str, str | None]:
+    value, marker, note = raw.partition(_ADAPT)
+    return value.strip(), note.strip() if marker else None
+
+
+def _cells(line: str) -> list[str]:
+    return [c.strip() for c in line.strip().strip("|").split("|")]
+
+
+def parse(text: str, path: Path | None = None) -> Manifest:
+    """Parse manifest ``text``; ``path`` is only used in error messages."""
+    manifest = Manifest(path, text)
+    lines = text.splitlines()
+    block: Block | None = None
+    section: Section | None = None
+    multiline: tuple[Section, str] | None = None
+    i = 0
+    while i < len(lines):
+        line, lineno = lines[i], i + 1
+        stripped = line.strip()
+        i += 1
+
+        if multiline is not None:
+            if line.startswith((" ", "\t")) or not stripped:
+                owner, key = multiline
+                if stripped:
+                    joined = owner.values[key]
+                    owner.values[key] = f"{joined}\n{stripped}" if joined else stripped
+                continue
+            multiline = None
+
+        marker = _MARKER.match(stripped)
+        if marker:
+            skill, key = marker["skill"], marker["key"]
+            if marker["kind"] == "START":
+                if block is not None:
+                    raise ManifestError(
+                        f"{manifest.where(lineno)}: START for {skill} inside the"
+                        f" {block.skill} block opened at line {block.start}"
+                    )
+                block, section = Block(skill, key, lineno), None
+            else:
+                if block is None or (block.skill, block.key) != (skill, key):
+                    raise ManifestError(f"{manifest.where(lineno)}: END for {skill} without a"
+                                        " matching START")
+                block.end = lineno
+                manifest.blocks.append(block)
+                block = None
+            continue
+
+        if stripped.startswith("<!--"):
+            # Free-form comment (CORTEX_CODE_INSTRUCTION); may span lines.
+            body = [stripped]
+            while "-->" not in body[-1] and i < len(lines):
+                body.append(lines[i].strip())
+                i += 1
+            if "-->" not in body[-1]:
+                raise ManifestError(f"{manifest.where(lineno)}: unterminated comment")
+            comment = "\n".join(body)[4:].rsplit("-->", 1)[0].strip()
+            if comment.startswith("CORTEX_CODE_INSTRUCTION"):
+                manifest.instruction = comment
+            continue
+
+        if stripped.startswith("|"):
+            if i >= len(lines) or not _TABLE_SEPARATOR.match(lines[i].strip()):
+                raise ManifestError(f"{manifest.where(lineno)}: table row without a header"
+                                    " separator")
+            headers = _cells(stripped)
+            table = Table(headers, [], lineno)
+            i += 1
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                cells = _cells(lines[i])
+                if len(cells) != len(headers):
+                    raise ManifestError(
+                        f"{manifest.where(i + 1)}: table row has {len(cells)} cells,"
+                        f" header has {len(headers)}"
+                    )
+                row = dict(zip(headers, cells))
+                table.rows.append(row)
+                notes = [c for c in cells if _ADAPT in c]
+                if notes and "Name" in row:
+                    manifest.marks.append(
+                        Mark(f"{row.get('Type', 'Name')} (table)", row["Name"],
+                             _split_adapt(notes[0])[1] or "", i + 1)
+                    )
+                i += 1
+            owner = block or section
+            if owner is None:
+                raise ManifestError(f"{manifest.where(lineno)}: table outside any section")
+            owner.tables.append(table)
+            continue
+
+        heading = _HEADING.match(stripped)
+        if heading:
+            if block is not None:
+                block.title = block.title or heading["text"]
+            elif len(heading["level"]) == 2:
+                section = Section(heading["text"], lineno)
+                manifest.sections[section.name] = section
+            else:
+                section = None
+            continue
+
+        if block is not None:
+            found = _FIELD.match(stripped)
+            if found:
+                value, note = _split_adapt(found["value"])
+                label = found["label"].strip()
+                block.fields[label] = Field(label, value, lineno, note)
+                if note is not None:
+                    manifest.marks.append(Mark(label, value, note, lineno))
+            continue
+
+        if section is not None:
+            if stripped.startswith("- "):
+                section.items.append(stripped[2:].strip())
+                continue
+            found = _KEY_VALUE.match(stripped)
+            if found:
+                value, note = _split_adapt(found["value"])
+                if value == "|":
+                    section.values[found["key"]] = ""
+                    multiline = (section, found["key"])
+                else:
+                    section.values[found["key"]] = value
+                if note is not None:
+                    manifest.marks.append(Mark(found["key"], value, note, lineno))
+
+    if block is not None:
+        raise ManifestError(f"{manifest.where(block.start)}: START for {block.skill} has no"
+                            " matching END")
+    return manifest
+
+
+def load(path: Path) -> Manifest:
+    """Read and parse the manifest at ``path``."""
+    try:
+        text = Path(path).read_text()
+    except OSError as e:
+        raise ManifestError(f"cannot read manifest {path}: {e.strerror}") from e
+    return parse(text, Path(path))
+
+
+def _swap_prefix(value: str, token: re.Pattern, user: str) -> str:
+    def repl(match: re.Match) -> str:
+        found = match.group(0)
+        if found.isupper():
+            return user.upper()
+        if found.islower():
+            return user.lower()
+        return user
+
+    return token.sub(repl, value)
+
+
+def adapt(manifest: Manifest, user: str | None = None,
+          renames: dict[str, str] | None = None) -> Manifest:
+    """Return ``manifest`` with its ``# ADAPT:`` values rewritten.
+
+    ``renames`` maps a marked value to its replacement; every other
+    marked value has the ``shared_by`` prefix swapped for ``user`` (when
+    given).  Replacements apply wherever the value appears -- block
+    keys, titles, table rows -- so the manifest stays consistent.
+    """
+    renames = dict(renames or {})
+    marked = {m.value for m in manifest.marks}
+    unknown = sorted(set(renames) - marked)
+    if unknown:
+        raise ManifestError(
+            f"--rename: {', '.join(unknown)} not marked # ADAPT: in {manifest.path};"
+            f" adaptable values: {', '.join(sorted(marked)) or 'none'}"
+        )
+    token = _token(manifest.shared_by)
+    mapping: dict[str, str] = {}
+    for mark in manifest.marks:
+        new = renames.get(mark.value)
+        if new is None and user and token is not None:
+            new = _swap_prefix(mark.value, token, user)
+        if new and new != mark.value:
+            mapping[mark.value] = new
+    if not mapping:
+        return manifest
+
+    pattern = re.compile(
+        r"(?<![A-Za-z0-9_])("
+        + "|".join(re.escape(v) for v in sorted(mapping, key=len, reverse=True))
+        + r")(?![A-Za-z0-9_])"
+    )
+    return parse(pattern.sub(lambda m: mapping[m.group(1)], manifest.text), manifest.path)
+
+
+def set_status(manifest: Manifest, skill: str, status: str) -> Manifest:
+    """Return ``manifest`` with ``skill``'s ``**Status:**`` set (added if missing)."""
+    block = manifest.block(skill)
+    if block is None:
+        raise ManifestError(f"{manifest.path}: no {skill} section")
+    lines = manifest.text.splitlines(keepends=True)
+    current = block.fields.get("Status")
+    if current is not None:
+        lines[current.line - 1] = f"**Status:** {status}\n"
+    else:
+        after = max((f.line for f in block.fields.values()), default=block.start)
+        lines.insert(after, f"**Status:** {status}\n")
+    return parse("".join(lines), manifest.path)
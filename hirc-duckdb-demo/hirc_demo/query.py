@@ -0,0 +1,372 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""DuckDB access to the demo database through the Horizon Iceberg REST Catalog.
+
+:func:`attach_catalog` performs the same INSTALL/SECRET/ATTACH sequence as
+``sql/demo.sql`` from Python.  :class:`DataFileCache` keeps local copies of
+the table's Parquet data files so repeated analysis of an unchanged
+snapshot does not download the same bytes again:
+
+- data files are stored once by SHA-256 of their content
+  (``<cache_dir>/objects/ab/abcd....parquet``), so files shared by
+  several snapshots or tables are stored once;
+- ``index.json`` maps each ``table@snapshot/schema`` to its data file paths and
+  each (immutable) Iceberg data file path to its content hash, so an
+  unchanged snapshot is resolved without reading manifests again;
+- total size is bounded by ``max_bytes`` with least-recently-used
+  eviction (files of the table being registered are never evicted);
+- misses are streamed to disk in chunks through a ``pyarrow.fs``
+  filesystem (S3 with the catalog's vended credentials, or local files)
+  and hashed on the way, so a large data file is never held in memory.
+  Other storage falls back to DuckDB's ``read_blob``, which reads the
+  whole file at once.
+
+Tables whose current snapshot carries delete files, or data files written
+with a different schema than the table's current one (the cached copies are
+read with ``read_parquet``, which matches columns by name, not by Iceberg
+field id), are not cached; callers fall back to the remote ``iceberg_scan``
+in that case.
+
+``HIRC_DEMO_CATALOG_ENDPOINT`` points :func:`attach_from_env` at any Iceberg
+REST endpoint without authentication -- e.g. a local filesystem catalog
+stand-in for offline rehearsals and benchmarks.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import duckdb
+
+DEFAULT_ALIAS = "snowflake_catalog"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "hirc-demo" / "iceberg"
+DEFAULT_CACHE_BYTES = 2 * 1024**3
+_CHUNK_BYTES = 8 * 1024**2
+
+
+class CacheUnsupported(Exception):
+    """The table snapshot cannot be served from plain data file copies."""
+
+
+def _quote(value: str) -> str:
+    """Return ``value`` as a single-quoted SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _open_stream(path: str, storage: list[tuple[str, dict[str, str]]]):
+    """Open ``path`` as a ``pyarrow`` input stream, with vended S3 credentials."""
+    from pyarrow import fs
+
+    scheme, _, key = path.partition("://")
+    if scheme in ("s3", "s3a"):
+        config = next(c for prefix, c in storage if path.startswith(prefix))
+        options = {"access_key": config.get("s3.access-key-id"),
+                   "secret_key": config.get("s3.secret-access-key"),
+                   "session_token": config.get("s3.session-token"),
+                   "region": config.get("client.region") or config.get("s3.region"),
+                   "endpoint_override": config.get("s3.endpoint")}
+        filesystem = fs.S3FileSystem(**{k: v for k, v in options.items() if v})
+        return filesystem.open_input_stream(key)
+    filesystem, inner = fs.FileSystem.from_uri(path)
+    return filesystem.open_input_stream(inner)
+
+
+def _read_chunks(conn: duckdb.DuckDBPyConnection, path: str,
+                 storage: list[tuple[str, dict[str, str]]]) -> Iterator[bytes]:
+    """Yield the bytes of data file ``path`` in chunks of at most ``_CHUNK_BYTES``."""
+    try:
+        stream = _open_stream(path, storage)
+    except (OSError, ValueError, NotImplementedError):
+        # No pyarrow filesystem (or credentials) for this storage: DuckDB reads it whole.
+        yield bytes(conn.execute("SELECT content FROM read_blob(?)", [path]).fetchone()[0])
+        return
+    with stream:
+        while chunk := stream.read(_CHUNK_BYTES):
+            yield chunk
+
+
+def attach_catalog(
+    conn: duckdb.DuckDBPyConnection,
+    database: str,
+    endpoint: str,
+    *,
+    pat: str | None = None,
+    role: str | None = None,
+    oauth_uri: str | None = None,
+    alias: str = DEFAULT_ALIAS,
+) -> str:
+    """Attach ``database`` from an Iceberg REST ``endpoint`` as ``alias``.
+
+    With a ``pat`` the Horizon OAuth2 client-credentials secret from
+    ``sql/demo.sql`` is created first; without one the catalog is attached
+    unauthenticated.
+    """
+    for ext in ("iceberg", "httpfs"):
+        conn.execute(f"INSTALL {ext}")
+        conn.execute(f"LOAD {ext}")
+
+    if pat:
+        conn.execute(
+            "CREATE OR REPLACE SECRET snowflake_secret ("
+            " TYPE iceberg,"
+            " CLIENT_ID '',"
+            f" CLIENT_SECRET {_quote(pat)},"
+            f" OAUTH2_SERVER_URI {_quote(oauth_uri or endpoint + '/v1/oauth/tokens')},"
+            " OAUTH2_GRANT_TYPE 'client_credentials',"
+            f" OAUTH2_SCOPE {_quote('session:role:' + (role or ''))}"
+            ")"
+        )
+        auth = "SECRET snowflake_secret"
+    else:
+        auth = "AUTHORIZATION_TYPE 'none'"
+
+    conn.execute(
+        f"ATTACH {_quote(database)} AS {alias} ("
+        " TYPE iceberg,"
+        f" {auth},"
+        f" ENDPOINT {_quote(endpoint)},"
+        " SUPPORT_NESTED_NAMESPACES false"
+        ")"
+    )
+    return alias
+
+
+def attach_from_env(conn: duckdb.DuckDBPyConnection, env: dict[str, str],
+                    alias: str = DEFAULT_ALIAS) -> str:
+    """Attach the demo database using .env values (or the stand-in endpoint)."""
+    endpoint = os.environ.get("HIRC_DEMO_CATALOG_ENDPOINT", "").strip()
+    if endpoint:
+        return attach_catalog(conn, env["DEMO_DATABASE"], endpoint, alias=alias)
+    account_url = env["SNOWFLAKE_ACCOUNT_URL"].rstrip("/")
+    return attach_catalog(
+        conn,
+        env["DEMO_DATABASE"],
+        f"{account_url}/polaris/api/catalog",
+        pat=env["SA_PAT"],
+        role=env["SA_ROLE"],
+        oauth_uri=f"{account_url}/polaris/api/catalog/v1/oauth/tokens",
+        alias=alias,
+    )
+
+
+@dataclass
+class CacheStats:
+    """Counters for one :meth:`DataFileCache.register` call."""
+
+    table: str
+    snapshot_id: int | None = None
+    files: int = 0
+    hits: int = 0
+    downloaded: int = 0
+    bytes_downloaded: int = 0
+    evicted: int = 0
+
+
+class DataFileCache:
+    """Content-addressed, size-bounded local cache of Iceberg data files."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._index_path = self.cache_dir / "index.json"
+        self._index = self._load_index()
+
+    # -- index ---------------------------------------------------------------
+
+    def _load_index(self) -> dict:
+        try:
+            index = json.loads(self._index_path.read_text())
+        except (OSError, ValueError):
+            index = {}
+        for key in ("snapshots", "paths", "objects"):
+            index.setdefault(key, {})
+        return index
+
+    def _save_index(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._index, indent=1))
+        tmp.replace(self._index_path)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.cache_dir / "objects" / digest[:2] / f"{digest}.parquet"
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(o["size"] for o in self._index["objects"].values())
+
+    # -- snapshot resolution -------------------------------------------------
+
+    @staticmethod
+    def current_state(conn: duckdb.DuckDBPyConnection,
+                      table: str) -> tuple[int | None, int, dict[str, int]]:
+        """Return the current snapshot id, schema id and ``{column: field id}``."""
+        metadata = conn.execute(
+            f"SELECT metadata FROM iceberg_load_table_response({table})"
+        ).fetchone()[0]
+        snapshot_id = metadata.get("current-snapshot-id")
+        if snapshot_id is not None and int(snapshot_id) < 0:
+            snapshot_id = None
+        schema_id = int(metadata.get("current-schema-id", 0))
+        schema = next((s for s in metadata["schemas"] if int(s.get("schema-id", 0)) == schema_id),
+                      metadata["schemas"][-1])
+        fields = {f["name"]: int(f["id"]) for f in schema["fields"]}
+        return None if snapshot_id is None else int(snapshot_id), schema_id, fields
+
+    @staticmethod
+    def _file_fields(conn: duckdb.DuckDBPyConnection, path: str) -> dict[str, int | None]:
+        """Top-level ``{column: field id}`` of one Parquet data file."""
+        rows = conn.execute(
+            "SELECT name, field_id, coalesce(num_children, 0) FROM parquet_schema(?)", [path]
+        ).fetchall()
+        fields = {}
+        i = 1
+        for _ in range(rows[0][2]):
+            name, field_id, pending = rows[i]
+            fields[name] = None if field_id is None else int(field_id)
+            i += 1
+            while pending:
+                pending += rows[i][2] - 1
+                i += 1
+        return fields
+
+    @classmethod
+    def _data_files(cls, conn: duckdb.DuckDBPyConnection, table: str,
+                    fields: dict[str, int]) -> list[str]:
+        rows = conn.execute(
+            f"SELECT manifest_content, status, file_path FROM iceberg_metadata({table})"
+        ).fetchall()
+        if any(content != "DATA" for content, _, _ in rows):
+            raise CacheUnsupported(f"{table} has delete files in its current snapshot")
+        paths = sorted({path for _, status, path in rows if status != "DELETED"})
+        for path in paths:
+            if cls._file_fields(conn, path) != fields:
+                raise CacheUnsupported(
+                    f"{table} has data files written with an older schema ({path})"
+                )
+        return paths
+
+    # -- fetch / evict -------------------------------------------------------
+
+    @staticmethod
+    def _storage(conn: duckdb.DuckDBPyConnection,
+                 table: str) -> list[tuple[str, dict[str, str]]]:
+        """Vended storage credentials as ``(path prefix, config)``, longest prefix first."""
+        config, credentials = conn.execute(
+            f"SELECT config, storage_credentials FROM iceberg_load_table_response({table})"
+        ).fetchone()
+        storage = sorted(((c["prefix"], dict(c["config"] or {})) for c in credentials or []),
+                         key=lambda entry: len(entry[0]), reverse=True)
+        return storage + [("", dict(config or {}))]
+
+    def _fetch(self, conn: duckdb.DuckDBPyConnection, path: str,
+               storage: list[tuple[str, dict[str, str]]]) -> tuple[str, int]:
+        objects = self.cache_dir / "objects"
+        objects.mkdir(parents=True, exist_ok=True)
+        sha, size = hashlib.sha256(), 0
+        with tempfile.NamedTemporaryFile(dir=objects, suffix=".part", delete=False) as part:
+            try:
+                for chunk in _read_chunks(conn, path, storage):
+                    sha.update(chunk)
+                    part.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                part.close()
+                Path(part.name).unlink(missing_ok=True)
+                raise
+        digest = sha.hexdigest()
+        target = self._object_path(digest)
+        if target.exists():
+            Path(part.name).unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            Path(part.name).replace(target)
+        return digest, size
+
+    def _evict(self, pinned: set[str]) -> int:
+        objects = self._index["objects"]
+        total = self.total_bytes
+        evicted = 0
+        for digest in sorted(objects, key=lambda d: objects[d]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if digest in pinned:
+                continue
+            self._object_path(digest).unlink(missing_ok=True)
+            total -= objects.pop(digest)["size"]
+            evicted += 1
+        if evicted:
+            live = set(objects)
+            self._index["paths"] = {p: d for p, d in self._index["paths"].items() if d in live}
+        return evicted
+
+    # -- public API ----------------------------------------------------------
+
+    def local_files(self, conn: duckdb.DuckDBPyConnection, table: str) -> tuple[list[Path], CacheStats]:
+        """Return local copies of ``table``'s current data files, fetching misses."""
+        stats = CacheStats(table)
+        stats.snapshot_id, schema_id, fields = self.current_state(conn, table)
+        # A schema change (e.g. ADD COLUMN) does not always create a snapshot
+        key = f"{table}@{stats.snapshot_id}/{schema_id}"
+        paths = self._index["snapshots"].get(key)
+        if paths is None:
+            paths = self._data_files(conn, table, fields)
+            # Only the latest snapshot of a table is worth remembering
+            snapshots = self._index["snapshots"]
+            for stale in [k for k in snapshots if k.rsplit("@", 1)[0] == table]:
+                del snapshots[stale]
+            snapshots[key] = paths
+
+        now = time.time()
+        digests = []
+        storage = None
+        for path in paths:
+            digest = self._index["paths"].get(path)
+            if digest and self._object_path(digest).exists():
+                stats.hits += 1
+            else:
+                if storage is None:
+                    storage = self._storage(conn, table)
+                digest, size = self._fetch(conn, path, storage)
+                self._index["paths"][path] = digest
+                self._index["objects"][digest] = {"size": size, "last_used": now}
+                stats.downloaded += 1
+                stats.bytes_downloaded += size
+            self._index["objects"].setdefault(digest, {"size": 0, "last_used": now})
+            self._index["objects"][digest]["last_used"] = now
+            digests.append(digest)
+
+        stats.files = len(digests)
+        stats.evicted = self._evict(pinned=set(digests))
+        self._save_index()
+        return [self._object_path(d) for d in digests], stats
+
+    def register(self, conn: duckdb.DuckDBPyConnection, table: str,
+                 view: str | None = None) -> tuple[str, CacheStats]:
+        """Create a temp view named ``view`` over the cached copy of ``table``.
+
+        Falls back to a view over the remote table when the snapshot cannot
+        be cached (delete files present, or data files whose columns do not
+        match the current schema).
+        """
+        view = view or table.rsplit(".", 1)[-1]
+        try:
+            files, stats = self.local_files(conn, table)
+        except CacheUnsupported:
+            conn.execute(f"CREATE OR REPLACE TEMP VIEW {view} AS SELECT * FROM {table}")
+            return view, CacheStats(table)
+        if files:
+            file_list = ", ".join(_quote(str(f)) for f in files)
+            conn.execute(
+                f"CREATE OR REPLACE TEMP VIEW {view} AS "
+                f"SELECT * FROM read_parquet([{file_list}], union_by_name = true)"
+            )
+        else:
+            conn.execute(f"CREATE OR REPLACE TEMP VIEW {view} AS SELECT * FROM {table} LIMIT 0")
+        return view, stats
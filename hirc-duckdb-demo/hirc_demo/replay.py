@@ -0,0 +1,198 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``hirc-demo-replay`` -- replay the demo from a manifest in one command.
+
+Does what the SKILL.md Replay Flow does step by step, without an agent
+in the loop: parse the manifest (:mod:`hirc_demo.manifest`), adapt or
+reject ``# ADAPT:`` values still carrying the sharer's prefix, check the
+dependency sections, write the values to ``.env``, copy the manifest to
+``.snow-utils/`` marked IN_PROGRESS, run ``setup``, ``data`` and ``rbac``
+back to back (as ``hirc-demo-run``) and mark it COMPLETE.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import click
+from dotenv import find_dotenv, set_key
+
+from hirc_demo.cli import run
+from hirc_demo.daemon import DaemonCommand
+from hirc_demo.executor import BACKENDS
+from hirc_demo.manifest import (
+    WORKING_MANIFEST,
+    Manifest,
+    ManifestError,
+    adapt,
+    load,
+    set_status,
+)
+
+SKILL = "hirc-duckdb-demo"
+# Sections replay depends on; they are replayed by their own skills.
+_DEPENDENCIES = ("snow-utils-pat", "snow-utils-volumes")
+
+
+def _fail(message: str) -> None:
+    click.echo(message, err=True)
+    sys.exit(1)
+
+
+def _parse_renames(renames: tuple[str, ...]) -> dict[str, str]:
+    parsed = {}
+    for item in renames:
+        old, sep, new = item.partition("=")
+        if not sep or not old.strip() or not new.strip():
+            raise click.BadParameter(f"expected OLD=NEW, got '{item}'", param_hint="--rename")
+        parsed[old.strip()] = new.strip()
+    return parsed
+
+
+def _env_values(manifest: Manifest) -> tuple[str, dict[str, str]]:
+    """Return the admin role and the .env values the manifest provides."""
+    block = manifest.block(SKILL)
+    if block is None:
+        raise ManifestError(f"{manifest.path}: no <!-- START -- {SKILL}:... --> section")
+    database = block.get("Database")
+    if not database:
+        raise ManifestError(f"{manifest.where(block.start)}: {SKILL} section has no **Database:**")
+    admin_roles = manifest.sections.get("admin_role")
+    admin_role = (admin_roles.values.get(SKILL) if admin_roles else None) or block.get("Admin Role")
+    if not admin_role:
+        raise ManifestError(f"{manifest.path}: no admin role (## admin_role or **Admin Role:**)")
+
+    values = {"DEMO_DATABASE": database}
+    pat = manifest.block("snow-utils-pat")
+    if pat is not None:
+        for env_name, label in (("SA_USER", "User"), ("SA_ROLE", "Role"),
+                                ("SNOW_UTILS_DB", "Database")):
+            if pat.get(label):
+                values[env_name] = pat.get(label)
+    volume = manifest.block("snow-utils-volumes")
+    if volume is not None and volume.get("Volume Name"):
+        values["EXTERNAL_VOLUME_NAME"] = volume.get("Volume Name")
+    return admin_role, values
+
+
+def _write_env(values: dict[str, str]) -> str:
+    path = find_dotenv(usecwd=True) or ".env"
+    if not os.path.exists(path):
+        example = Path(__file__).parent.parent / ".env.example"
+        if example.is_file():
+            shutil.copyfile(example, path)
+        else:
+            Path(path).touch()
+        os.chmod(path, 0o600)
+    for key, val in values.items():
+        set_key(path, key, val, quote_mode="never")
+    return path
+
+
+def _write_manifest(manifest: Manifest) -> None:
+    WORKING_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    WORKING_MANIFEST.parent.chmod(0o700)
+    WORKING_MANIFEST.write_text(manifest.text)
+    WORKING_MANIFEST.chmod(0o600)
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("manifest_path", metavar="MANIFEST", required=False,
+                type=click.Path(dir_okay=False))
+@click.option("--as-user", help="Swap the shared_by prefix of # ADAPT: values for this name")
+@click.option("--rename", "renames", multiple=True, metavar="OLD=NEW",
+              help="Replace one # ADAPT: value everywhere in the manifest (repeatable)")
+@click.option("--keep-originals", is_flag=True,
+              help="Use # ADAPT: values as shared, even with the sharer's prefix")
+@click.option("--connection", help="Snow CLI connection to write to .env (default: keep .env's)")
+@click.option("--no-rbac", is_flag=True,
+              help="Stop after loading data, so the demo can fail before hirc-demo-rbac")
+@click.option("--skip-dependency-check", is_flag=True,
+              help="Replay even if the PAT/volume sections are not COMPLETE")
+@click.option("--backend", type=click.Choice(BACKENDS), default="connector",
+              envvar="HIRC_DEMO_BACKEND", show_default=True,
+              help="snow: subprocess per step; connector: one in-process session; fake: offline stand-in")
+@click.option("--batch", is_flag=True, help="Submit all steps as one multi-statement script")
+@click.option("--force", is_flag=True, help="Re-apply steps even if unchanged since their last run")
+@click.option("--dry-run", is_flag=True, help="Show values and steps without writing or running")
+@click.pass_context
+def replay(ctx: click.Context, manifest_path: str | None, as_user: str | None,
+           renames: tuple[str, ...], keep_originals: bool, connection: str | None,
+           no_rbac: bool, skip_dependency_check: bool, backend: str, batch: bool,
+           force: bool, dry_run: bool) -> None:
+    """Replay the demo from MANIFEST with no agent in the loop.
+
+    MANIFEST defaults to .snow-utils/snow-utils-manifest.md; a shared
+    manifest is copied there (adapted) before anything runs. Values
+    marked # ADAPT: that still carry the shared_by prefix are rejected
+    unless --as-user, --rename or --keep-originals says what to do.
+
+    \b
+    Example:
+      hirc-demo-replay hirc-duckdb-demo-manifest.md --as-user BOB --connection dev
+    """
+    source = Path(manifest_path) if manifest_path else WORKING_MANIFEST
+    try:
+        manifest = load(source)
+        if as_user or renames:
+            manifest = adapt(manifest, as_user, _parse_renames(renames))
+        stale = [] if keep_originals else manifest.unadapted()
+        if stale:
+            lines = [f"{source}: {len(stale)} # ADAPT: value(s) still use the shared_by"
+                     f" prefix {manifest.shared_by}:"]
+            lines += [f"  line {m.line}: {m.label} = {m.value}  (# ADAPT: {m.note})" for m in stale]
+            lines.append("Pass --as-user <YOU> to swap the prefix, --rename OLD=NEW for single"
+                         " values, or --keep-originals to use them as shared.")
+            _fail("\n".join(lines))
+        admin_role, values = _env_values(manifest)
+        status = manifest.block(SKILL).status
+    except ManifestError as e:
+        _fail(f"Cannot replay: {e}")
+
+    if status == "COMPLETE":
+        _fail(f"{SKILL} is already COMPLETE in {source}. Use hirc-demo-run revoke-rbac/rbac"
+              " (Re-run Flow) or hirc-demo-cleanup first.")
+    if status not in (None, "REMOVED", "IN_PROGRESS"):
+        _fail(f"Unknown {SKILL} status '{status}' in {source}")
+    pending = [
+        f"{b.skill}:{b.key} is {b.status or 'without status'}"
+        for b in manifest.blocks if b.skill in _DEPENDENCIES and b.status != "COMPLETE"
+    ]
+    if pending and not skip_dependency_check:
+        _fail("Dependencies not replayed yet:\n  " + "\n  ".join(pending)
+              + "\nReplay them with their own skills first (or pass --skip-dependency-check).")
+    if (source.resolve() != WORKING_MANIFEST.resolve() and WORKING_MANIFEST.exists()
+            and WORKING_MANIFEST.read_text() != manifest.text):
+        _fail(f"{WORKING_MANIFEST} already exists and differs from {source}. Replay it with"
+              " `hirc-demo-replay` (no argument) or move it aside first.")
+
+    if connection:
+        values["SNOWFLAKE_DEFAULT_CONNECTION_NAME"] = connection
+    steps = ("setup", "data") if no_rbac else ("setup", "data", "rbac")
+    click.echo(f"Replaying {SKILL} from {source}"
+               f"{' (resuming)' if status == 'IN_PROGRESS' else ''}:")
+    click.echo(f"  {'ADMIN_ROLE':<34} {admin_role}")
+    for key, val in values.items():
+        click.echo(f"  {key:<34} {val}")
+    click.echo(f"  steps: {' '.join(steps)}")
+
+    os.environ.update(values)
+    if dry_run:
+        click.echo(f"Would write these values to .env and the manifest to {WORKING_MANIFEST}")
+    else:
+        click.echo(f"Updated {_write_env(values)}")
+        manifest = set_status(manifest, SKILL, "IN_PROGRESS")
+        _write_manifest(manifest)
+
+    ctx.invoke(run, steps=steps, admin_role=admin_role, schema="PUBLIC", table="FRUITS",
+               dry_run=dry_run, backend=backend, batch=batch, force=force)
+
+    if dry_run:
+        return
+    if no_rbac:
+        click.echo(f"\n{SKILL} left IN_PROGRESS. Run the DuckDB demo (it must fail), then"
+                   f" hirc-demo-rbac --admin-role {admin_role}.")
+        return
+    _write_manifest(set_status(manifest, SKILL, "COMPLETE"))
+    click.echo(f"\n{SKILL} marked COMPLETE in {WORKING_MANIFEST}")
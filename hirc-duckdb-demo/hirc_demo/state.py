@@ -0,0 +1,101 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Applied-step state for hirc-duckdb-demo commands.
+
+Every successful step records a hash of the SQL it actually sent -- the
+locally rendered file (see :func:`hirc_demo.executor.rendered_sql`) plus
+the connection name -- in ``.snow-utils/hirc-demo-state.json``.  When the
+same step is asked for again and its rendered SQL hashes the same, the
+commands skip it instead of re-running it (``sample_data.sql`` would
+otherwise ``CREATE OR REPLACE`` the table and rewrite its files on every
+Resume or Re-run).  ``--force`` re-applies regardless, and
+``hirc-demo-plan`` shows what would run.
+
+Steps undo each other: ``cleanup`` drops the database, ``sample_data``
+and ``synthetic_data`` replace the table (dropping its grants), and
+``rbac``/``revoke_rbac`` flip the same privilege.  Applying a step
+forgets the steps listed for it in :data:`INVALIDATES`, so they run
+again next time.
+
+The state only knows what these commands did.  Changes made outside them
+(a database dropped in Snowsight, say) are invisible -- use ``--force``.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+_STATE_FILE = Path(".snow-utils") / "hirc-demo-state.json"
+
+# Applying the key step undoes the listed steps' effects.
+INVALIDATES: dict[str, tuple[str, ...]] = {
+    "demo_setup": ("cleanup",),
+    "sample_data": ("cleanup", "rbac", "revoke_rbac", "synthetic_data"),
+    "synthetic_data": ("cleanup", "rbac", "revoke_rbac", "sample_data"),
+    "rbac": ("cleanup", "revoke_rbac"),
+    "revoke_rbac": ("cleanup", "rbac"),
+    "cleanup": ("demo_setup", "sample_data", "synthetic_data", "rbac", "revoke_rbac"),
+}
+
+
+def fingerprint(rendered: Path, connection: str) -> str:
+    """Hash of a rendered SQL file as sent to ``connection``."""
+    digest = hashlib.sha256(f"{connection}\n".encode())
+    digest.update(rendered.read_bytes())
+    return digest.hexdigest()
+
+
+def load() -> dict[str, dict]:
+    """Return ``{step: {"sha256", "applied_at", "backend"}}`` (empty when absent)."""
+    try:
+        return json.loads(_STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(data: dict[str, dict]) -> None:
+    _STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _STATE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    tmp.replace(_STATE_FILE)
+
+
+def status(step: str, digest: str, earlier: Iterable[str] = ()) -> tuple[str, dict | None]:
+    """Classify ``step`` against the recorded state.
+
+    Returns ``(status, entry)`` where status is ``new`` (not applied, or
+    undone since), ``invalidated`` (a step in ``earlier`` -- run before it
+    in the same flow -- undoes it), ``changed`` (rendered SQL differs) or
+    ``unchanged``; ``entry`` is the recorded state, if any.
+    """
+    entry = load().get(step)
+    if entry is None:
+        return "new", None
+    if any(step in INVALIDATES.get(prior, ()) for prior in earlier):
+        return "invalidated", entry
+    if entry.get("sha256") != digest:
+        return "changed", entry
+    return "unchanged", entry
+
+
+def record(step: str, digest: str, backend: str) -> None:
+    """Remember ``step`` as applied and forget the steps it undoes."""
+    data = load()
+    for other in INVALIDATES.get(step, ()):
+        data.pop(other, None)
+    data[step] = {
+        "sha256": digest,
+        "applied_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "backend": backend,
+    }
+    _save(data)
+
+
+def forget(step: str) -> None:
+    """Drop ``step`` and the steps it undoes (after a failed, maybe partial, run)."""
+    data = load()
+    dropped = [s for s in (step, *INVALIDATES.get(step, ())) if data.pop(s, None) is not None]
+    if dropped:
+        _save(data)
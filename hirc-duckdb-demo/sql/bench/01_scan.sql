@@ -0,0 +1,4 @@
+-- Full scan: read every ORDERS column once
+SELECT count(*), sum(quantity), sum(amount), min(order_date), max(order_date),
+       count(DISTINCT customer_id), max(length(status)), max(length(region))
+FROM ORDERS;
@@ -0,0 +1,4 @@
+-- Selective filter on two columns (about 2.5% of ORDERS)
+SELECT count(*), sum(amount)
+FROM ORDERS
+WHERE status = 'RETURNED' AND amount > 900;
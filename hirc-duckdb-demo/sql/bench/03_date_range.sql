@@ -0,0 +1,6 @@
+-- One week of ORDERS; data files are written in order_date order, so most can be skipped
+SELECT order_date, count(*), sum(amount)
+FROM ORDERS
+WHERE order_date BETWEEN DATE '2025-03-01' AND DATE '2025-03-07'
+GROUP BY order_date
+ORDER BY order_date;
@@ -0,0 +1,5 @@
+-- Grouped aggregate over low-cardinality columns
+SELECT region, status, count(*), sum(amount), avg(quantity)
+FROM ORDERS
+GROUP BY region, status
+ORDER BY region, status;
@@ -0,0 +1,6 @@
+-- Join ORDERS to the PRODUCTS dimension and aggregate by category
+SELECT p.category, count(*) AS orders, sum(o.amount) AS revenue
+FROM ORDERS o
+JOIN PRODUCTS p ON o.product_id = p.product_id
+GROUP BY p.category
+ORDER BY revenue DESC;
@@ -0,0 +1,5 @@
+-- Top 10 orders by amount
+SELECT order_id, customer_id, amount
+FROM ORDERS
+ORDER BY amount DESC, order_id
+LIMIT 10;
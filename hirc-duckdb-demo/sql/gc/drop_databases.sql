@@ -0,0 +1,18 @@
+--!jinja
+-- HIRC DuckDB Demo - hirc-demo-gc: drop a batch of demo databases
+-- Same DROP as cleanup.sql, for many databases in one submission.
+-- demo_setup.sql creates them with the admin role; one owned by another
+-- role is taken over first.
+-- Note: SA_ROLE, external volume, and PAT are NOT deleted - they are managed by snow-utils-* skills
+--
+-- Usage (hirc-demo-gc renders it with the batch, one entry per database):
+--   --variable admin_role=$ADMIN_ROLE
+--   databases = [{"name": ..., "owner": ...}, ...]
+
+USE ROLE {{admin_role}};
+{% for db in databases %}
+{% if db.owner != admin_role %}
+GRANT OWNERSHIP ON DATABASE {{db.name}} TO ROLE {{admin_role}} REVOKE CURRENT GRANTS;
+{% endif %}
+DROP DATABASE IF EXISTS {{db.name}};
+{% endfor %}
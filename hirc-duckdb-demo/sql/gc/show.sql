@@ -0,0 +1,13 @@
+--!jinja
+-- HIRC DuckDB Demo - hirc-demo-gc discovery
+-- Lists demo databases whose name matches a LIKE pattern.
+-- hirc-demo-gc runs it with --format json and filters the rows by created_on.
+--
+-- Usage:
+--   snow sql -f sql/gc/show.sql --format json \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable pattern=%_HIRC_DUCKDB_DEMO
+
+USE ROLE {{admin_role}};
+SHOW DATABASES LIKE '{{pattern}}';
@@ -0,0 +1,138 @@
+--!jinja
+-- Create an Iceberg table filled with synthetic data, generated server-side
+-- Run via Snowflake (DuckDB can't write to Iceberg tables through Horizon Catalog)
+-- Uses admin_role to create and populate the table (SA_ROLE only gets USAGE, not ownership)
+--
+-- One INSERT ... SELECT over GENERATOR writes every row in parallel inside
+-- Snowflake; no data is uploaded. Key and category columns are drawn with
+-- ZIPF when skew > 0 (UNIFORM otherwise) from fixed seeds, so the same
+-- variables produce the same data. Rows are inserted in id / order_ts /
+-- event_ts order, so each data file covers a narrow range that DuckDB can
+-- skip, and TARGET_FILE_SIZE sets the size of the Parquet files.
+--
+-- Profiles:
+--   fruits  the demo's FRUITS columns (id, name, color, price, in_stock)
+--   orders  order facts: customer/product keys, timestamp, amount, status
+--   events  wide clickstream rows with a ~200 character payload
+--
+-- Usage (hirc-demo-data --rows / --size-gb renders it for you):
+--   snow sql -f sql/synthetic_data.sql \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable database_name=$DEMO_DATABASE \
+--     --variable external_volume_name=$EXTERNAL_VOLUME_NAME \
+--     --variable table=ORDERS --variable profile=orders --variable rows=10000000 \
+--     --variable skew=1.1 --variable seed=42 --variable target_file_size=AUTO
+
+{% macro pick(n, salt) -%}
+{% if skew|float > 0 %}ZIPF({{ skew }}, {{ n }}, RANDOM({{ seed|int + salt }})){% else %}UNIFORM(1, {{ n }}, RANDOM({{ seed|int + salt }})){% endif %}
+{%- endmacro %}
+
+USE ROLE {{admin_role}};
+USE DATABASE {{database_name}};
+USE SCHEMA PUBLIC;
+
+{% if profile == 'fruits' %}
+CREATE OR REPLACE ICEBERG TABLE {{table}} (
+    id BIGINT,
+    name VARCHAR,
+    color VARCHAR,
+    price DECIMAL(10,2),
+    in_stock BOOLEAN
+)
+    CATALOG = 'SNOWFLAKE'
+    EXTERNAL_VOLUME = '{{external_volume_name}}'
+    BASE_LOCATION = '{{table|lower}}/'
+    TARGET_FILE_SIZE = '{{target_file_size}}';
+
+INSERT INTO {{table}} (id, name, color, price, in_stock)
+SELECT
+    id,
+    ARRAY_CONSTRUCT('Apple', 'Banana', 'Orange', 'Grape', 'Mango', 'Strawberry', 'Blueberry',
+                    'Kiwi', 'Pineapple', 'Watermelon', 'Cherry', 'Peach', 'Pear', 'Plum',
+                    'Lemon', 'Lime', 'Papaya', 'Guava', 'Lychee', 'Fig')[k - 1]::VARCHAR,
+    ARRAY_CONSTRUCT('Red', 'Yellow', 'Orange', 'Purple', 'Yellow', 'Red', 'Blue',
+                    'Green', 'Yellow', 'Green', 'Red', 'Orange', 'Green', 'Purple',
+                    'Yellow', 'Green', 'Orange', 'Green', 'Red', 'Purple')[k - 1]::VARCHAR,
+    UNIFORM(25, 1000, RANDOM({{ seed|int + 2 }})) / 100,
+    UNIFORM(1, 10, RANDOM({{ seed|int + 3 }})) > 2
+FROM (
+    SELECT SEQ8() + 1 AS id, {{ pick(20, 1) }} AS k
+    FROM TABLE(GENERATOR(ROWCOUNT => {{rows}}))
+)
+ORDER BY id;
+
+{% elif profile == 'orders' %}
+CREATE OR REPLACE ICEBERG TABLE {{table}} (
+    order_id BIGINT,
+    customer_id INT,
+    product_id INT,
+    order_ts TIMESTAMP_NTZ(6),
+    quantity INT,
+    amount DECIMAL(12,2),
+    status VARCHAR,
+    region VARCHAR,
+    channel VARCHAR
+)
+    CATALOG = 'SNOWFLAKE'
+    EXTERNAL_VOLUME = '{{external_volume_name}}'
+    BASE_LOCATION = '{{table|lower}}/'
+    TARGET_FILE_SIZE = '{{target_file_size}}';
+
+INSERT INTO {{table}}
+    (order_id, customer_id, product_id, order_ts, quantity, amount, status, region, channel)
+SELECT
+    SEQ8() + 1,
+    {{ pick(1000000, 1) }},
+    {{ pick(10000, 2) }},
+    DATEADD(SECOND, UNIFORM(0, 31535999, RANDOM({{ seed|int + 3 }})),
+            '2025-01-01'::TIMESTAMP_NTZ) AS order_ts,
+    UNIFORM(1, 10, RANDOM({{ seed|int + 4 }})),
+    UNIFORM(100, 100000, RANDOM({{ seed|int + 5 }})) / 100,
+    ARRAY_CONSTRUCT('DELIVERED', 'SHIPPED', 'PLACED', 'RETURNED')[{{ pick(4, 6) }} - 1]::VARCHAR,
+    ARRAY_CONSTRUCT('AMER', 'EMEA', 'APJ', 'LATAM')[{{ pick(4, 7) }} - 1]::VARCHAR,
+    ARRAY_CONSTRUCT('web', 'mobile', 'store', 'partner')[{{ pick(4, 8) }} - 1]::VARCHAR
+FROM TABLE(GENERATOR(ROWCOUNT => {{rows}}))
+ORDER BY order_ts;
+
+{% else %}
+CREATE OR REPLACE ICEBERG TABLE {{table}} (
+    event_id BIGINT,
+    event_ts TIMESTAMP_NTZ(6),
+    user_id INT,
+    session_id VARCHAR,
+    event_type VARCHAR,
+    page VARCHAR,
+    country VARCHAR,
+    device VARCHAR,
+    duration_ms INT,
+    payload VARCHAR
+)
+    CATALOG = 'SNOWFLAKE'
+    EXTERNAL_VOLUME = '{{external_volume_name}}'
+    BASE_LOCATION = '{{table|lower}}/'
+    TARGET_FILE_SIZE = '{{target_file_size}}';
+
+INSERT INTO {{table}}
+    (event_id, event_ts, user_id, session_id, event_type, page, country, device, duration_ms,
+     payload)
+SELECT
+    SEQ8() + 1,
+    DATEADD(MILLISECOND, UNIFORM(0, 2591999999, RANDOM({{ seed|int + 1 }})),
+            '2025-06-01'::TIMESTAMP_NTZ) AS event_ts,
+    {{ pick(5000000, 2) }},
+    RANDSTR(16, RANDOM({{ seed|int + 3 }})),
+    ARRAY_CONSTRUCT('page_view', 'click', 'scroll', 'search', 'add_to_cart', 'purchase')
+        [{{ pick(6, 4) }} - 1]::VARCHAR,
+    '/page/' || {{ pick(50000, 5) }},
+    ARRAY_CONSTRUCT('US', 'IN', 'GB', 'DE', 'JP', 'BR', 'FR', 'CA', 'AU', 'MX', 'NL', 'SG')
+        [{{ pick(12, 6) }} - 1]::VARCHAR,
+    ARRAY_CONSTRUCT('desktop', 'mobile', 'tablet')[{{ pick(3, 7) }} - 1]::VARCHAR,
+    UNIFORM(5, 120000, RANDOM({{ seed|int + 8 }})),
+    RANDSTR(200, RANDOM({{ seed|int + 9 }}))
+FROM TABLE(GENERATOR(ROWCOUNT => {{rows}}))
+ORDER BY event_ts;
+{% endif %}
+
+-- Verify the row count
+SELECT COUNT(*) AS row_count FROM {{table}};
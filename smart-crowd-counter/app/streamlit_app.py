@@ -13,9 +13,14 @@
 # limitations under the License.
 
 # Import python packages
+import contextlib
+import hashlib
 import io
 import json
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import altair as alt
 import pandas as pd
@@ -24,6 +29,11 @@ from snowflake.core import CreateMode, Root
 from snowflake.core.stage import Stage, StageDirectoryTable, StageEncryption
 from snowflake.snowpark.context import get_active_session
 
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow missing from the app environment: upload as-is
+    Image = ImageOps = None
+
 # ---------------------------------------------------------------------------
 # Page config
 # ---------------------------------------------------------------------------
@@ -48,13 +58,67 @@ _SCHEMA = session.get_current_schema()
 _STAGE_NAME = "SNAPS"
 _STAGE_FQN = f"@{_DATABASE}.{_SCHEMA}.{_STAGE_NAME}"
 _VIEW_FQN = f"{_DATABASE}.{_SCHEMA}.SMART_CROWD_COUNTER"
+_SUMMARY_VIEW_FQN = f"{_DATABASE}.{_SCHEMA}.SMART_CROWD_COUNTER_SUMMARY"
+_REFRESH_PROC_FQN = f"{_DATABASE}.{_SCHEMA}.REFRESH_SMART_CROWD_COUNTER"
+
+# Presigned URLs are valid for 7 days; cached ones are refreshed an hour
+# before they expire so a displayed link never goes stale mid-session.
+_PRESIGNED_URL_TTL = 604800
+_PRESIGNED_URL_MARGIN = 3600
+_PRESIGN_BATCH = 500
+
+# The table shows one page of these columns, sorted in Snowflake. CAPTION,
+# RAW and FILE_NAME are only read for the selected row.
+_TABLE_COLUMNS = [
+    "NAME",
+    "TOTAL_ATTENDEES",
+    "RAISED_HANDS",
+    "PERCENTAGE_WITH_HANDS_UP",
+    "LAST_MODIFIED",
+]
+_SORT_COLUMNS = {
+    "Name": "NAME",
+    "Attendees": "TOTAL_ATTENDEES",
+    "Raised hands": "RAISED_HANDS",
+    "Conversion": "PERCENTAGE_WITH_HANDS_UP",
+    "Last modified": "LAST_MODIFIED",
+}
+_PAGE_SIZES = [25, 50, 100, 250]
+
+# Uploads run in parallel (Snowpark sessions are thread-safe); each file is
+# retried with exponential backoff, then the directory table is polled until
+# the new paths are listed instead of sleeping a fixed interval.
+_UPLOAD_WORKERS = 4
+_UPLOAD_RETRIES = 3
+_STAGE_READY_TIMEOUT = 30.0
+_STAGE_POLL_INTERVAL = 0.5
+
+# Phone photos are often 8-20 MB. Before upload they are downscaled to a
+# maximum edge, stripped of EXIF and re-encoded, which shrinks both the PUT
+# and what AI_COMPLETE has to ingest. Originals, when kept, go under a stage
+# prefix the refresh procedure skips, so they are never analyzed.
+_MAX_EDGE = 1600
+_JPEG_QUALITY = 85
+_ORIGINALS_PREFIX = "originals/"
+
+# Uploads are deduplicated by content, not just by name: the MD5 of the raw
+# and of the preprocessed bytes is looked up in the directory table's MD5
+# column (the unquoted ETag when MD5 is missing) before anything is sent.
+# The lock guards the lookup shared by the upload workers, so identical
+# files within one batch are also sent only once.
+_HASH_LOCK = threading.Lock()
+
+# The opt-in performance panel in the sidebar times every Snowflake call and
+# page section of each rerun; this many timings are kept across reruns
+# (oldest dropped first) for the rolling history and its CSV/JSON export.
+_PERF_HISTORY = 1000
 
 # ---------------------------------------------------------------------------
 # Session state
 # ---------------------------------------------------------------------------
 
-if "selected_row" not in st.session_state:
-    st.session_state.selected_row = []
+if "selected_name" not in st.session_state:
+    st.session_state.selected_name = None
 
 if "files_uploaded" not in st.session_state:
     st.session_state.files_uploaded = False
@@ -62,6 +126,41 @@ if "files_uploaded" not in st.session_state:
 if "uploaded_files" not in st.session_state:
     st.session_state.uploaded_files = set()
 
+if "presigned_urls" not in st.session_state:
+    # (stage, relative_path) -> (url, expires_at epoch seconds)
+    st.session_state.presigned_urls = {}
+
+if "pages" not in st.session_state:
+    # (page, page_size, sort column, descending) -> page frame, and
+    # NAME -> full row, and the event/city aggregates; all only valid for
+    # st.session_state.table_version
+    st.session_state.pages = {}
+    st.session_state.details = {}
+    st.session_state.summary = None
+
+if "perf_history" not in st.session_state:
+    # One dict per timed Snowflake call or page section, across reruns
+    st.session_state.perf_history = []
+    st.session_state.perf_reruns = 0
+
+# ---------------------------------------------------------------------------
+# Performance panel switch (the panel itself is drawn last, see the end)
+# ---------------------------------------------------------------------------
+
+_perf_on = st.sidebar.toggle(
+    ":material/speed: Performance panel",
+    key="perf_panel",
+    help="Time every Snowflake call and page section of each rerun",
+)
+if _perf_on:
+    st.session_state.perf_reruns += 1
+_perf_rerun = st.session_state.perf_reruns
+_perf_rerun_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+# Timings of this rerun; upload workers append too, so no session_state here
+_perf_events: list[dict] = []
+# (name, start) of the page section being rendered
+_perf_section = ["Header and data", time.perf_counter()]
+
 # ---------------------------------------------------------------------------
 # Header
 # ---------------------------------------------------------------------------
@@ -91,42 +190,399 @@ st.caption(f"Database: `{_DATABASE}` | Schema: `{_SCHEMA}` | Stage: `{_STAGE_NAM
 # ---------------------------------------------------------------------------
 
 
-def refresh_data() -> pd.DataFrame:
-    """Load all rows from the AI-powered view."""
-    return session.sql(f"SELECT * FROM {_VIEW_FQN}").to_pandas()
+def _result_size(result) -> tuple[int | None, int | None]:
+    """Rows and client-side bytes of a query result (or bytes of an upload)."""
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(result.memory_usage(deep=True).sum())
+    if isinstance(result, list):
+        return len(result), sum(len(str(value).encode()) for row in result for value in row)
+    if isinstance(result, (bytes, bytearray)):
+        return None, len(result)
+    return None, None
 
 
-def get_image_url_from_stage(file_json_str):
-    """Get presigned URL for image from Snowflake stage using the file JSON."""
+def _perf_record(kind: str, name: str, seconds: float, **fields) -> None:
+    _perf_events.append(
+        {
+            "rerun": _perf_rerun,
+            "at": _perf_rerun_at,
+            "kind": kind,
+            "name": name,
+            "seconds": round(seconds, 4),
+            **fields,
+        }
+    )
+
+
+@contextlib.contextmanager
+def perf(name: str, detail: str = "", kind: str = "query", queries: bool = True):
+    """Time one Snowflake call when the performance panel is on.
+
+    Yields a dict; store the call's result under ``"result"`` to record its
+    row and byte counts. Query IDs are captured with Snowpark's query
+    history unless ``queries`` is False (upload workers, where listeners
+    on the shared connection would see each other's queries).
+    """
+    if not _perf_on:
+        yield {}
+        return
+    event: dict = {}
+    recorded = None
+    start = time.perf_counter()
     try:
-        if file_json_str is None:
-            return None
+        with session.query_history() if queries else contextlib.nullcontext() as recorded:
+            yield event
+    except Exception as e:
+        event["error"] = str(e)
+        raise
+    finally:
+        rows, size = _result_size(event.get("result"))
+        _perf_record(
+            kind,
+            name,
+            time.perf_counter() - start,
+            detail=detail,
+            query_ids=" ".join(q.query_id for q in recorded.queries) if recorded else "",
+            rows=rows,
+            bytes=size,
+            error=event.get("error"),
+        )
+
+
+def _section(name: str | None) -> None:
+    """Close the page section being timed and start ``name`` (None: the last)."""
+    if _perf_on:
+        _perf_record("section", _perf_section[0], time.perf_counter() - _perf_section[1])
+    _perf_section[:] = [name, time.perf_counter()]
+
+
+def refresh_data(full: bool = False) -> int:
+    """Re-read the table's version and return its row count (no AI calls).
+
+    The version is the row count plus the LAST_MODIFIED (new or replaced
+    images) and ANALYZED_AT (re-analysis) high-water marks, read with one
+    aggregate query. Cached pages, row details and aggregates are dropped
+    only when it changes, so reruns otherwise cost no queries; ``full=True``
+    drops them regardless.
+    """
+    with perf("refresh_data") as ev:
+        rows = ev["result"] = session.sql(
+            f"SELECT COUNT(*), MAX(LAST_MODIFIED), MAX(ANALYZED_AT) FROM {_VIEW_FQN}"
+        ).collect()
+    row = rows[0]
+    version = (row[0], str(row[1]), str(row[2]))
+    if full or version != st.session_state.get("table_version"):
+        st.session_state.pages = {}
+        st.session_state.details = {}
+        st.session_state.summary = None
+        st.session_state.table_version = version
+    return version[0]
+
+
+def fetch_page(page: int, page_size: int, sort: str, descending: bool) -> pd.DataFrame:
+    """Return one page of the visible columns, sorted in Snowflake (cached per version)."""
+    key = (page, page_size, sort, descending)
+    if key not in st.session_state.pages:
+        # ``sort`` comes from _SORT_COLUMNS and the sizes are ints, so the
+        # interpolation below cannot inject anything
+        with perf("fetch_page", f"page {page + 1} by {sort}") as ev:
+            st.session_state.pages[key] = ev["result"] = session.sql(
+                f"SELECT {', '.join(_TABLE_COLUMNS)} FROM {_VIEW_FQN} "
+                f"ORDER BY {sort} {'DESC' if descending else 'ASC'} NULLS LAST, NAME "
+                f"LIMIT {int(page_size)} OFFSET {int(page) * int(page_size)}"
+            ).to_pandas()
+    return st.session_state.pages[key]
+
+
+def fetch_details(name: str) -> pd.Series | None:
+    """Return every column of the row for ``name`` (cached per version)."""
+    if name not in st.session_state.details:
+        with perf("fetch_details", name) as ev:
+            rows = ev["result"] = session.sql(
+                f"SELECT * FROM {_VIEW_FQN} WHERE NAME = ?", params=[name]
+            ).to_pandas()
+        st.session_state.details[name] = None if rows.empty else rows.iloc[0]
+    return st.session_state.details[name]
+
+
+def fetch_summary() -> pd.DataFrame:
+    """Return the per-event and per-city aggregates (cached per version)."""
+    if st.session_state.summary is None:
+        with perf("fetch_summary") as ev:
+            st.session_state.summary = ev["result"] = session.sql(
+                "SELECT DIMENSION, VALUE, PHOTOS, TOTAL_ATTENDEES, RAISED_HANDS, CONVERSION "
+                f"FROM {_SUMMARY_VIEW_FQN} ORDER BY DIMENSION, TOTAL_ATTENDEES DESC"
+            ).to_pandas()
+    return st.session_state.summary
+
+
+def create_summary_chart(summary: pd.DataFrame, label: str):
+    """Bar chart of conversion per event code or city, sized by attendees."""
+    return (
+        alt.Chart(summary)
+        .mark_bar()
+        .encode(
+            x=alt.X("VALUE:N", title=label, sort="-y"),
+            y=alt.Y("CONVERSION:Q", title="Conversion (%)"),
+            color=alt.Color("TOTAL_ATTENDEES:Q", title="Attendees"),
+            tooltip=[
+                alt.Tooltip("VALUE:N", title=label),
+                "PHOTOS:Q",
+                "TOTAL_ATTENDEES:Q",
+                "RAISED_HANDS:Q",
+                "CONVERSION:Q",
+            ],
+        )
+        .properties(height=300)
+    )
+
+
+def analyze_images(reprocess: list[str] | None = None) -> str:
+    """Analyze new/changed stage images and store the results.
+
+    Only images without a stored result for their current ETag are sent to
+    AI_COMPLETE. ``reprocess`` forces re-analysis of the given relative paths.
+    """
+    with perf("analyze_images", "reprocess" if reprocess else "new and changed") as ev:
+        if reprocess:
+            result = session.sql(
+                f"CALL {_REFRESH_PROC_FQN}(PARSE_JSON(?)::ARRAY)",
+                params=[json.dumps(reprocess)],
+            ).collect()
+        else:
+            result = session.sql(f"CALL {_REFRESH_PROC_FQN}()").collect()
+        ev["result"] = result
+    return result[0][0] if result else ""
+
+
+def preprocess_image(name: str, data: bytes, max_edge: int, quality: int) -> bytes:
+    """Downscale to ``max_edge``, drop EXIF and re-encode in the same format.
 
-        # Parse the JSON string to get file info
+    The EXIF orientation is applied to the pixels first, so rotated phone
+    photos stay upright. JPEGs are re-encoded at ``quality``; PNGs are
+    re-compressed losslessly. Returns ``data`` unchanged when Pillow is
+    unavailable, or when there was nothing to resize or strip and
+    re-encoding would not make it smaller.
+    """
+    if Image is None:
+        return data
+    with Image.open(io.BytesIO(data)) as img:
+        had_exif = bool(img.getexif())
+        img = ImageOps.exif_transpose(img)
+        resized = max(img.size) > max_edge
+        if resized:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        out = io.BytesIO()
+        if name.lower().endswith(".png"):
+            img.save(out, format="PNG", optimize=True)
+        else:
+            img.convert("RGB").save(out, format="JPEG", quality=quality, optimize=True)
+    if not resized and not had_exif and out.tell() >= len(data):
+        return data
+    return out.getvalue()
+
+
+def stage_content_index() -> dict[str, str]:
+    """Map the content hash of every file on the stage to its relative path."""
+    with perf("stage_content_index") as ev:
+        rows = ev["result"] = session.sql(
+            f"SELECT LOWER(COALESCE(md5, REPLACE(etag, '\"', ''))) AS digest, relative_path "
+            f"FROM DIRECTORY({_STAGE_FQN}) ORDER BY relative_path DESC"
+        ).collect()
+    return {row[0]: row[1] for row in rows if row[0]}
+
+
+def _claim(digest: str, name: str, known: dict[str, str]) -> str | None:
+    """Record ``digest`` for ``name``; return the path already holding it, if any."""
+    with _HASH_LOCK:
+        existing = known.get(digest)
+        if existing is None:
+            known[digest] = name
+        return existing
+
+
+def _release(digests: list[str], name: str, known: dict[str, str]) -> None:
+    """Undo :func:`_claim` for ``name`` so a retry of a failed upload is not skipped."""
+    with _HASH_LOCK:
+        for digest in digests:
+            if known.get(digest) == name:
+                del known[digest]
+
+
+def upload_image(
+    name: str,
+    data: bytes,
+    max_edge: int | None,
+    quality: int,
+    keep_original: bool,
+    known: dict[str, str],
+) -> tuple[float, int, int, str | None]:
+    """Preprocess (when ``max_edge`` is set) and upload one image.
+
+    Skipped, with nothing sent, when the raw or preprocessed content is
+    already in ``known`` (see :func:`stage_content_index`). With
+    ``keep_original`` the raw bytes are also uploaded under ``originals/``.
+    Returns (upload seconds, original bytes, uploaded bytes, path of the
+    existing copy or None). If the upload fails, its claims in ``known``
+    are released before the error is raised.
+    """
+    claimed = [hashlib.md5(data).hexdigest()]
+    duplicate = _claim(claimed[0], name, known)
+    if duplicate:
+        return 0.0, len(data), 0, duplicate
+    try:
+        body = preprocess_image(name, data, max_edge, quality) if max_edge else data
+        if body is not data:
+            claimed.append(hashlib.md5(body).hexdigest())
+            duplicate = _claim(claimed[-1], name, known)
+            if duplicate:
+                return 0.0, len(data), 0, duplicate
+        seconds = upload_to_stage(name, body)
+        if keep_original and body is not data:
+            seconds += upload_to_stage(f"{_ORIGINALS_PREFIX}{name}", data)
+    except Exception:
+        _release(claimed, name, known)
+        raise
+    return seconds, len(data), len(body), None
+
+
+def duplicate_report() -> pd.DataFrame:
+    """Stage files sharing the same content, one row per content hash."""
+    with perf("duplicate_report") as ev:
+        ev["result"] = session.sql(
+            "SELECT digest AS MD5, COUNT(*) AS COPIES, SUM(size) AS BYTES, "
+            "ARRAY_AGG(relative_path) WITHIN GROUP (ORDER BY relative_path) AS PATHS "
+            "FROM (SELECT relative_path, size, "
+            f"LOWER(COALESCE(md5, REPLACE(etag, '\"', ''))) AS digest FROM DIRECTORY({_STAGE_FQN})) "
+            "WHERE digest IS NOT NULL GROUP BY digest HAVING COUNT(*) > 1 ORDER BY BYTES DESC"
+        ).to_pandas()
+    return ev["result"]
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1_048_576:.1f} MB"
+
+
+def upload_to_stage(name: str, data: bytes) -> float:
+    """PUT one file on the stage with retries; returns seconds taken."""
+    start = time.perf_counter()
+    for attempt in range(1, _UPLOAD_RETRIES + 1):
+        try:
+            with perf("PUT", f"{name} (attempt {attempt})", queries=False) as ev:
+                ev["result"] = data
+                session.file.put_stream(
+                    io.BytesIO(data),
+                    f"{_STAGE_FQN}/{name}",
+                    auto_compress=False,
+                    overwrite=True,
+                )
+            return time.perf_counter() - start
+        except Exception:
+            if attempt == _UPLOAD_RETRIES:
+                raise
+            time.sleep(0.5 * 2 ** (attempt - 1))
+    return time.perf_counter() - start
+
+
+def wait_for_stage_files(paths, timeout: float = _STAGE_READY_TIMEOUT) -> set[str]:
+    """Refresh the directory table until ``paths`` are listed or ``timeout`` expires.
+
+    Returns the paths still missing (empty when everything is visible).
+    """
+    pending = set(paths)
+    deadline = time.monotonic() + timeout
+    while pending:
+        with perf("ALTER STAGE REFRESH") as ev:
+            ev["result"] = session.sql(f"ALTER STAGE {_STAGE_FQN[1:]} REFRESH").collect()
+        placeholders = ", ".join("?" for _ in pending)
+        with perf("wait_for_stage_files") as ev:
+            rows = ev["result"] = session.sql(
+                f"SELECT relative_path FROM DIRECTORY({_STAGE_FQN}) "
+                f"WHERE relative_path IN ({placeholders})",
+                params=sorted(pending),
+            ).collect()
+        pending -= {row[0] for row in rows}
+        if not pending or time.monotonic() >= deadline:
+            break
+        time.sleep(_STAGE_POLL_INTERVAL)
+    return pending
+
+
+def _stage_file_ref(file_json_str) -> tuple[str, str] | None:
+    """Return (stage, relative_path) from the FILE_NAME JSON, or None."""
+    if file_json_str is None:
+        return None
+    try:
         if isinstance(file_json_str, str):
             file_obj = json.loads(file_json_str)
         else:
             file_obj = file_json_str
+    except (json.JSONDecodeError, TypeError):
+        return None
+    stage = file_obj.get("STAGE")
+    relative_path = file_obj.get("RELATIVE_PATH")
+    if not stage or not relative_path:
+        return None
+    return stage, relative_path
 
-        # Extract stage and relative path
-        stage = file_obj.get("STAGE")
-        relative_path = file_obj.get("RELATIVE_PATH")
 
-        if not stage or not relative_path:
-            st.warning("Missing STAGE or RELATIVE_PATH in file metadata")
-            return None
+def _cached_url(ref: tuple[str, str]) -> str | None:
+    """Return a cached presigned URL that is not about to expire."""
+    entry = st.session_state.presigned_urls.get(ref)
+    if entry and entry[1] - _PRESIGNED_URL_MARGIN > time.time():
+        return entry[0]
+    return None
 
-        # Get presigned URL (valid for 7 days = 604800 seconds)
-        url_sql = (
-            f"SELECT GET_PRESIGNED_URL('{stage}', '{relative_path}', 604800) as url"
-        )
-        result = session.sql(url_sql).collect()
 
-        if result and len(result) > 0:
-            return result[0][0]
-        else:
+def prefetch_image_urls(refs) -> None:
+    """Presign every uncached (stage, relative_path) with one query per stage.
+
+    URLs are kept in ``st.session_state.presigned_urls`` until shortly
+    before expiry, so browsing rows afterwards needs no Snowflake round trip.
+    """
+    missing: dict[str, set[str]] = {}
+    for ref in refs:
+        if ref and _cached_url(ref) is None:
+            missing.setdefault(ref[0], set()).add(ref[1])
+
+    for stage, paths in missing.items():
+        # Stage is interpolated as an identifier; only allow @db.schema.stage
+        if not re.fullmatch(r'@[\w$."]+', stage):
+            st.warning(f"Skipping presign for unexpected stage name: {stage}")
+            continue
+        paths = sorted(paths)
+        for i in range(0, len(paths), _PRESIGN_BATCH):
+            chunk = paths[i : i + _PRESIGN_BATCH]
+            placeholders = ", ".join("?" for _ in chunk)
+            expires_at = time.time() + _PRESIGNED_URL_TTL
+            with perf("GET_PRESIGNED_URL", f"{len(chunk)} path(s)") as ev:
+                rows = ev["result"] = session.sql(
+                    f"SELECT relative_path, GET_PRESIGNED_URL({stage}, relative_path, {_PRESIGNED_URL_TTL}) AS url "
+                    f"FROM DIRECTORY({stage}) WHERE relative_path IN ({placeholders})",
+                    params=chunk,
+                ).collect()
+            for row in rows:
+                st.session_state.presigned_urls[(stage, row[0])] = (row[1], expires_at)
+
+
+def get_image_url_from_stage(file_json_str):
+    """Get presigned URL for image from Snowflake stage using the file JSON.
+
+    Served from the session URL cache; only a cache miss queries Snowflake.
+    """
+    try:
+        ref = _stage_file_ref(file_json_str)
+        if ref is None:
+            if file_json_str is not None:
+                st.warning("Missing STAGE or RELATIVE_PATH in file metadata")
             return None
 
+        url = _cached_url(ref)
+        if url is None:
+            prefetch_image_urls([ref])
+            url = _cached_url(ref)
+        return url
+
     except Exception as e:
         st.error(f"Error getting presigned URL: {str(e)}")
         return None
@@ -182,16 +638,16 @@ def create_ratio_chart(row: pd.Series):
 # Data initialisation
 # ---------------------------------------------------------------------------
 
-if "df" not in st.session_state:
+if "table_version" not in st.session_state:
     try:
-        st.session_state.df = refresh_data()
+        refresh_data(full=True)
     except Exception:
-        st.session_state.df = pd.DataFrame()
+        st.session_state.table_version = (0, None, None)
 
 # Refresh after file upload (flag set by upload handler)
 if st.session_state.get("files_uploaded", False):
     try:
-        st.session_state.df = refresh_data()
+        refresh_data()
     except Exception as e:
         st.warning(f"Could not refresh data: {e}")
     st.session_state.files_uploaded = False
@@ -200,117 +656,284 @@ if st.session_state.get("files_uploaded", False):
 # Ensure stage exists (idempotent)
 # ---------------------------------------------------------------------------
 
+_section("Stage")
+
 snap_stage = Stage(
     name=_STAGE_NAME,
     encryption=StageEncryption(type="SNOWFLAKE_SSE"),
     directory_table=StageDirectoryTable(enable=True, auto_refresh=True),
 )
-root.databases[_DATABASE].schemas[_SCHEMA].stages.create(
-    snap_stage,
-    mode=CreateMode.if_not_exists,
-)
+with perf("stages.create", "if not exists", kind="api"):
+    root.databases[_DATABASE].schemas[_SCHEMA].stages.create(
+        snap_stage,
+        mode=CreateMode.if_not_exists,
+    )
 
 # ---------------------------------------------------------------------------
 # File upload
 # ---------------------------------------------------------------------------
 
+_section("Upload")
+
 _files = st.file_uploader(
     label="Upload a photo from conference session",
     accept_multiple_files=True,
     type=["jpg", "jpeg", "png"],
 )
 
+with st.expander(":material/photo_size_select_large: Upload options"):
+    _downscale = st.checkbox(
+        "Downscale and strip EXIF before upload",
+        value=Image is not None,
+        disabled=Image is None,
+        help="Smaller uploads and faster, cheaper analysis"
+        + ("" if Image is not None else " (Pillow is not installed)"),
+    )
+    _opt_a, _opt_b = st.columns(2)
+    _max_edge = _opt_a.slider(
+        "Maximum edge (px)", 512, 4096, _MAX_EDGE, step=128, disabled=not _downscale
+    )
+    _quality = _opt_b.slider(
+        "JPEG quality", 50, 95, _JPEG_QUALITY, disabled=not _downscale
+    )
+    _keep_original = st.checkbox(
+        f"Also keep the original under `{_ORIGINALS_PREFIX}` (not analyzed)",
+        disabled=not _downscale,
+    )
+
 if _files is not None and len(_files) > 0:
     # Check if these are new files
     new_files = [f for f in _files if f.name not in st.session_state.uploaded_files]
 
     if new_files:
-        upload_success = True
+        uploaded = []
+        duplicates = []
         upload_errors = []
-
-        with st.spinner("Uploading files and refreshing data..."):
-            for _file in new_files:
-                _file_bytes = io.BytesIO(_file.getvalue())
-                __stage_file = f"{_STAGE_FQN}/{_file.name}"
-
-                try:
-                    session.file.put_stream(
-                        _file_bytes,
-                        __stage_file,
-                        auto_compress=False,
-                        overwrite=True,
+        bytes_in = bytes_out = 0
+        try:
+            known = stage_content_index()
+        except Exception as e:
+            st.warning(f"Could not read stage hashes, duplicates will not be skipped: {e}")
+            known = {}
+
+        progress = st.progress(0.0, text=f"Uploading {len(new_files)} file(s)...")
+        with st.status(f"Uploading {len(new_files)} file(s)...", expanded=False) as upload_status:
+            with ThreadPoolExecutor(max_workers=_UPLOAD_WORKERS) as pool:
+                futures = {
+                    pool.submit(
+                        upload_image,
+                        _file.name,
+                        _file.getvalue(),
+                        _max_edge if _downscale else None,
+                        _quality,
+                        _downscale and _keep_original,
+                        known,
+                    ): _file.name
+                    for _file in new_files
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    name = futures[future]
+                    try:
+                        seconds, size_in, size_out, duplicate_of = future.result()
+                        st.session_state.uploaded_files.add(name)
+                        if duplicate_of:
+                            duplicates.append(name)
+                            st.write(
+                                f":material/content_copy: {name}: same content as "
+                                f"{duplicate_of}, skipped"
+                            )
+                        else:
+                            uploaded.append(name)
+                            bytes_in += size_in
+                            bytes_out += size_out
+                            sizes = (
+                                f"{_mb(size_in)} -> {_mb(size_out)}"
+                                if size_out != size_in
+                                else _mb(size_in)
+                            )
+                            st.write(f":material/check: {name} ({seconds:.1f}s, {sizes})")
+                    except Exception as e:
+                        upload_errors.append(f"Error uploading {name}: {str(e)}")
+                        st.write(f":material/error: {name}")
+                    progress.progress(
+                        done / len(new_files), text=f"Uploaded {done}/{len(new_files)}: {name}"
                     )
-                    st.success(f"Uploaded: {_file.name}")
-                    st.session_state.uploaded_files.add(_file.name)
-
-                except Exception as e:
-                    upload_errors.append(f"Error uploading {_file.name}: {str(e)}")
-                    upload_success = False
+            saved = (
+                f", saved {_mb(bytes_in - bytes_out)} ({1 - bytes_out / bytes_in:.0%})"
+                if bytes_in > bytes_out
+                else ""
+            )
+            skipped = f", {len(duplicates)} duplicate(s) skipped" if duplicates else ""
+            upload_status.update(
+                label=f"Uploaded {len(uploaded)}/{len(new_files)} file(s){saved}{skipped}",
+                state="error" if upload_errors else "complete",
+            )
 
-            # Refresh stage after all uploads
-            if upload_success and new_files:
+        # Wait until the directory table lists the new files, then analyze
+        if uploaded:
+            with st.spinner("Waiting for stage and analyzing new images..."):
                 try:
-                    session.sql(f"ALTER STAGE {_STAGE_FQN[1:]} REFRESH").collect()
-                    st.success("Stage refreshed successfully!")
-
-                    # Small delay to ensure processing is complete
-                    time.sleep(2)
+                    missing = wait_for_stage_files(uploaded)
+                    if missing:
+                        st.warning(
+                            f"{len(missing)} file(s) not yet visible on the stage after "
+                            f"{_STAGE_READY_TIMEOUT:.0f}s; use Refresh Data to pick them up."
+                        )
+                    else:
+                        st.success("Stage refreshed successfully!")
 
-                    st.session_state.df = refresh_data()
+                    st.info(analyze_images())
+                    refresh_data()
                     st.session_state.files_uploaded = True
 
                 except Exception as e:
                     st.error(f"Error refreshing stage: {str(e)}")
-                    upload_success = False
 
-            # Display any upload errors
-            if upload_errors:
-                for error in upload_errors:
-                    st.error(error)
+        # Display any upload errors
+        for error in upload_errors:
+            st.error(error)
+
+# Manual refresh buttons: re-analyze new images, or drop cached pages
+_refresh_col, _reload_col = st.columns([1, 1])
+_refresh_clicked = _refresh_col.button("Refresh Data")
+_reload_clicked = _reload_col.button(
+    "Full Reload", help="Drop the cached pages and re-read the table"
+)
 
-# Manual refresh button
-if st.button("Refresh Data"):
+if _reload_clicked:
+    with st.spinner("Reloading all data..."):
+        try:
+            st.success(f"Reloaded {refresh_data(full=True)} row(s)")
+        except Exception as e:
+            st.error(f"Error reloading data: {str(e)}")
+
+if _refresh_clicked:
     with st.spinner("Refreshing data..."):
         try:
-            session.sql(f"ALTER STAGE {_STAGE_FQN[1:]} REFRESH").collect()
-            time.sleep(2)
-            st.session_state.df = refresh_data()
+            with perf("ALTER STAGE REFRESH") as ev:
+                ev["result"] = session.sql(f"ALTER STAGE {_STAGE_FQN[1:]} REFRESH").collect()
+            summary = analyze_images()
+            refresh_data()
             st.session_state.files_uploaded = True
-            st.success("Data refreshed successfully!")
+            st.success(f"Data refreshed successfully! ({summary})")
 
         except Exception as e:
             st.error(f"Error refreshing data: {str(e)}")
 
+with st.expander(":material/content_copy: Duplicate report"):
+    st.caption(
+        "Stage files with identical content (same MD5), e.g. one photo uploaded "
+        "under two names. Each copy is analyzed separately."
+    )
+    if st.button("Scan stage for duplicates"):
+        try:
+            with st.spinner("Scanning stage..."):
+                dupes = duplicate_report()
+            if dupes.empty:
+                st.success("No duplicate content on the stage.")
+            else:
+                extra = int((dupes["COPIES"] - 1).sum())
+                reclaimable = int((dupes["BYTES"] - dupes["BYTES"] / dupes["COPIES"]).sum())
+                st.warning(
+                    f"{extra} redundant file(s) in {len(dupes)} group(s), "
+                    f"{_mb(reclaimable)} reclaimable"
+                )
+                st.dataframe(dupes, hide_index=True, use_container_width=True)
+        except Exception as e:
+            st.error(f"Error scanning stage: {str(e)}")
+
 # ---------------------------------------------------------------------------
 # Data table
 # ---------------------------------------------------------------------------
 
-if not st.session_state.df.empty:
+_section("Table")
+
+_total_rows = st.session_state.table_version[0]
+if _total_rows:
+    _sort_col, _order_col, _size_col, _page_col = st.columns([2, 1, 1, 1])
+    _sort_label = _sort_col.selectbox("Sort by", list(_SORT_COLUMNS))
+    _descending = _order_col.toggle("Descending", value=False)
+    _page_size = _size_col.selectbox("Rows per page", _PAGE_SIZES)
+    _pages = max(1, (_total_rows + _page_size - 1) // _page_size)
+    # A larger page size or fewer rows can leave the kept page past the end
+    if st.session_state.get("table_page", 1) > _pages:
+        st.session_state.table_page = _pages
+    _page = _page_col.number_input("Page", min_value=1, max_value=_pages, key="table_page") - 1
+
+    try:
+        page_df = fetch_page(_page, _page_size, _SORT_COLUMNS[_sort_label], _descending)
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        page_df = pd.DataFrame(columns=_TABLE_COLUMNS)
+
+    # Presign this page's images in bulk; a no-op once the cache is warm
+    try:
+        prefetch_image_urls((_STAGE_FQN, name) for name in page_df["NAME"])
+    except Exception as e:
+        st.warning(f"Could not prefetch image URLs: {e}")
+
     event = st.dataframe(
-        st.session_state.df,
+        page_df,
         on_select="rerun",
         selection_mode="single-row",
         hide_index=True,
-        column_config={
-            "CAPTION": None,
-            "FILE_NAME": None,
-            "RAW": None,
-        },
+        # A new page or order starts with nothing selected
+        key=f"table-{_page}-{_page_size}-{_sort_label}-{_descending}",
+    )
+    st.caption(
+        f"Rows {_page * _page_size + 1}-{min((_page + 1) * _page_size, _total_rows)}"
+        f" of {_total_rows}"
     )
 
-    if event.selection:
-        st.session_state.selected_row = event.selection.rows
+    if event.selection.rows:
+        st.session_state.selected_name = page_df.iloc[event.selection.rows[0]]["NAME"]
+    else:
+        st.session_state.selected_name = None
 else:
+    st.session_state.selected_name = None
     st.info("No data available. Upload some files to get started!")
 
+# ---------------------------------------------------------------------------
+# Event and city roll-ups (aggregated in Snowflake)
+# ---------------------------------------------------------------------------
+
+_section("Events and locations")
+
+if _total_rows:
+    st.subheader(":material/bar_chart: Events and locations")
+    try:
+        _summary = fetch_summary()
+    except Exception as e:
+        st.warning(f"Could not load aggregates (re-run scc-setup to create the view): {e}")
+        _summary = None
+    if _summary is not None and not _summary.empty:
+        for _tab, (_dimension, _label) in zip(
+            st.tabs(["By event", "By city"]), [("EVENT", "Event"), ("CITY", "City")]
+        ):
+            with _tab:
+                _rows = _summary[_summary["DIMENSION"] == _dimension].drop(
+                    columns="DIMENSION"
+                )
+                st.altair_chart(
+                    create_summary_chart(_rows, _label), use_container_width=True
+                )
+                st.dataframe(
+                    _rows.rename(columns={"VALUE": _label.upper()}), hide_index=True
+                )
+
 # ---------------------------------------------------------------------------
 # Selected row details -- image + analytics
 # ---------------------------------------------------------------------------
 
-if st.session_state.selected_row and not st.session_state.df.empty:
-    __idx = st.session_state.selected_row[0]
-    if __idx < len(st.session_state.df):
-        selected_row = st.session_state.df.iloc[__idx]
+_section("Details")
+
+if st.session_state.selected_name:
+    try:
+        selected_row = fetch_details(st.session_state.selected_name)
+    except Exception as e:
+        st.error(f"Error loading row details: {e}")
+        selected_row = None
+    if selected_row is not None:
 
         col1, col2 = st.columns([1, 1])
 
@@ -324,8 +947,11 @@ if st.session_state.selected_row and not st.session_state.df.empty:
                 file_name_json = selected_row["FILE_NAME"]
                 filename = extract_filename_from_json(file_name_json)
 
-                with st.spinner("Getting image URL..."):
-                    image_url = get_image_url_from_stage(file_name_json)
+                # Usually presigned already with the rest of the page
+                image_url = _cached_url((_STAGE_FQN, selected_row["NAME"]))
+                if image_url is None:
+                    with st.spinner("Getting image URL..."):
+                        image_url = get_image_url_from_stage(file_name_json)
 
             caption = selected_row["CAPTION"]
             if image_url and filename:
@@ -359,6 +985,16 @@ if st.session_state.selected_row and not st.session_state.df.empty:
                             st.write(
                                 f"**ETag:** {file_info.get('ETAG', 'N/A')[:16]}..."
                             )
+                        # Originals are only presigned when asked for
+                        ref = _stage_file_ref(file_info)
+                        if ref and st.button("Show original upload"):
+                            ref = (ref[0], f"{_ORIGINALS_PREFIX}{ref[1]}")
+                            prefetch_image_urls([ref])
+                            original_url = _cached_url(ref)
+                            if original_url:
+                                st.markdown(f"[Open original]({original_url})")
+                            else:
+                                st.info("No original was kept for this image.")
                 except Exception as e:
                     st.warning(f"Could not parse file metadata: {str(e)}")
 
@@ -369,6 +1005,16 @@ if st.session_state.selected_row and not st.session_state.df.empty:
                     f"**Conversion:** {selected_row.get('PERCENTAGE_WITH_HANDS_UP', 'N/A')}%"
                 )
 
+                # Targeted re-analysis (results are otherwise reused)
+                if st.button(":material/refresh: Re-analyze this image"):
+                    with st.spinner("Re-analyzing image..."):
+                        try:
+                            st.info(analyze_images([selected_row["NAME"]]))
+                            refresh_data()
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Error re-analyzing image: {str(e)}")
+
             elif filename:
                 st.error(f"Could not generate presigned URL for: {filename}")
                 st.info("Check Snowflake permissions for GET_PRESIGNED_URL function")
@@ -417,3 +1063,73 @@ if st.session_state.selected_row and not st.session_state.df.empty:
 # ---------------------------------------------------------------------------
 
 st.caption(f"Built using [Streamlit](https://streamlit.io) v{st.__version__}")
+
+# ---------------------------------------------------------------------------
+# Performance panel (drawn last, so it covers the whole rerun)
+# ---------------------------------------------------------------------------
+
+_section(None)
+if _perf_on:
+    _history = st.session_state.perf_history
+    _history.extend(_perf_events)
+    del _history[:-_PERF_HISTORY]
+    _sections = [e for e in _perf_events if e["kind"] == "section"]
+    _calls = [e for e in _perf_events if e["kind"] != "section"]
+
+    with st.sidebar:
+        st.subheader(":material/speed: Performance")
+        st.metric(
+            f"Rerun {_perf_rerun}",
+            f"{sum(e['seconds'] for e in _sections):.2f}s",
+            help="Time from the header to the footer of this rerun",
+        )
+        st.caption(
+            f"{len(_calls)} Snowflake call(s) took {sum(e['seconds'] for e in _calls):.2f}s; "
+            "cached pages, rows and URLs cost none"
+        )
+        st.dataframe(
+            pd.DataFrame(_sections, columns=["name", "seconds"]).rename(
+                columns={"name": "section"}
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+        if _calls:
+            st.dataframe(
+                pd.DataFrame(_calls)[
+                    ["name", "detail", "seconds", "rows", "bytes", "query_ids", "error"]
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        _history_df = pd.DataFrame(_history)
+        _reruns = _history_df["rerun"].nunique() if not _history_df.empty else 0
+        st.markdown(f"**History:** {len(_history)} timing(s) over {_reruns} rerun(s)")
+        if not _history_df.empty:
+            st.dataframe(
+                _history_df.groupby(["kind", "name"])["seconds"]
+                .agg(["count", "mean", "max", "sum"])
+                .round(4)
+                .sort_values("sum", ascending=False)
+                .reset_index(),
+                hide_index=True,
+                use_container_width=True,
+            )
+            _stamp = time.strftime("%Y%m%d-%H%M%S")
+            _csv_col, _json_col = st.columns(2)
+            _csv_col.download_button(
+                ":material/download: CSV",
+                _history_df.to_csv(index=False),
+                file_name=f"scc-perf-{_stamp}.csv",
+                mime="text/csv",
+            )
+            _json_col.download_button(
+                ":material/download: JSON",
+                json.dumps(_history, indent=2, default=str),
+                file_name=f"scc-perf-{_stamp}.json",
+                mime="application/json",
+            )
+        if st.button("Clear history"):
+            st.session_state.perf_history = []
+            st.rerun()
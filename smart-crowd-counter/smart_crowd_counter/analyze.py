@@ -0,0 +1,403 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-analyze`` -- count people and raised hands in local image folders.
+
+The app analyzes photos inside Snowflake (``REFRESH_SMART_CROWD_COUNTER``
+calls ``AI_COMPLETE`` once per stage image).  ``scc-analyze`` runs the
+same analysis over local files or directories, in batches of
+``--batch-size`` images spread over ``--workers`` processes, and writes
+rows with the results table's ``total_attendees`` / ``raised_hands`` /
+``percentage_with_hands_up`` columns.
+
+Backends (``--backend``):
+
+* ``cortex`` -- uploads each batch to a temporary stage and runs the
+  structured ``AI_COMPLETE`` call of ``sql/analyze.sql``: one ``snow
+  sql`` submission per batch, nothing stored in the account;
+* ``onnx`` -- a local CPU person/pose detector run with ONNX Runtime, for
+  offline rehearsals and regression runs.  Expects a YOLOv8-pose style
+  model (``yolo export model=yolov8n-pose.pt format=onnx dynamic=True``):
+  people are detections above ``--min-confidence``, a hand is raised when
+  a wrist keypoint is above its shoulder.  Needs the ``onnx`` extra;
+* ``fake`` -- counts derived from a hash of the file, no dependencies;
+  for exercising the pipeline itself.
+
+A backend is a class with a ``name`` and an ``analyze(paths)`` method
+returning one ``(total_attendees, raised_hands)`` pair per path; each
+worker process builds its own instance once (see :func:`get_backend`).
+"""
+
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import click
+
+from smart_crowd_counter.cli import (
+    _env_file_option,
+    _get_sql_dir,
+    _require_env,
+    _sql_dir_option,
+)
+from smart_crowd_counter.daemon import DaemonCommand
+from smart_crowd_counter.render import rendered_sql, snow_sql_command
+
+BACKENDS = ("cortex", "onnx", "fake")
+
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+# COCO keypoint indices used by YOLOv8-pose models
+_LEFT_SHOULDER, _RIGHT_SHOULDER, _LEFT_WRIST, _RIGHT_WRIST = 5, 6, 9, 10
+
+
+@dataclass
+class Result:
+    """Counts for one image, in the results table's columns."""
+
+    name: str
+    total_attendees: int | None
+    raised_hands: int | None
+    percentage_with_hands_up: float | None
+    backend: str
+    error: str | None = None
+
+
+def percentage(total: int, raised: int) -> float:
+    """``raised * 100 / total`` rounded to 2 decimals, 0 without people (as setup.sql)."""
+    return round(raised * 100 / total, 2) if total > 0 else 0.0
+
+
+class Backend:
+    """Counts people and raised hands in a batch of images."""
+
+    name = ""
+
+    def analyze(self, paths: list[Path]) -> list[tuple[int, int]]:
+        raise NotImplementedError
+
+
+class FakeBackend(Backend):
+    """Deterministic counts from the file contents; no model, no account."""
+
+    name = "fake"
+
+    def analyze(self, paths: list[Path]) -> list[tuple[int, int]]:
+        counts = []
+        for path in paths:
+            digest = hashlib.sha256(path.read_bytes()).digest()
+            total = 5 + int.from_bytes(digest[:2], "big") % 200
+            counts.append((total, int.from_bytes(digest[2:4], "big") % (total + 1)))
+        return counts
+
+
+class CortexBackend(Backend):
+    """One ``snow sql`` submission per batch: PUT to a temporary stage, then AI_COMPLETE."""
+
+    name = "cortex"
+
+    def __init__(self, sql_path: Path, variables: dict[str, str], connection: str):
+        self.sql_path = sql_path
+        self.variables = variables
+        self.connection = connection
+
+    def analyze(self, paths: list[Path]) -> list[tuple[int, int]]:
+        files = [{"path": p.resolve().as_posix(), "folder": str(i)} for i, p in enumerate(paths)]
+        cmd = snow_sql_command(
+            rendered_sql(self.sql_path, {**self.variables, "files": files}), self.connection
+        ) + ["--format", "json"]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or result.stdout.strip())
+        counts: dict[int, tuple[int, int]] = {}
+        for row in _rows(result.stdout):
+            folder = str(row["RELATIVE_PATH"]).split("/", 1)[0]
+            reply = json.loads(row["RESPONSE"] or "{}")
+            counts[int(folder)] = (int(reply["total_attendees"]), int(reply["raised_hands"]))
+        missing = [paths[i].name for i in range(len(paths)) if i not in counts]
+        if missing:
+            raise RuntimeError(f"no result for {', '.join(missing)}")
+        return [counts[i] for i in range(len(paths))]
+
+
+class OnnxBackend(Backend):
+    """YOLOv8-pose style detector on CPU with ONNX Runtime."""
+
+    name = "onnx"
+
+    def __init__(self, model: Path, min_confidence: float, threads: int):
+        import numpy as np
+        import onnxruntime as ort
+        from PIL import Image, ImageOps
+
+        self._np, self._image, self._image_ops = np, Image, ImageOps
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            str(model), options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        batch, _, height, width = model_input.shape
+        self.dynamic_batch = not isinstance(batch, int)
+        self.size = (width if isinstance(width, int) else 640,
+                     height if isinstance(height, int) else 640)
+        self.min_confidence = min_confidence
+
+    def _load(self, path: Path):
+        """Letterbox ``path`` into the model input (RGB, CHW, 0..1)."""
+        np = self._np
+        with self._image.open(path) as img:
+            img = self._image_ops.exif_transpose(img).convert("RGB")
+            img.thumbnail(self.size, self._image.BILINEAR)
+            canvas = self._image.new("RGB", self.size, (114, 114, 114))
+            canvas.paste(img, ((self.size[0] - img.width) // 2, (self.size[1] - img.height) // 2))
+        return np.asarray(canvas, dtype=np.float32).transpose(2, 0, 1) / 255.0
+
+    def _nms(self, boxes, scores, iou: float = 0.5) -> list[int]:
+        np = self._np
+        x1, y1, x2, y2 = boxes.T
+        areas = (x2 - x1) * (y2 - y1)
+        order = scores.argsort()[::-1]
+        keep = []
+        while order.size:
+            i, rest = order[0], order[1:]
+            keep.append(int(i))
+            w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+            h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+            inter = w * h
+            order = rest[inter / (areas[i] + areas[rest] - inter + 1e-9) <= iou]
+        return keep
+
+    def _count(self, prediction) -> tuple[int, int]:
+        """People and raised hands from one ``(56, N)`` YOLOv8-pose output."""
+        np = self._np
+        rows = prediction.T
+        rows = rows[rows[:, 4] >= self.min_confidence]
+        if not len(rows):
+            return 0, 0
+        cx, cy, w, h = rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        people = rows[self._nms(boxes, rows[:, 4])]
+        keypoints = people[:, 5:].reshape(len(people), -1, 3)
+        raised = np.zeros(len(people), dtype=bool)
+        for wrist, shoulder in ((_LEFT_WRIST, _LEFT_SHOULDER), (_RIGHT_WRIST, _RIGHT_SHOULDER)):
+            seen = (keypoints[:, wrist, 2] >= 0.5) & (keypoints[:, shoulder, 2] >= 0.5)
+            raised |= seen & (keypoints[:, wrist, 1] < keypoints[:, shoulder, 1])
+        return len(people), int(raised.sum())
+
+    def analyze(self, paths: list[Path]) -> list[tuple[int, int]]:
+        np = self._np
+        images = [self._load(p) for p in paths]
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: np.stack(images)})[0]
+        else:
+            outputs = [self.session.run(None, {self.input_name: image[None]})[0][0]
+                       for image in images]
+        return [self._count(output) for output in outputs]
+
+
+def get_backend(name: str, options: dict) -> Backend:
+    """Build the ``name`` backend from the command's options."""
+    if name == "cortex":
+        return CortexBackend(options["sql_path"], options["variables"], options["connection"])
+    if name == "onnx":
+        return OnnxBackend(options["model"], options["min_confidence"], options["threads"])
+    if name == "fake":
+        return FakeBackend()
+    raise click.BadParameter(f"Unknown backend: {name}", param_hint="--backend")
+
+
+def _rows(output: str) -> list[dict]:
+    """Result rows in ``snow sql --format json`` output (one or many results)."""
+    data = json.loads(output or "[]")
+    results = data if data and all(isinstance(r, list) for r in data) else [data]
+    return [{key.upper(): value for key, value in row.items()}
+            for result in results for row in result
+            if isinstance(row, dict) and {"RELATIVE_PATH", "RESPONSE"} <= {k.upper() for k in row}]
+
+
+def find_images(paths: tuple[str, ...]) -> list[tuple[str, Path]]:
+    """``(name, path)`` for every image under ``paths``; names are relative to a given folder."""
+    found = []
+    for given in map(Path, paths):
+        if given.is_dir():
+            found += [(p.relative_to(given).as_posix(), p) for p in sorted(given.rglob("*"))
+                      if p.is_file() and p.suffix.lower() in _IMAGE_SUFFIXES]
+        elif given.suffix.lower() in _IMAGE_SUFFIXES:
+            found.append((given.name, given))
+    return found
+
+
+_worker_backend: Backend | None = None
+
+
+def _init_worker(name: str, options: dict) -> None:
+    global _worker_backend
+    _worker_backend = get_backend(name, options)
+
+
+def _analyze_batch(paths: list[Path]) -> tuple[list[tuple[int, int]], float]:
+    started = time.perf_counter()
+    counts = _worker_backend.analyze(paths)
+    if len(counts) != len(paths):
+        raise RuntimeError(f"{_worker_backend.name} returned {len(counts)} result(s)"
+                           f" for {len(paths)} image(s)")
+    return counts, time.perf_counter() - started
+
+
+def _write_output(path: Path, results: list[Result]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [asdict(r) for r in results]
+    with path.open("w", newline="") as out:
+        if path.suffix.lower() == ".csv":
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            out.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("paths", metavar="PATH...", nargs=-1, required=True,
+                type=click.Path(exists=True))
+@click.option("--backend", type=click.Choice(BACKENDS), default="cortex",
+              envvar="SCC_ANALYZE_BACKEND", show_default=True,
+              help="cortex: AI_COMPLETE via snow sql; onnx: local CPU detector;"
+                   " fake: offline stand-in")
+@click.option("--model", type=click.Path(exists=True, dir_okay=False),
+              help="ONNX pose model (required for --backend onnx)")
+@click.option("--min-confidence", default=0.35, show_default=True, type=click.FloatRange(0, 1),
+              help="Detection score that counts as a person (onnx)")
+@click.option("--batch-size", default=8, show_default=True, type=click.IntRange(1),
+              help="Images per backend call (one snow sql submission for cortex)")
+@click.option("--workers", default=min(4, os.cpu_count() or 1), show_default=True,
+              type=click.IntRange(1), help="Worker processes analyzing batches at once")
+@click.option("--demo-role", help="Demo role (required for --backend cortex; from manifest/.env)")
+@click.option("--connection", help="Snow CLI connection (cortex; default: .env's)")
+@click.option("--output", type=click.Path(dir_okay=False),
+              help="Write results to this .csv or .jsonl file")
+@click.option("--dry-run", is_flag=True, help="List the images and batches without analyzing")
+@_env_file_option
+@_sql_dir_option
+def analyze(paths: tuple[str, ...], backend: str, model: str | None, min_confidence: float,
+            batch_size: int, workers: int, demo_role: str | None, connection: str | None,
+            output: str | None,
+            dry_run: bool, env_file: str | None, sql_dir: str | None) -> None:
+    """Count people and raised hands in the images under PATH... in batches.
+
+    PATH is an image (JPG, JPEG, PNG) or a folder searched recursively.
+    Results use the app's columns (total_attendees, raised_hands,
+    percentage_with_hands_up) and are printed, or written to --output.
+
+    \b
+    Example:
+      scc-analyze photos/ --backend onnx --model yolov8n-pose.onnx --workers 4
+    """
+    images = find_images(paths)
+    if not images:
+        click.echo("No JPG, JPEG or PNG images found.", err=True)
+        sys.exit(1)
+    # Batches hold indices into ``images``: names need not be unique across PATHs
+    batches = [list(range(i, min(i + batch_size, len(images))))
+               for i in range(0, len(images), batch_size)]
+    workers = min(workers, len(batches))
+
+    options: dict = {}
+    if backend == "cortex":
+        if not demo_role:
+            raise click.BadParameter("required with --backend cortex", param_hint="--demo-role")
+        env = _require_env("DEMO_DATABASE", "DEMO_SCHEMA", "AI_MODEL",
+                           *([] if connection else ["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]),
+                           env_file=env_file)
+        quoted = [name for name, path in images if "'" in str(path.resolve())]
+        if quoted:
+            click.echo(f"Cannot upload paths containing a quote: {', '.join(quoted)}", err=True)
+            sys.exit(1)
+        sql_path = _get_sql_dir(sql_dir) / "analyze.sql"
+        if not sql_path.exists():
+            click.echo(f"SQL file not found: {sql_path}", err=True)
+            sys.exit(1)
+        options = {
+            "sql_path": sql_path,
+            "connection": connection or env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
+            "variables": {
+                "demo_role": demo_role,
+                "database": env["DEMO_DATABASE"],
+                "schema": env["DEMO_SCHEMA"],
+                "ai_model": env["AI_MODEL"],
+            },
+        }
+    elif backend == "onnx":
+        if not model:
+            raise click.BadParameter("required with --backend onnx", param_hint="--model")
+        missing = [m for m in ("onnxruntime", "numpy", "PIL")
+                   if importlib.util.find_spec(m) is None]
+        if missing:
+            click.echo(f"The onnx backend needs {', '.join(missing)}: install the onnx extra"
+                       " (uv sync --extra onnx)", err=True)
+            sys.exit(1)
+        options = {"model": Path(model), "min_confidence": min_confidence,
+                   "threads": max(1, (os.cpu_count() or 1) // workers)}
+
+    click.echo(f"Analyzing {len(images)} image(s) with {backend}: {len(batches)} batch(es) of"
+               f" up to {batch_size}, {workers} worker(s)")
+    if dry_run:
+        for number, batch in enumerate(batches, 1):
+            click.echo(f"  batch {number}: {', '.join(images[i][0] for i in batch)}")
+        return
+
+    results: list[Result | None] = [None] * len(images)
+    t0 = time.perf_counter()
+
+    def finish(number: int, batch: list[int], outcome) -> None:
+        try:
+            counts, seconds = outcome()
+        except Exception as e:  # one failed batch does not stop the others
+            for i in batch:
+                results[i] = Result(images[i][0], None, None, None, backend, str(e))
+            click.echo(f"[{time.perf_counter() - t0:6.2f}s] failed batch {number}/{len(batches)}:"
+                       f" {e}", err=True)
+            return
+        for i, (total, raised) in zip(batch, counts):
+            results[i] = Result(images[i][0], total, raised, percentage(total, raised), backend)
+        click.echo(f"[{time.perf_counter() - t0:6.2f}s] ok     batch {number}/{len(batches)}:"
+                   f" {len(batch)} image(s) ({seconds:.2f}s)")
+
+    if workers == 1:
+        _init_worker(backend, options)
+        for number, batch in enumerate(batches, 1):
+            finish(number, batch,
+                   lambda b=batch: _analyze_batch([images[i][1] for i in b]))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(backend, options)) as pool:
+            futures = {pool.submit(_analyze_batch, [images[i][1] for i in batch]): (number, batch)
+                       for number, batch in enumerate(batches, 1)}
+            for future in as_completed(futures):
+                finish(*futures[future], future.result)
+
+    elapsed = time.perf_counter() - t0
+    if output:
+        _write_output(Path(output), results)
+    else:
+        click.echo(f"\n{'Image':<40} {'Attendees':>9} {'Raised':>7} {'Conversion':>10}")
+        for r in results:
+            if r.error is None:
+                click.echo(f"{r.name:<40} {r.total_attendees:>9} {r.raised_hands:>7}"
+                           f" {r.percentage_with_hands_up:>9.2f}%")
+    failed = [r for r in results if r.error is not None]
+    click.echo(f"\n{len(results) - len(failed)}/{len(results)} image(s) analyzed in"
+               f" {elapsed:.2f}s ({len(results) / elapsed:.1f} images/s)"
+               + (f"; results: {output}" if output else ""))
+    if failed:
+        for r in failed:
+            click.echo(f"  failed   {r.name}", err=True)
+        sys.exit(1)
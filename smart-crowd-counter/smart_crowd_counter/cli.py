@@ -5,6 +5,8 @@
 Each command loads .env, reads required variables, and runs the
 corresponding SQL file via `snow sql` subprocess. This eliminates
 the error-prone `set -a && source .env && set +a` boilerplate.
+Templates are rendered locally first (see :mod:`smart_crowd_counter.render`)
+and every step's timings are recorded by :mod:`smart_crowd_counter.telemetry`.
 
 NOTE: ``uv run --project <SKILL_DIR>`` changes CWD to the skill
 install directory, so the user's project ``.env`` and ``sql/``
@@ -13,13 +15,17 @@ accepts ``--env-file`` (path to ``.env``) and ``--sql-dir``
 (path to the ``sql/`` folder in the user's project).
 """
 
+import json
 import os
-import subprocess
 import sys
 from pathlib import Path
 
 import click
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
+
+from smart_crowd_counter import telemetry
+from smart_crowd_counter.daemon import DaemonCommand
+from smart_crowd_counter.render import rendered_sql, snow_sql_command
 
 
 def _get_sql_dir(sql_dir: str | None = None) -> Path:
@@ -42,6 +48,25 @@ def _get_sql_dir(sql_dir: str | None = None) -> Path:
     return Path(__file__).parent.parent / "sql"
 
 
+_dotenv_cache: dict[str, tuple[int, dict[str, str]]] = {}
+
+
+def _load_dotenv(path: str) -> None:
+    """``load_dotenv(path, override=True)``, reusing the parse while mtime is unchanged.
+
+    Matters under ``scc-daemon``, where one process serves many calls.
+    """
+    if not path or not os.path.isfile(path):
+        return
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _dotenv_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        values = {k: v for k, v in dotenv_values(path).items() if v is not None}
+        cached = _dotenv_cache[path] = (mtime, values)
+    os.environ.update(cached[1])
+
+
 def _require_env(*names: str, env_file: str | None = None) -> dict[str, str]:
     """Read required env vars, abort with clear message if any missing.
 
@@ -52,10 +77,7 @@ def _require_env(*names: str, env_file: str | None = None) -> dict[str, str]:
     pre-existing environment variables (e.g. empty values exported
     by an earlier ``set -a && source .env && set +a``).
     """
-    if env_file:
-        load_dotenv(dotenv_path=env_file, override=True)
-    else:
-        load_dotenv(override=True)
+    _load_dotenv(env_file or find_dotenv())
     values: dict[str, str] = {}
     missing: list[str] = []
     for name in names:
@@ -88,6 +110,19 @@ _sql_dir_option = click.option(
 )
 
 
+def _snow_sql_cmd(sql_path: Path, variables: dict[str, str], connection: str,
+                  traced: bool = False) -> list[str]:
+    """Render ``sql_path`` locally (cached) and build its ``snow sql`` command line.
+
+    ``traced`` appends the query-history block :mod:`smart_crowd_counter.telemetry`
+    reads per-statement timings from.
+    """
+    rendered = rendered_sql(sql_path, variables)
+    if traced:
+        rendered = telemetry.traced_script(rendered)
+    return snow_sql_command(rendered, connection)
+
+
 def _run_snow_sql(
     sql_file: str,
     variables: dict[str, str],
@@ -101,20 +136,6 @@ def _run_snow_sql(
         click.echo(f"SQL file not found: {sql_path}", err=True)
         sys.exit(1)
 
-    cmd = [
-        "snow",
-        "sql",
-        "-c",
-        connection,
-        "-f",
-        str(sql_path),
-        "--enable-templating",
-        "ALL",
-    ]
-
-    for key, val in variables.items():
-        cmd.extend(["--variable", f"{key}={val}"])
-
     if dry_run:
         click.echo("Would run:")
         click.echo(f"  snow sql -c {connection} -f {sql_path}")
@@ -123,13 +144,15 @@ def _run_snow_sql(
         return
 
     click.echo(f"Running: snow sql -f {sql_file}")
-    result = subprocess.run(cmd, env=os.environ)
+    with telemetry.step(sql_path.stem) as step:
+        cmd = _snow_sql_cmd(sql_path, variables, connection, traced=step.enabled)
+        result = telemetry.run_snow(cmd, step)
     if result.returncode != 0:
         click.echo(f"Command failed with exit code {result.returncode}", err=True)
         sys.exit(result.returncode)
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--demo-role", required=True, help="Demo role to create (from manifest)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
@@ -166,7 +189,7 @@ def create_role(admin_role: str, demo_role: str, dry_run: bool,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--demo-role", required=True, help="Demo role (from manifest)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
 @_env_file_option
@@ -202,7 +225,7 @@ def setup(demo_role: str, dry_run: bool,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--demo-role", required=True, help="Demo role to grant warehouse access")
 @click.option("--warehouse", required=True, help="Warehouse name to create")
@@ -233,7 +256,7 @@ def create_warehouse(admin_role: str, demo_role: str, warehouse: str, dry_run: b
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--demo-role", required=True, help="Demo role that owns the database (from manifest/.env)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
 @_env_file_option
@@ -262,7 +285,7 @@ def cleanup(demo_role: str, dry_run: bool,
     )
 
 
-@click.command()
+@click.command(cls=DaemonCommand)
 @click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
 @click.option("--demo-role", required=True, help="Demo role to drop (from manifest)")
 @click.option("--dry-run", is_flag=True, help="Preview command without executing")
@@ -291,3 +314,42 @@ def cleanup_role(admin_role: str, demo_role: str, dry_run: bool,
         dry_run=dry_run,
         sql_dir=sql_dir,
     )
+
+
+@click.command(cls=DaemonCommand)
+@click.option("--demo-role", required=True, help="Demo role that owns the database (from manifest/.env)")
+@click.option("--path", "paths", multiple=True,
+              help="Stage-relative image path to re-analyze (repeatable)")
+@click.option("--all", "all_images", is_flag=True, help="Re-analyze every image on the stage")
+@click.option("--dry-run", is_flag=True, help="Preview command without executing")
+@_env_file_option
+@_sql_dir_option
+def reprocess(demo_role: str, paths: tuple[str, ...], all_images: bool, dry_run: bool,
+              env_file: str | None, sql_dir: str | None) -> None:
+    """Re-run AI analysis for selected images.
+
+    Runs sql/reprocess.sql, which calls REFRESH_SMART_CROWD_COUNTER with
+    the given relative paths so their stored results are recomputed even
+    if the image is unchanged. New or changed images are analyzed too.
+    """
+    if not paths and not all_images:
+        raise click.UsageError("Pass at least one --path or --all")
+    env = _require_env(
+        "SNOWFLAKE_DEFAULT_CONNECTION_NAME",
+        "DEMO_DATABASE",
+        "DEMO_SCHEMA",
+        env_file=env_file,
+    )
+    targets = ["*"] if all_images else list(paths)
+    _run_snow_sql(
+        "reprocess.sql",
+        variables={
+            "demo_role": demo_role,
+            "database": env["DEMO_DATABASE"],
+            "schema": env["DEMO_SCHEMA"],
+            "paths": json.dumps(targets).replace("'", "''"),
+        },
+        connection=env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"],
+        dry_run=dry_run,
+        sql_dir=sql_dir,
+    )
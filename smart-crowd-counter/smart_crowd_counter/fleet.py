@@ -0,0 +1,344 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-fleet`` -- provision one prefixed demo per workshop attendee.
+
+Takes a (shared) manifest and a list of attendees and derives each
+attendee's values the way ``scc-replay --as-user`` does: every
+``# ADAPT:`` value has the manifest's ``shared_by`` prefix swapped for
+the attendee's name (``BOB_CROWD_COUNTER_DB`` -> ``CAROL_CROWD_COUNTER_DB``),
+and ``--rename`` pins values every attendee shares (one warehouse for
+the whole room, say).  Each attendee's demo role is granted to their
+own Snowflake user when the list names one.
+
+All scripts are rendered locally up front, then each attendee's
+``scc-up`` steps run, in dependency order, as ``snow sql`` submissions
+on a bounded thread pool (``--max-parallel``) while a shared limiter
+spaces submissions at most ``--rate`` per second, so the account never
+sees a burst of 300 logins.  An attendee stops at its first failed step;
+other attendees carry on.  A progress line is printed as each attendee
+finishes, failures are collected into a JSON report and the failed
+attendees (user column included) are written to a file that can be fed
+straight back in.
+
+Steps spawn whatever ``snow`` is first on ``PATH``, so a fleet can be
+exercised end to end against a stub executable.  Deploying the
+Streamlit app stays per attendee (SKILL.md Step 5).
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import click
+from dotenv import find_dotenv
+
+from smart_crowd_counter.cli import (
+    _env_file_option,
+    _get_sql_dir,
+    _load_dotenv,
+    _require_env,
+    _sql_dir_option,
+)
+from smart_crowd_counter.daemon import DaemonCommand
+from smart_crowd_counter.manifest import ManifestError, adapt, load
+from smart_crowd_counter.orchestrator import _build_steps, _ordered
+from smart_crowd_counter.render import combine_rendered, rendered_sql, snow_sql_command
+from smart_crowd_counter.replay import _env_values, _parse_renames
+
+_FAILED_FILE = Path(".snow-utils") / "scc-fleet-failed.txt"
+_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+
+@dataclass
+class Attendee:
+    """One attendee: derived values, rendered scripts and outcome."""
+
+    name: str
+    user: str | None = None
+    values: dict[str, str] = field(default_factory=dict)
+    scripts: list[tuple[str, Path]] = field(default_factory=list)
+    status: str = "pending"
+    step: str | None = None
+    started: float | None = None
+    seconds: float | None = None
+    returncode: int | None = None
+    output: str = field(default="", repr=False)
+
+
+class RateLimiter:
+    """Space calls to :meth:`wait` at least ``1/rate`` seconds apart, across threads.
+
+    A ``rate`` of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+            self.waited += slot - now
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_attendees(lines: Iterable[str]) -> list[Attendee]:
+    """Parse ``NAME[,SNOWFLAKE_USER]`` lines; blank lines and ``#`` comments are ignored."""
+    attendees: list[Attendee] = []
+    seen: dict[str, int] = {}
+    errors = []
+    for lineno, raw in enumerate(lines, 1):
+        name, _, user = (c.strip() for c in raw.split("#", 1)[0].partition(","))
+        if not name:
+            continue
+        if not _NAME.match(name):
+            errors.append(f"line {lineno}: '{name}' is not a valid prefix (letters, digits, _)")
+        elif name.upper() in seen:
+            errors.append(f"line {lineno}: {name} repeats line {seen[name.upper()]}")
+        else:
+            seen[name.upper()] = lineno
+            attendees.append(Attendee(name, user or None))
+    if errors:
+        raise click.BadParameter("\n".join(errors), param_hint="ATTENDEES")
+    if not attendees:
+        raise click.BadParameter("no attendees listed", param_hint="ATTENDEES")
+    return attendees
+
+
+def _provision(attendee: Attendee, connection: str, limiter: RateLimiter, t0: float) -> None:
+    attendee.status = "running"
+    attendee.started = time.perf_counter() - t0
+    for label, rendered in attendee.scripts:
+        limiter.wait()
+        try:
+            result = subprocess.run(
+                snow_sql_command(rendered, connection),
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            )
+        except Exception as e:  # e.g. snow missing from PATH: this attendee fails
+            attendee.returncode = None
+            attendee.output += f"{type(e).__name__}: {e}\n"
+            attendee.step = label
+            break
+        attendee.returncode = result.returncode
+        attendee.output += result.stdout
+        if result.returncode != 0:
+            attendee.step = label
+            break
+    attendee.seconds = time.perf_counter() - t0 - attendee.started
+    attendee.status = "failed" if attendee.step else "ok"
+
+
+def _last_line(output: str) -> str:
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    return lines[-1] if lines else "(no output)"
+
+
+def run_fleet(attendees: list[Attendee], connection: str, max_parallel: int,
+              limiter: RateLimiter) -> float:
+    """Provision every attendee; a failure never stops the others.
+
+    Returns the total wall time in seconds.  On Ctrl-C, running attendees
+    finish and the ones not yet started are marked skipped.
+    """
+    t0 = time.perf_counter()
+    done = failed = 0
+    pool = ThreadPoolExecutor(max_workers=max_parallel)
+    futures = {pool.submit(_provision, a, connection, limiter, t0): a for a in attendees}
+    try:
+        for future in as_completed(futures):
+            attendee = futures[future]
+            future.result()
+            done += 1
+            failed += attendee.status == "failed"
+            running = sum(a.status == "running" for a in attendees)
+            click.echo(
+                f"[{time.perf_counter() - t0:6.2f}s] {attendee.status:<6} {attendee.name}"
+                f" ({attendee.seconds:.2f}s)  {done}/{len(attendees)} done, {failed} failed,"
+                f" {running} running"
+            )
+            if attendee.status == "failed":
+                click.echo(f"         {attendee.name} {attendee.step}:"
+                           f" {_last_line(attendee.output)}", err=True)
+    except KeyboardInterrupt:
+        click.echo("Interrupted: letting running attendees finish, skipping the rest", err=True)
+        pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        pool.shutdown(wait=True)
+    for attendee in attendees:
+        if attendee.status == "pending":
+            attendee.status = "skipped"
+    return time.perf_counter() - t0
+
+
+def _write_report(path: Path, source: Path, attendees: list[Attendee], total: float,
+                  max_parallel: int, rate: float, limiter: RateLimiter, batch: bool) -> None:
+    counts: dict[str, int] = {}
+    for a in attendees:
+        counts[a.status] = counts.get(a.status, 0) + 1
+    report = {
+        "command": "scc-fleet",
+        "manifest": str(source),
+        "batch": batch,
+        "max_parallel": max_parallel,
+        "rate": rate,
+        "total_seconds": round(total, 3),
+        "throttled_seconds": round(limiter.waited, 3),
+        "counts": counts,
+        "attendees": [
+            {
+                "name": a.name,
+                "status": a.status,
+                "values": a.values,
+                "failed_step": a.step,
+                "started_at": None if a.started is None else round(a.started, 3),
+                "seconds": None if a.seconds is None else round(a.seconds, 3),
+                "returncode": a.returncode,
+                "output": a.output.splitlines()[-20:] if a.status == "failed" else [],
+            }
+            for a in attendees
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("manifest_path", metavar="MANIFEST", type=click.Path(dir_okay=False))
+@click.argument("attendees_file", metavar="ATTENDEES", type=click.File("r"))
+@click.option("--rename", "renames", multiple=True, metavar="OLD=NEW",
+              help="Give every attendee this value instead of a prefixed one (repeatable)")
+@click.option("--connection", help="Snow CLI connection (default: .env's)")
+@click.option("--create-warehouse", is_flag=True,
+              help="Also create each attendee's warehouse (like scc-up --create-warehouse)")
+@click.option("--max-parallel", default=8, show_default=True, type=click.IntRange(1),
+              help="Maximum attendees provisioning at once")
+@click.option("--rate", default=4.0, show_default=True, type=click.FloatRange(0),
+              help="Maximum snow sql submissions started per second (0: no limit)")
+@click.option("--batch", is_flag=True,
+              help="Send each attendee's steps as one submission instead of one per step")
+@click.option("--report", default=".snow-utils/scc-fleet-report.json", show_default=True,
+              type=click.Path(dir_okay=False), help="Where to write the per-attendee report")
+@click.option("--dry-run", is_flag=True, help="Show each attendee's values without running")
+@_env_file_option
+@_sql_dir_option
+def fleet(manifest_path: str, attendees_file, renames: tuple[str, ...],
+          connection: str | None, create_warehouse: bool, max_parallel: int, rate: float,
+          batch: bool, report: str, dry_run: bool, env_file: str | None,
+          sql_dir: str | None) -> None:
+    """Provision the demo for every attendee listed in ATTENDEES.
+
+    ATTENDEES is a file (or - for stdin) with one NAME[,SNOWFLAKE_USER]
+    per line; each name replaces MANIFEST's shared_by prefix in the
+    # ADAPT: values, so every attendee gets their own database and demo
+    role, granted to SNOWFLAKE_USER (default: .env's). Attendees
+    provision concurrently; a failure is recorded and the rest carry on.
+
+    \b
+    Example:
+      scc-fleet smart-crowd-counter-manifest.md attendees.csv \\
+        --rename BOB_WH=WORKSHOP_WH --max-parallel 16
+    """
+    source = Path(manifest_path)
+    attendees = read_attendees(attendees_file)
+    try:
+        manifest = load(source)
+        if not manifest.shared_by:
+            raise ManifestError(f"{source}: no shared_by in ## shared_info, so there is no"
+                                " prefix to swap for each attendee")
+        renamed = _parse_renames(renames)
+        for attendee in attendees:
+            admin_role, attendee.values = _env_values(adapt(manifest, attendee.name, renamed))
+    except ManifestError as e:
+        click.echo(f"Cannot provision fleet: {e}", err=True)
+        sys.exit(1)
+
+    if not connection:
+        env = _require_env("SNOWFLAKE_DEFAULT_CONNECTION_NAME", env_file=env_file)
+        connection = env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]
+    _load_dotenv(env_file or find_dotenv())
+    defaults = {name: os.environ[name].strip() for name in ("SNOWFLAKE_USER", "SNOWFLAKE_WAREHOUSE")
+                if os.environ.get(name, "").strip()}
+    owners: dict[str, str] = {}
+    for attendee in attendees:
+        attendee.values = {**defaults, **attendee.values}
+        if attendee.user:
+            attendee.values["SNOWFLAKE_USER"] = attendee.user
+        missing = [n for n in ("SNOWFLAKE_USER", "SNOWFLAKE_WAREHOUSE") if n not in attendee.values]
+        if missing:
+            click.echo(f"Missing values for {attendee.name} (not in {source}, ATTENDEES or"
+                       f" .env): {', '.join(missing)}", err=True)
+            sys.exit(1)
+        database = attendee.values["DEMO_DATABASE"]
+        if database in owners:
+            click.echo(f"{attendee.name} and {owners[database]} would share database {database};"
+                       " it must carry the shared_by prefix, marked # ADAPT:, and not be"
+                       " pinned with --rename", err=True)
+            sys.exit(1)
+        owners[database] = attendee.name
+
+    sql_path = _get_sql_dir(sql_dir)
+    for attendee in attendees:
+        steps = _ordered(_build_steps(attendee.values, admin_role, attendee.values["DEMO_ROLE"],
+                                      create_warehouse))
+        for step in steps:
+            if not (sql_path / step.sql_file).exists():
+                click.echo(f"SQL file not found: {sql_path / step.sql_file}", err=True)
+                sys.exit(1)
+        step_names = [s.name for s in steps]
+        rendered = [(s.name, rendered_sql(sql_path / s.sql_file, s.variables)) for s in steps]
+        if batch:
+            attendee.scripts = [("+".join(step_names), combine_rendered([r for _, r in rendered]))]
+        else:
+            attendee.scripts = rendered
+
+    submissions = sum(len(a.scripts) for a in attendees)
+    if dry_run:
+        click.echo(f"{'Attendee':<16} {'Database':<28} {'Demo Role':<24} User")
+        for a in attendees:
+            click.echo(f"{a.name:<16} {a.values['DEMO_DATABASE']:<28}"
+                       f" {a.values['DEMO_ROLE']:<24} {a.values['SNOWFLAKE_USER']}")
+        limit = f"at most {rate:g}/s" if rate else "no rate limit"
+        click.echo(f"\nWould run {' '.join(step_names)} for {len(attendees)} attendee(s) as"
+                   f" {submissions} snow sql submission(s) on connection {connection},"
+                   f" {max_parallel} at once, {limit}.")
+        return
+
+    click.echo(f"Provisioning {len(attendees)} attendee(s): {' '.join(step_names)}"
+               f"{' (batched)' if batch else ''}")
+    limiter = RateLimiter(rate)
+    total = run_fleet(attendees, connection, max_parallel, limiter)
+    _write_report(Path(report), source, attendees, total, max_parallel, rate, limiter, batch)
+
+    ok = [a for a in attendees if a.status == "ok"]
+    failed = [a for a in attendees if a.status != "ok"]
+    click.echo(f"\nProvisioned {len(ok)}/{len(attendees)} attendee(s) in {total:.2f}s"
+               f" ({submissions / total:.1f} submissions/s, throttled {limiter.waited:.2f}s)")
+    click.echo(f"Report: {report}")
+    if not failed:
+        _FAILED_FILE.unlink(missing_ok=True)
+        return
+    click.echo(f"\n{'Attendee':<16} {'Status':<8} {'Step':<18} Error")
+    for a in failed:
+        error = _last_line(a.output) if a.status == "failed" else "-"
+        click.echo(f"{a.name:<16} {a.status:<8} {a.step or '-':<18} {error}")
+    _FAILED_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _FAILED_FILE.write_text("".join(f"{a.name},{a.user}\n" if a.user else f"{a.name}\n"
+                                        for a in failed))
+    click.echo(f"\nRetry them with: scc-fleet {source} {_FAILED_FILE}", err=True)
+    sys.exit(1)
@@ -0,0 +1,321 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-gc`` -- find and drop leftover demo databases and roles.
+
+``scc-cleanup`` and ``scc-cleanup-role`` drop the one database and role
+named in ``.env``.  After a workshop (see ``scc-fleet``) the account
+holds one ``*_CROWD_COUNTER_DB`` and one ``*_SCC_ACCESS`` per attendee.
+``scc-gc`` lists them with ``SHOW ... LIKE`` (``sql/gc/show.sql``), keeps
+the ones younger than ``--older-than`` and the ones ``.env`` still points
+at, shows the candidates and, once confirmed, drops them:
+
+* databases first, then roles -- the order ``cleanup.sql`` and
+  ``cleanup_role.sql`` run in.  A role that owns a database being kept,
+  or one that could not be dropped, is left alone;
+* in batches of ``--batch-size`` objects per ``snow sql`` submission,
+  with up to ``--max-parallel`` batches running at once.
+
+A batch stops at its first failing statement, so after dropping the
+objects are listed again and each candidate is recorded as ``dropped``
+or ``failed`` (``skipped`` for held-back roles) in an append-only JSON
+lines audit log.
+
+Every ``snow`` call goes to whatever ``snow`` is first on ``PATH``, so
+the whole cycle can be exercised against a stub executable.
+"""
+
+import getpass
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import click
+
+from smart_crowd_counter.cli import (
+    _env_file_option,
+    _get_sql_dir,
+    _require_env,
+    _sql_dir_option,
+)
+from smart_crowd_counter.daemon import DaemonCommand
+from smart_crowd_counter.render import rendered_sql, snow_sql_command
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*$")
+_AGE = re.compile(r"^(\d+)([mhdw])$")
+_AGE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+# kind -> (SHOW keyword, drop script, template variable)
+_KINDS = {
+    "database": ("DATABASES", "gc/drop_databases.sql", "databases"),
+    "role": ("ROLES", "gc/drop_roles.sql", "roles"),
+}
+
+
+@dataclass
+class Candidate:
+    """A database or role matched by name pattern."""
+
+    kind: str
+    name: str
+    owner: str
+    created_on: datetime
+    status: str = "candidate"
+    batch: int | None = None
+
+
+def parse_age(value: str) -> timedelta:
+    """Parse ``30m``, ``12h``, ``7d`` or ``2w``."""
+    found = _AGE.match(value.strip())
+    if not found:
+        raise click.BadParameter(f"expected a number and m/h/d/w (e.g. 7d), got '{value}'",
+                                 param_hint="--older-than")
+    return timedelta(**{_AGE_UNITS[found[2]]: int(found[1])})
+
+
+def _age(created_on: datetime, now: datetime) -> str:
+    seconds = (now - created_on).total_seconds()
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return "<1m"
+
+
+def _snow(sql_path: Path, variables: dict, connection: str,
+          json_output: bool = False) -> subprocess.CompletedProcess:
+    cmd = snow_sql_command(rendered_sql(sql_path, variables), connection)
+    if json_output:
+        cmd += ["--format", "json"]
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def _rows(output: str) -> list[dict]:
+    """Rows of the SHOW in ``snow sql --format json`` output (one or many results)."""
+    data = json.loads(output or "[]")
+    results = data if data and all(isinstance(r, list) for r in data) else [data]
+    return [row for result in results for row in result
+            if isinstance(row, dict) and "name" in row and "created_on" in row]
+
+
+def discover(kind: str, pattern: str, admin_role: str, sql_dir: Path,
+             connection: str) -> list[Candidate]:
+    """List the ``kind`` objects whose name is LIKE ``pattern``."""
+    result = _snow(sql_dir / "gc" / "show.sql",
+                   {"admin_role": admin_role, "kind": _KINDS[kind][0], "pattern": pattern},
+                   connection, json_output=True)
+    if result.returncode != 0:
+        raise click.ClickException(f"SHOW {_KINDS[kind][0]} failed:\n{result.stderr.strip()}")
+    try:
+        rows = _rows(result.stdout)
+    except ValueError as e:
+        raise click.ClickException(f"SHOW {_KINDS[kind][0]} returned no JSON: {e}") from e
+    found = []
+    for row in rows:
+        created = datetime.fromisoformat(str(row["created_on"]).replace(" ", "T", 1))
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+        found.append(Candidate(kind, row["name"], row.get("owner") or "", created))
+    return found
+
+
+def _drop_batch(kind: str, batch: list[Candidate], admin_role: str, sql_dir: Path,
+                connection: str) -> tuple[int, float, str]:
+    _, sql_file, variable = _KINDS[kind]
+    started = time.perf_counter()
+    result = _snow(sql_dir / sql_file, {
+        "admin_role": admin_role,
+        variable: [{"name": c.name, "owner": c.owner} for c in batch],
+    }, connection)
+    return result.returncode, time.perf_counter() - started, result.stdout + result.stderr
+
+
+def drop(kind: str, candidates: list[Candidate], admin_role: str, sql_dir: Path,
+         connection: str, batch_size: int, max_parallel: int, t0: float) -> None:
+    """Drop ``candidates`` in batches, up to ``max_parallel`` submissions at once.
+
+    Each candidate's status is set from its batch's outcome; see :func:`verify`.
+    """
+    batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        futures = []
+        for number, batch in enumerate(batches, 1):
+            for c in batch:
+                c.batch = number
+            futures.append(pool.submit(_drop_batch, kind, batch, admin_role, sql_dir,
+                                       connection))
+        for number, (batch, future) in enumerate(zip(batches, futures), 1):
+            returncode, seconds, output = future.result()
+            status = "ok" if returncode == 0 else "failed"
+            for c in batch:
+                c.status = "dropped" if returncode == 0 else "failed"
+            click.echo(f"[{time.perf_counter() - t0:6.2f}s] {status:<6} {kind} batch {number}"
+                       f"/{len(batches)}: {len(batch)} object(s) ({seconds:.2f}s)")
+            if returncode != 0:
+                click.echo(output.rstrip(), err=True)
+
+
+def verify(kind: str, pattern: str, dropped: list[Candidate], admin_role: str, sql_dir: Path,
+           connection: str) -> None:
+    """List ``kind`` again and mark every candidate still present as failed.
+
+    A failed batch stops at its first error, so objects before it are gone
+    and the rest are not; without a listing, batch outcomes stand.
+    """
+    try:
+        remaining = {c.name for c in discover(kind, pattern, admin_role, sql_dir, connection)}
+    except click.ClickException as e:
+        click.echo(f"Could not verify the {kind} drops: {e.message}", err=True)
+        return
+    for c in dropped:
+        c.status = "failed" if c.name in remaining else "dropped"
+
+
+def _audit(path: Path, candidates: list[Candidate], connection: str, admin_role: str) -> None:
+    stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    user = getpass.getuser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as log:
+        for c in candidates:
+            log.write(json.dumps({
+                "at": stamp,
+                "command": "scc-gc",
+                "user": user,
+                "connection": connection,
+                "admin_role": admin_role,
+                "kind": c.kind,
+                "name": c.name,
+                "owner": c.owner,
+                "created_on": c.created_on.isoformat(),
+                "batch": c.batch,
+                "status": c.status,
+            }) + "\n")
+
+
+@click.command(cls=DaemonCommand)
+@click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
+@click.option("--database-like", default="%_CROWD_COUNTER_DB", show_default=True,
+              help="SHOW DATABASES LIKE pattern")
+@click.option("--role-like", default="%_SCC_ACCESS", show_default=True,
+              help="SHOW ROLES LIKE pattern")
+@click.option("--skip-roles", is_flag=True, help="Only collect databases")
+@click.option("--older-than", default="1d", show_default=True,
+              help="Only objects created at least this long ago (30m, 12h, 7d, 2w)")
+@click.option("--keep", "keep", multiple=True, metavar="NAME",
+              help="Never drop this database or role (repeatable)")
+@click.option("--connection", help="Snow CLI connection (default: .env's)")
+@click.option("--batch-size", default=25, show_default=True, type=click.IntRange(1),
+              help="Objects dropped per snow sql submission")
+@click.option("--max-parallel", default=4, show_default=True, type=click.IntRange(1),
+              help="Maximum submissions running at once")
+@click.option("--audit-log", default=".snow-utils/scc-gc-audit.jsonl", show_default=True,
+              type=click.Path(dir_okay=False), help="JSON lines log appended for every drop")
+@click.option("--yes", is_flag=True, help="Drop without asking for confirmation")
+@click.option("--dry-run", is_flag=True, help="List the candidates without dropping anything")
+@_env_file_option
+@_sql_dir_option
+def gc(admin_role: str, database_like: str, role_like: str, skip_roles: bool,
+       older_than: str, keep: tuple[str, ...], connection: str | None, batch_size: int,
+       max_parallel: int, audit_log: str, yes: bool, dry_run: bool, env_file: str | None,
+       sql_dir: str | None) -> None:
+    """Find demo databases and roles by name and age, and drop them.
+
+    Lists databases LIKE --database-like and roles LIKE --role-like
+    created more than --older-than ago, leaving out --keep names and the
+    DEMO_DATABASE/DEMO_ROLE in .env. After confirmation, drops the
+    databases and then the roles in parallel batches and appends the
+    outcome for every object to the audit log.
+    """
+    max_age = parse_age(older_than)
+    for option, pattern in (("--database-like", database_like), ("--role-like", role_like)):
+        if "'" in pattern or not pattern.strip("%_"):
+            raise click.BadParameter(f"refusing pattern '{pattern}'", param_hint=option)
+    env = _require_env(*([] if connection else ["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]),
+                       env_file=env_file)
+    connection = connection or env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]
+    in_use = {v.upper() for v in (os.environ.get("DEMO_DATABASE"), os.environ.get("DEMO_ROLE"))
+              if v}
+    kept = {name.upper() for name in keep} | in_use
+    sql_path = _get_sql_dir(sql_dir)
+    for sql_file in ("gc/show.sql", "gc/drop_databases.sql", "gc/drop_roles.sql"):
+        if not (sql_path / sql_file).exists():
+            click.echo(f"SQL file not found: {sql_path / sql_file}", err=True)
+            sys.exit(1)
+
+    patterns = {"database": database_like}
+    if not skip_roles:
+        patterns["role"] = role_like
+    with ThreadPoolExecutor(max_workers=len(patterns)) as pool:
+        found = dict(zip(patterns, pool.map(
+            lambda kind: discover(kind, patterns[kind], admin_role, sql_path, connection),
+            patterns)))
+
+    now = datetime.now(timezone.utc)
+    candidates, held = [], []
+    owned: dict[str, str] = {}  # owner role -> a database being kept
+    for kind in patterns:
+        for c in sorted(found[kind], key=lambda c: c.created_on):
+            if c.name.upper() in kept:
+                held.append((c, "in .env" if c.name.upper() in in_use else "--keep"))
+            elif kind == "role" and c.name.upper() in owned:
+                held.append((c, f"owns kept {owned[c.name.upper()]}"))
+            elif now - c.created_on < max_age:
+                held.append((c, f"younger than {older_than}"))
+            elif not _IDENTIFIER.match(c.name):
+                held.append((c, "not a plain identifier"))
+            else:
+                candidates.append(c)
+                continue
+            if kind == "database":
+                owned[c.owner.upper()] = c.name
+
+    if not candidates:
+        click.echo(f"No {' or '.join(patterns)} candidates older than {older_than}"
+                   f" ({len(held)} kept).")
+        return
+    click.echo(f"{'Kind':<9} {'Name':<40} {'Created':<17} {'Age':>5}  Owner")
+    for c in candidates:
+        click.echo(f"{c.kind:<9} {c.name:<40} {c.created_on:%Y-%m-%d %H:%M}"
+                   f" {_age(c.created_on, now):>5}  {c.owner}")
+    counts = ", ".join(f"{sum(c.kind == k for c in candidates)} {k}(s)" for k in patterns)
+    click.echo(f"\n{counts} older than {older_than}; {len(held)} kept"
+               + (f" ({', '.join(f'{c.name}: {why}' for c, why in held[:5])}"
+                  f"{', ...' if len(held) > 5 else ''})" if held else ""))
+    if dry_run:
+        click.echo(f"Would drop them in batches of {batch_size}, {max_parallel} at once,"
+                   " databases before roles.")
+        return
+    if not yes:
+        click.confirm(f"Drop these {len(candidates)} object(s)?", abort=True)
+
+    t0 = time.perf_counter()
+    databases = [c for c in candidates if c.kind == "database"]
+    roles = [c for c in candidates if c.kind == "role"]
+    if databases:
+        drop("database", databases, admin_role, sql_path, connection, batch_size,
+             max_parallel, t0)
+        verify("database", database_like, databases, admin_role, sql_path, connection)
+    blocked = {c.owner for c in databases if c.status == "failed"}
+    for c in roles:
+        if c.name in blocked:
+            c.status = "skipped"
+    to_drop = [c for c in roles if c.status == "candidate"]
+    if to_drop:
+        drop("role", to_drop, admin_role, sql_path, connection, batch_size, max_parallel, t0)
+        verify("role", role_like, to_drop, admin_role, sql_path, connection)
+    _audit(Path(audit_log), candidates, connection, admin_role)
+
+    dropped = sum(c.status == "dropped" for c in candidates)
+    click.echo(f"\nDropped {dropped}/{len(candidates)} object(s) in"
+               f" {time.perf_counter() - t0:.2f}s. Audit log: {audit_log}")
+    problems = [c for c in candidates if c.status != "dropped"]
+    if problems:
+        for c in problems:
+            reason = ("owns a database that was not dropped" if c.status == "skipped"
+                      else "still exists")
+            click.echo(f"  {c.status:<8} {c.kind:<9} {c.name} ({reason})", err=True)
+        sys.exit(1)
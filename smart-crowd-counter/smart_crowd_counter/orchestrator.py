@@ -0,0 +1,305 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-up`` -- provision the whole demo as a concurrent DAG of SQL steps.
+
+``scc-create-warehouse``, ``scc-create-role`` and ``scc-setup`` each load
+``.env`` and spawn ``snow`` on their own, one after another.  ``scc-up``
+loads ``.env`` once and runs finer-grained steps (``sql/up/*.sql`` plus
+``sql/setup.sql``) as soon as their dependencies are done:
+
+    role ──────┬──> database ──> setup
+               └──> warehouse_grants
+    warehouse ─┘
+
+Independent steps (role and warehouse, then database and warehouse
+grants) run in parallel.  On the first failure no further steps are
+started, running ones are allowed to finish, and the rest are reported
+as skipped.  A per-step timing report is written as JSON.
+
+``--batch`` trades the concurrency for a single round trip: every step
+is rendered locally and the scripts are concatenated, in dependency
+order, into one ``snow sql`` submission.
+
+Steps spawn whatever ``snow`` is first on ``PATH``, so the orchestrator
+can be exercised end to end against a stub executable.
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+from smart_crowd_counter import telemetry
+from smart_crowd_counter.cli import (
+    _env_file_option,
+    _get_sql_dir,
+    _require_env,
+    _snow_sql_cmd,
+    _sql_dir_option,
+)
+from smart_crowd_counter.daemon import DaemonCommand
+from smart_crowd_counter.render import combine_rendered, rendered_sql, snow_sql_command
+
+
+@dataclass
+class Step:
+    """One SQL file in the provisioning DAG."""
+
+    name: str
+    sql_file: str
+    variables: dict[str, str]
+    needs: tuple[str, ...] = ()
+    status: str = "pending"
+    started: float | None = None
+    seconds: float | None = None
+    returncode: int | None = None
+    output: str = field(default="", repr=False)
+
+
+def _build_steps(env: dict[str, str], admin_role: str, demo_role: str,
+                 create_warehouse: bool) -> list[Step]:
+    """Return the provisioning DAG for the given .env values and roles."""
+    warehouse = env["SNOWFLAKE_WAREHOUSE"]
+    steps = [
+        Step("role", "up/role.sql", {
+            "admin_role": admin_role,
+            "demo_role": demo_role,
+            "snowflake_user": env["SNOWFLAKE_USER"],
+        }),
+        Step("database", "up/database.sql", {
+            "admin_role": admin_role,
+            "demo_role": demo_role,
+            "database": env["DEMO_DATABASE"],
+        }, needs=("role",)),
+        Step("warehouse_grants", "up/warehouse_grants.sql", {
+            "admin_role": admin_role,
+            "demo_role": demo_role,
+            "warehouse": warehouse,
+        }, needs=("role", "warehouse") if create_warehouse else ("role",)),
+        Step("setup", "setup.sql", {
+            "demo_role": demo_role,
+            "database": env["DEMO_DATABASE"],
+            "schema": env["DEMO_SCHEMA"],
+            "stage": env["DEMO_STAGE"],
+            "ai_model": env["AI_MODEL"],
+        }, needs=("database",)),
+    ]
+    if create_warehouse:
+        steps.insert(1, Step("warehouse", "up/warehouse.sql", {
+            "admin_role": admin_role,
+            "warehouse": warehouse,
+        }))
+    return steps
+
+
+def _waves(steps: list[Step]) -> list[list[str]]:
+    """Group step names into waves that could run concurrently."""
+    done: set[str] = set()
+    remaining = {s.name: s for s in steps}
+    waves = []
+    while remaining:
+        wave = [n for n, s in remaining.items() if set(s.needs) <= done]
+        if not wave:
+            raise click.ClickException(f"Dependency cycle among: {', '.join(remaining)}")
+        waves.append(wave)
+        done.update(wave)
+        for n in wave:
+            del remaining[n]
+    return waves
+
+
+def _run_step(step: Step, sql_dir: Path, connection: str, t0: float) -> Step:
+    step.started = time.perf_counter() - t0
+    with telemetry.step(step.name, needs=list(step.needs)) as span:
+        cmd = _snow_sql_cmd(sql_dir / step.sql_file, step.variables, connection,
+                            traced=span.enabled)
+        result = telemetry.run_snow(cmd, span, capture=True)
+    step.seconds = time.perf_counter() - t0 - step.started
+    step.returncode = result.returncode
+    step.output = result.stdout
+    step.status = "ok" if result.returncode == 0 else "failed"
+    return step
+
+
+def run_dag(steps: list[Step], sql_dir: Path, connection: str, max_parallel: int) -> float:
+    """Run ``steps`` respecting ``needs``; stop scheduling on the first failure.
+
+    Returns the total wall time in seconds.
+    """
+    by_name = {s.name: s for s in steps}
+    t0 = time.perf_counter()
+    failed = False
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        while True:
+            if not failed:
+                for step in steps:
+                    ready = step.status == "pending" and all(
+                        by_name[n].status == "ok" for n in step.needs
+                    )
+                    if ready:
+                        step.status = "running"
+                        click.echo(f"[{time.perf_counter() - t0:6.2f}s] start  {step.name}")
+                        running[pool.submit(_run_step, step, sql_dir, connection, t0)] = step
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                future.result()
+                click.echo(
+                    f"[{time.perf_counter() - t0:6.2f}s] {step.status:<6} {step.name}"
+                    f" ({step.seconds:.2f}s)"
+                )
+                if step.status == "failed":
+                    failed = True
+                    click.echo(step.output.rstrip(), err=True)
+    for step in steps:
+        if step.status == "pending":
+            step.status = "skipped"
+    return time.perf_counter() - t0
+
+
+def run_batch(steps: list[Step], sql_dir: Path, connection: str) -> float:
+    """Run all ``steps`` in dependency order as one ``snow sql`` submission.
+
+    Returns the total wall time in seconds; every step shares the outcome
+    and the batch's wall time.
+    """
+    ordered = _ordered(steps)
+    combined = combine_rendered(
+        [rendered_sql(sql_dir / s.sql_file, s.variables) for s in ordered]
+    )
+    click.echo(f"[  0.00s] start  batch ({', '.join(s.name for s in ordered)})")
+    t0 = time.perf_counter()
+    with telemetry.step("batch", steps=[s.name for s in ordered]) as span:
+        if span.enabled:
+            combined = telemetry.traced_script(combined)
+        result = telemetry.run_snow(snow_sql_command(combined, connection), span, capture=True)
+    total = time.perf_counter() - t0
+    for step in ordered:
+        step.started = 0.0
+        step.seconds = total
+        step.returncode = result.returncode
+        step.status = "ok" if result.returncode == 0 else "failed"
+    click.echo(f"[{total:6.2f}s] {ordered[0].status:<6} batch ({total:.2f}s)")
+    if result.returncode != 0:
+        click.echo(result.stdout.rstrip(), err=True)
+    return total
+
+
+def _ordered(steps: list[Step]) -> list[Step]:
+    by_name = {s.name: s for s in steps}
+    return [by_name[name] for wave in _waves(steps) for name in wave]
+
+
+def _write_report(path: Path, steps: list[Step], total: float, max_parallel: int,
+                  batch: bool = False) -> None:
+    report = {
+        "command": "scc-up",
+        "batch": batch,
+        "max_parallel": max_parallel,
+        "total_seconds": round(total, 3),
+        "steps": [
+            {
+                "name": s.name,
+                "sql_file": s.sql_file,
+                "needs": list(s.needs),
+                "status": s.status,
+                "started_at": None if s.started is None else round(s.started, 3),
+                "seconds": None if s.seconds is None else round(s.seconds, 3),
+                "returncode": s.returncode,
+            }
+            for s in steps
+        ],
+    }
+    if not batch:
+        # Batched steps all carry the one submission's time; no serial sum.
+        report["serial_seconds"] = round(sum(s.seconds or 0 for s in steps), 3)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+@click.command(cls=DaemonCommand)
+@click.option("--admin-role", required=True, help="Admin role (from manifest, NOT .env)")
+@click.option("--demo-role", required=True, help="Demo role to create (from manifest)")
+@click.option("--create-warehouse", is_flag=True,
+              help="Also create SNOWFLAKE_WAREHOUSE (like scc-create-warehouse)")
+@click.option("--max-parallel", default=4, show_default=True, type=click.IntRange(1),
+              help="Maximum steps running at once")
+@click.option("--report", default=".snow-utils/scc-up-report.json", show_default=True,
+              type=click.Path(dir_okay=False), help="Where to write the per-step timing report")
+@click.option("--batch", is_flag=True,
+              help="Send all steps, in dependency order, as one snow sql submission")
+@click.option("--dry-run", is_flag=True, help="Show the execution plan without running it")
+@_env_file_option
+@_sql_dir_option
+def up(admin_role: str, demo_role: str, create_warehouse: bool, max_parallel: int,
+       report: str, batch: bool, dry_run: bool, env_file: str | None,
+       sql_dir: str | None) -> None:
+    """Provision role, database, warehouse grants and schema objects in one go.
+
+    Equivalent to scc-create-warehouse (with --create-warehouse),
+    scc-create-role and scc-setup, but loads .env once and runs
+    independent steps concurrently. Stops scheduling new steps on the
+    first failure and writes a per-step timing report. With --batch all
+    steps go to Snowflake as a single script in one round trip instead.
+    """
+    env = _require_env(
+        "SNOWFLAKE_DEFAULT_CONNECTION_NAME",
+        "SNOWFLAKE_USER",
+        "SNOWFLAKE_WAREHOUSE",
+        "DEMO_DATABASE",
+        "DEMO_SCHEMA",
+        "DEMO_STAGE",
+        "AI_MODEL",
+        env_file=env_file,
+    )
+    connection = env["SNOWFLAKE_DEFAULT_CONNECTION_NAME"]
+    sql_path = _get_sql_dir(sql_dir)
+    steps = _build_steps(env, admin_role, demo_role, create_warehouse)
+
+    for step in steps:
+        if not (sql_path / step.sql_file).exists():
+            click.echo(f"SQL file not found: {sql_path / step.sql_file}", err=True)
+            sys.exit(1)
+
+    if dry_run and batch:
+        click.echo(f"Would run as one submission: snow sql -c {connection} -f <rendered batch>")
+        for step in _ordered(steps):
+            click.echo(f"  {sql_path / step.sql_file}")
+        return
+    if dry_run:
+        click.echo("Would run (steps in the same wave run concurrently):")
+        by_name = {s.name: s for s in steps}
+        for i, wave in enumerate(_waves(steps), 1):
+            for name in wave:
+                click.echo(f"  wave {i}: snow sql -c {connection} -f {sql_path / by_name[name].sql_file}")
+        return
+
+    if batch:
+        total = run_batch(steps, sql_path, connection)
+    else:
+        total = run_dag(steps, sql_path, connection, max_parallel)
+    _write_report(Path(report), steps, total, max_parallel, batch)
+
+    click.echo("")
+    click.echo(f"{'Step':<18} {'Status':<8} {'Start':>7} {'Seconds':>8}")
+    for s in steps:
+        start = f"{s.started:.2f}" if s.started is not None else "-"
+        secs = f"{s.seconds:.2f}" if s.seconds is not None else "-"
+        click.echo(f"{s.name:<18} {s.status:<8} {start:>7} {secs:>8}")
+    if batch:
+        click.echo(f"Total {total:.2f}s (one submission)")
+    else:
+        click.echo(f"Total {total:.2f}s (serial would be ~{sum(s.seconds or 0 for s in steps):.2f}s)")
+    click.echo(f"Report: {report}")
+
+    failed = [s for s in steps if s.status == "failed"]
+    if failed:
+        click.echo(f"Command failed with exit code {failed[0].returncode}", err=True)
+        sys.exit(failed[0].returncode)
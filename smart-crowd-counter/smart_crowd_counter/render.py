@@ -0,0 +1,83 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Local rendering of ``--!jinja`` SQL files, with a render cache.
+
+``snow sql --enable-templating ALL --variable ...`` used to render every
+file inside snowflake-cli.  The commands now render locally and pass the
+result with ``--enable-templating NONE``.  Rendered files are cached in
+``.snow-utils/rendered/`` under a key built from the file's path, mtime
+and size and a hash of the variables, so an unchanged step reuses its
+rendered copy without importing Jinja.
+
+:func:`combine_rendered` concatenates several rendered files into one
+multi-statement script; ``scc-up --batch`` submits that in a single
+``snow sql`` round trip.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+_RENDER_DIR = Path(".snow-utils") / "rendered"
+
+
+def render_sql(sql_path: Path, variables: dict[str, str]) -> str:
+    """Render a ``--!jinja`` SQL file the way ``snow sql --enable-templating`` does."""
+    from jinja2 import Environment, StrictUndefined
+
+    text = sql_path.read_text()
+    first, _, rest = text.partition("\n")
+    if first.strip() == "--!jinja":
+        text = rest
+    env = Environment(undefined=StrictUndefined, keep_trailing_newline=True)
+    return env.from_string(text).render(**variables)
+
+
+def _write_atomic(target: Path, text: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(text)
+    tmp.replace(target)
+
+
+def rendered_sql(sql_path: Path, variables: dict[str, str]) -> Path:
+    """Return a rendered copy of ``sql_path``, rendering only on a cache miss."""
+    stat = sql_path.stat()
+    key = hashlib.sha256(json.dumps(
+        [str(sql_path.resolve()), stat.st_mtime_ns, stat.st_size, sorted(variables.items())]
+    ).encode()).hexdigest()[:16]
+    target = _RENDER_DIR / f"{sql_path.stem}-{key}.sql"
+    if not target.exists():
+        _write_atomic(target, render_sql(sql_path, variables))
+    return target
+
+
+def combine_rendered(rendered: list[Path]) -> Path:
+    """Concatenate rendered files into one multi-statement script."""
+    parts = []
+    for path in rendered:
+        text = path.read_text().rstrip()
+        if not text.endswith(";"):
+            text += ";"
+        parts.append(f"-- >>> {path.stem.rsplit('-', 1)[0]}.sql\n{text}\n")
+    combined = "\n".join(parts)
+    key = hashlib.sha256(combined.encode()).hexdigest()[:16]
+    target = _RENDER_DIR / f"batch-{key}.sql"
+    if not target.exists():
+        _write_atomic(target, combined)
+    return target
+
+
+def snow_sql_command(rendered: Path, connection: str) -> list[str]:
+    """Build the ``snow sql`` command line for an already rendered file."""
+    return [
+        "snow",
+        "sql",
+        "-c",
+        connection,
+        "-f",
+        str(rendered),
+        "--enable-templating",
+        "NONE",
+    ]
@@ -0,0 +1,182 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""``scc-replay`` -- provision the demo from a manifest in one command.
+
+Does what the SKILL.md Replay Flow does step by step, without an agent
+in the loop: parse the manifest (:mod:`smart_crowd_counter.manifest`),
+adapt or reject ``# ADAPT:`` values still carrying the sharer's prefix,
+write the values to ``.env``, copy the manifest to ``.snow-utils/``
+marked IN_PROGRESS and run ``scc-up``.  Deploying the Streamlit app
+(Step 5) stays a separate step, so the section is left IN_PROGRESS.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import click
+from dotenv import find_dotenv, set_key
+
+from smart_crowd_counter.cli import _env_file_option, _sql_dir_option
+from smart_crowd_counter.daemon import DaemonCommand
+from smart_crowd_counter.manifest import (
+    WORKING_MANIFEST,
+    Manifest,
+    ManifestError,
+    adapt,
+    load,
+    set_status,
+)
+from smart_crowd_counter.orchestrator import up
+
+SKILL = "smart-crowd-counter"
+# .env variable -> **Label:** in the smart-crowd-counter section
+_FIELDS = {
+    "DEMO_DATABASE": "Database",
+    "DEMO_SCHEMA": "Schema",
+    "DEMO_STAGE": "Stage",
+    "AI_MODEL": "AI Model",
+    "DEMO_ROLE": "Demo Role",
+    "SNOWFLAKE_WAREHOUSE": "Warehouse",
+}
+_REQUIRED = ("DEMO_DATABASE", "DEMO_SCHEMA", "DEMO_STAGE", "AI_MODEL", "DEMO_ROLE")
+
+
+def _fail(message: str) -> None:
+    click.echo(message, err=True)
+    sys.exit(1)
+
+
+def _parse_renames(renames: tuple[str, ...]) -> dict[str, str]:
+    parsed = {}
+    for item in renames:
+        old, sep, new = item.partition("=")
+        if not sep or not old.strip() or not new.strip():
+            raise click.BadParameter(f"expected OLD=NEW, got '{item}'", param_hint="--rename")
+        parsed[old.strip()] = new.strip()
+    return parsed
+
+
+def _env_values(manifest: Manifest) -> tuple[str, dict[str, str]]:
+    """Return the admin role and the .env values the manifest provides."""
+    block = manifest.block(SKILL)
+    if block is None:
+        raise ManifestError(f"{manifest.path}: no <!-- START -- {SKILL} --> section")
+    values = {env: block.get(label) for env, label in _FIELDS.items() if block.get(label)}
+    missing = [f"**{_FIELDS[env]}:**" for env in _REQUIRED if env not in values]
+    if missing:
+        raise ManifestError(f"{manifest.where(block.start)}: {SKILL} section has no"
+                            f" {', '.join(missing)}")
+    admin_roles = manifest.sections.get("admin_role")
+    admin_role = (admin_roles.values.get(SKILL) if admin_roles else None) or block.get("Admin Role")
+    if not admin_role:
+        raise ManifestError(f"{manifest.path}: no admin role (## admin_role or **Admin Role:**)")
+    return admin_role, values
+
+
+def _write_env(values: dict[str, str], env_file: str | None) -> str:
+    path = env_file or find_dotenv(usecwd=True) or ".env"
+    if not os.path.exists(path):
+        example = Path(__file__).parent.parent / ".env.example"
+        if example.is_file():
+            shutil.copyfile(example, path)
+        else:
+            Path(path).touch()
+        os.chmod(path, 0o600)
+    for key, val in values.items():
+        set_key(path, key, val, quote_mode="never")
+    return path
+
+
+def _write_manifest(manifest: Manifest) -> None:
+    WORKING_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    WORKING_MANIFEST.parent.chmod(0o700)
+    WORKING_MANIFEST.write_text(manifest.text)
+    WORKING_MANIFEST.chmod(0o600)
+
+
+@click.command(cls=DaemonCommand)
+@click.argument("manifest_path", metavar="MANIFEST", required=False,
+                type=click.Path(dir_okay=False))
+@click.option("--as-user", help="Swap the shared_by prefix of # ADAPT: values for this name")
+@click.option("--rename", "renames", multiple=True, metavar="OLD=NEW",
+              help="Replace one # ADAPT: value everywhere in the manifest (repeatable)")
+@click.option("--keep-originals", is_flag=True,
+              help="Use # ADAPT: values as shared, even with the sharer's prefix")
+@click.option("--connection", help="Snow CLI connection to write to .env (default: keep .env's)")
+@click.option("--create-warehouse", is_flag=True,
+              help="Also create the manifest's warehouse (like scc-up --create-warehouse)")
+@click.option("--batch", is_flag=True, help="Send all steps as one snow sql submission")
+@click.option("--dry-run", is_flag=True, help="Show values and steps without writing or running")
+@_env_file_option
+@_sql_dir_option
+@click.pass_context
+def replay(ctx: click.Context, manifest_path: str | None, as_user: str | None,
+           renames: tuple[str, ...], keep_originals: bool, connection: str | None,
+           create_warehouse: bool, batch: bool, dry_run: bool, env_file: str | None,
+           sql_dir: str | None) -> None:
+    """Provision the demo from MANIFEST with no agent in the loop.
+
+    MANIFEST defaults to .snow-utils/snow-utils-manifest.md; a shared
+    manifest is copied there (adapted) before anything runs. Values
+    marked # ADAPT: that still carry the shared_by prefix are rejected
+    unless --as-user, --rename or --keep-originals says what to do.
+    Runs scc-up with the manifest's roles; deploy the app afterwards.
+
+    \b
+    Example:
+      scc-replay smart-crowd-counter-manifest.md --as-user CAROL --rename CAROL_WH=MY_WH
+    """
+    source = Path(manifest_path) if manifest_path else WORKING_MANIFEST
+    try:
+        manifest = load(source)
+        if as_user or renames:
+            manifest = adapt(manifest, as_user, _parse_renames(renames))
+        stale = [] if keep_originals else manifest.unadapted()
+        if stale:
+            lines = [f"{source}: {len(stale)} # ADAPT: value(s) still use the shared_by"
+                     f" prefix {manifest.shared_by}:"]
+            lines += [f"  line {m.line}: {m.label} = {m.value}  (# ADAPT: {m.note})" for m in stale]
+            lines.append("Pass --as-user <YOU> to swap the prefix, --rename OLD=NEW for single"
+                         " values, or --keep-originals to use them as shared.")
+            _fail("\n".join(lines))
+        admin_role, values = _env_values(manifest)
+        status = manifest.block(SKILL).status
+    except ManifestError as e:
+        _fail(f"Cannot replay: {e}")
+
+    if status == "COMPLETE":
+        _fail(f"{SKILL} is already COMPLETE in {source}. Use the Re-run Flow or scc-cleanup"
+              " first.")
+    if status not in (None, "REMOVED", "IN_PROGRESS"):
+        _fail(f"Unknown {SKILL} status '{status}' in {source}")
+    if (source.resolve() != WORKING_MANIFEST.resolve() and WORKING_MANIFEST.exists()
+            and WORKING_MANIFEST.read_text() != manifest.text):
+        _fail(f"{WORKING_MANIFEST} already exists and differs from {source}. Replay it with"
+              " `scc-replay` (no argument) or move it aside first.")
+
+    if connection:
+        values["SNOWFLAKE_DEFAULT_CONNECTION_NAME"] = connection
+    click.echo(f"Replaying {SKILL} from {source}"
+               f"{' (resuming)' if status == 'IN_PROGRESS' else ''}:")
+    click.echo(f"  {'ADMIN_ROLE':<34} {admin_role}")
+    for key, val in values.items():
+        click.echo(f"  {key:<34} {val}")
+
+    if dry_run:
+        click.echo(f"Would write these values to .env and the manifest to {WORKING_MANIFEST}")
+        os.environ.update(values)
+    else:
+        # scc-up reloads .env with override=True, so the values must land there.
+        env_file = _write_env(values, env_file)
+        click.echo(f"Updated {env_file}")
+        _write_manifest(set_status(manifest, SKILL, "IN_PROGRESS"))
+
+    ctx.invoke(up, admin_role=admin_role, demo_role=values["DEMO_ROLE"],
+               create_warehouse=create_warehouse, batch=batch, dry_run=dry_run,
+               env_file=env_file, sql_dir=sql_dir)
+
+    if not dry_run:
+        click.echo(f"\n{SKILL} left IN_PROGRESS in {WORKING_MANIFEST}: deploy the Streamlit"
+                   " app (SKILL.md Step 5) to complete it.")
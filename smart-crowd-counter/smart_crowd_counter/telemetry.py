@@ -0,0 +1,525 @@
+# Copyright (c) 2026 Kamesh Sampath
+# SPDX-License-Identifier: Apache-2.0
+"""Structured timing spans for the SQL steps the ``scc-*`` commands run.
+
+Every command invocation is one *run*.  Each SQL step it sends to
+``snow sql`` emits spans, one JSON object per line:
+
+* ``step``      -- wall time of the whole ``snow sql`` call
+* ``spawn``     -- starting the ``snow`` process (fork/exec)
+* ``connect``   -- time outside the statements' server-side window:
+  snowflake-cli start-up, login and exit (derived, ``"derived": true``)
+* ``statement`` -- one per statement, from the session's query history
+* ``command``   -- the whole invocation (total), written last
+
+Per-statement timings come from ``snow sql --format json``: a traced step
+appends one ``EXECUTE IMMEDIATE`` block to the rendered script that
+returns ``INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION()`` (empty, never
+an error, when the session has no current database).  Other result sets
+are echoed as ``a | b`` rows instead of snow's tables.
+
+The history block runs last, so when a statement fails ``snow`` stops
+before it and the failed step records no ``statement`` (or derived
+``connect``) spans.  A follow-up call cannot fill them in, as
+``QUERY_HISTORY_BY_SESSION()`` only sees its own session; look failed
+statements up in Snowsight's query history instead.
+
+Telemetry is opt-in.  ``SCC_TELEMETRY`` picks the sinks, comma
+separated: ``file`` (appends to ``SCC_TELEMETRY_FILE`` or
+``.snow-utils/scc-telemetry.jsonl``), ``console`` (stderr), ``otel``
+(OpenTelemetry, see ``pip install smart-crowd-counter[otel]``; OTLP over
+HTTP when the exporter is installed, the SDK's console exporter
+otherwise) or ``off`` (the default), which runs ``snow`` exactly as
+before.  ``scc-telemetry`` summarizes a run log.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+from smart_crowd_counter.daemon import DaemonCommand
+
+_SINK_ENV = "SCC_TELEMETRY"
+_FILE_ENV = "SCC_TELEMETRY_FILE"
+_DEFAULT_FILE = Path(".snow-utils") / "scc-telemetry.jsonl"
+_SINKS = ("file", "console", "otel", "off")
+_SERVICE = "smart-crowd-counter"
+_MARKER = re.compile(r"^-- >>> (\S+)", re.MULTILINE)
+
+HISTORY_SQL = """-- >>> telemetry
+EXECUTE IMMEDIATE $$
+DECLARE
+  history RESULTSET DEFAULT (SELECT NULL AS query_id LIMIT 0);
+BEGIN
+  history := (
+    SELECT query_id, query_type, query_text, execution_status, start_time, end_time,
+           total_elapsed_time, compilation_time, execution_time,
+           queued_provisioning_time + queued_overload_time AS queued_time, rows_produced
+    FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 10000))
+    WHERE query_text NOT ILIKE '%QUERY_HISTORY_BY_SESSION%'
+    ORDER BY start_time
+  );
+  RETURN TABLE(history);
+EXCEPTION
+  WHEN OTHER THEN
+    RETURN TABLE(history);
+END;
+$$;
+"""
+
+
+@dataclass
+class Span:
+    """One timed span; ``start`` is epoch seconds."""
+
+    kind: str
+    name: str
+    start: float
+    seconds: float
+    status: str = "ok"
+    attrs: dict = field(default_factory=dict)
+    run: str = ""
+    span: str = field(default_factory=lambda: os.urandom(8).hex())
+    parent: str | None = None
+
+    def to_json(self) -> dict:
+        return {
+            "run": self.run,
+            "span": self.span,
+            "parent": self.parent,
+            "kind": self.kind,
+            "name": self.name,
+            "start": round(self.start, 3),
+            "seconds": round(self.seconds, 3),
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+def sinks() -> list[str]:
+    """Sinks named by ``SCC_TELEMETRY``; empty when telemetry is off."""
+    names = [s.strip().lower() for s in os.environ.get(_SINK_ENV, "off").split(",")]
+    names = [s for s in names if s]
+    unknown = set(names) - set(_SINKS)
+    if unknown:
+        raise click.BadParameter(f"unknown sink(s) {', '.join(sorted(unknown))};"
+                                 f" choose from {', '.join(_SINKS)}", param_hint=_SINK_ENV)
+    return [] if "off" in names else names
+
+
+def enabled() -> bool:
+    return bool(sinks())
+
+
+def log_file() -> Path:
+    return Path(os.environ.get(_FILE_ENV) or _DEFAULT_FILE)
+
+
+# -- sinks -------------------------------------------------------------------
+
+_tracer = None
+
+
+def _otel_tracer():
+    """Tracer for the ``otel`` sink, or ``False`` when the SDK is missing."""
+    global _tracer
+    if _tracer is None:
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        except ImportError:
+            click.echo("SCC_TELEMETRY=otel needs opentelemetry-sdk"
+                       " (pip install smart-crowd-counter[otel]); skipping it", err=True)
+            _tracer = False
+            return _tracer
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter()
+        except ImportError:
+            exporter = ConsoleSpanExporter()
+        provider = TracerProvider(resource=Resource.create({"service.name": _SERVICE}))
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        _tracer = provider.get_tracer(__name__)
+    return _tracer
+
+
+def _otel_export(spans: list[Span]) -> None:
+    """Replay a finished run's spans, parents first, with their recorded times."""
+    tracer = _otel_tracer()
+    if not tracer:
+        return
+    from opentelemetry import trace
+
+    started = {}
+    depth = {"command": 0, "step": 1}
+    for span in sorted(spans, key=lambda s: (depth.get(s.kind, 2), s.start)):
+        parent = started.get(span.parent)
+        context = trace.set_span_in_context(parent) if parent is not None else None
+        attributes = {f"scc.{k}": v for k, v in span.attrs.items()
+                      if isinstance(v, (str, bool, int, float))}
+        attributes["scc.kind"] = span.kind
+        started[span.span] = otel = tracer.start_span(
+            span.name, context=context, attributes=attributes,
+            start_time=int(span.start * 1e9))
+        if span.status != "ok":
+            otel.set_status(trace.Status(trace.StatusCode.ERROR))
+    for span in spans:
+        started[span.span].end(end_time=int((span.start + span.seconds) * 1e9))
+
+
+def _emit(spans: list[Span]) -> None:
+    names = sinks()
+    lines = "".join(json.dumps(s.to_json()) + "\n" for s in spans)
+    if "file" in names:
+        path = log_file()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a") as log:
+                log.write(lines)
+        except OSError as e:
+            # Telemetry is informational only; never fail a step over it.
+            click.echo(f"Could not write telemetry to {path}: {e}", err=True)
+    if "console" in names:
+        sys.stderr.write(lines)
+    if "otel" in names:
+        _pending.extend(spans)
+
+
+# -- runs and steps ----------------------------------------------------------
+
+_run: Span | None = None
+_pending: list[Span] = []
+_steps = 0
+
+
+@contextmanager
+def command(name: str):
+    """Group every step run inside into one run and emit its total at the end.
+
+    Nested calls join the outer run.  Runs without steps leave no trace.
+    """
+    global _run, _steps
+    if _run is not None or not enabled():
+        yield
+        return
+    _run = Span("command", name, time.time(), 0.0)
+    _run.run = _run.span
+    _steps = 0
+    t0 = time.perf_counter()
+    try:
+        yield
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            _run.status = "error"
+        raise
+    except BaseException:
+        _run.status = "error"
+        raise
+    finally:
+        root, _run = _run, None
+        root.seconds = time.perf_counter() - t0
+        root.attrs["steps"] = _steps
+        if _steps:
+            _emit([root])
+            _flush_otel()
+
+
+def _flush_otel() -> None:
+    spans, _pending[:] = list(_pending), []
+    if spans:
+        _otel_export(spans)
+
+
+class Step:
+    """Spans of one SQL step; a no-op when telemetry is off."""
+
+    def __init__(self, name: str, backend: str, **attrs):
+        self.enabled = enabled()
+        self.span = Span("step", name, time.time(), 0.0, attrs={"backend": backend, **attrs})
+        root = _run
+        self.span.run = root.run if root else self.span.span
+        self.span.parent = root.span if root else None
+        self.children: list[Span] = []
+
+    def add(self, kind: str, name: str, start: float, seconds: float,
+            status: str = "ok", **attrs) -> None:
+        self.children.append(Span(kind, name, start, max(seconds, 0.0), status, attrs,
+                                  run=self.span.run, parent=self.span.span))
+
+    def fail(self, returncode: int) -> None:
+        self.span.status = "error"
+        self.span.attrs["returncode"] = returncode
+
+    def finish(self, seconds: float) -> None:
+        global _steps
+        if not self.enabled:
+            return
+        self.span.seconds = seconds
+        _steps += 1
+        _emit(self.children + [self.span])
+        if _run is None:
+            _flush_otel()
+
+
+@contextmanager
+def step(name: str, backend: str = "snow", **attrs):
+    """Time one SQL step; the yielded :class:`Step` collects its child spans."""
+    current = Step(name, backend, **attrs)
+    t0 = time.perf_counter()
+    try:
+        yield current
+    except SystemExit as e:
+        if e.code not in (None, 0) and current.span.status == "ok":
+            current.fail(e.code if isinstance(e.code, int) else 1)
+        raise
+    except BaseException:
+        current.span.status = "error"
+        raise
+    finally:
+        current.finish(time.perf_counter() - t0)
+
+
+# -- snow sql ----------------------------------------------------------------
+
+
+def traced_script(rendered: Path) -> Path:
+    """``rendered`` plus the query-history block, next to it (cached)."""
+    target = rendered.with_name(f"{rendered.stem}.traced.sql")
+    if not target.exists() or target.stat().st_mtime_ns < rendered.stat().st_mtime_ns:
+        text = rendered.read_text().rstrip()
+        if not text.endswith(";"):
+            text += ";"
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(f"{text}\n\n{HISTORY_SQL}")
+        tmp.replace(target)
+    return target
+
+
+def _timestamp(value) -> float | None:
+    from datetime import datetime, timezone
+
+    try:
+        stamp = datetime.fromisoformat(str(value).replace(" ", "T", 1))
+    except ValueError:
+        return None
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp.timestamp()
+
+
+def _results(output: str) -> list[list[dict]]:
+    data = json.loads(output or "[]")
+    if data and all(isinstance(r, list) for r in data):
+        return data
+    return [data]
+
+
+def _is_history(rows: list[dict]) -> bool:
+    return not rows or all(isinstance(r, dict) and "TOTAL_ELAPSED_TIME" in r for r in rows)
+
+
+def _ms(row: dict, key: str) -> float | None:
+    value = row.get(key)
+    return None if value is None else round(float(value) / 1000, 3)
+
+
+def record_statements(current: Step, rows: list[dict], started: float, wall: float) -> None:
+    """Add ``statement`` spans from query-history rows and the derived ``connect`` span."""
+    window = []
+    sql_file = None
+    for row in rows:
+        text = str(row.get("QUERY_TEXT") or "")
+        marker = _MARKER.search(text)
+        if marker:
+            sql_file = marker.group(1)
+        start = _timestamp(row.get("START_TIME"))
+        seconds = _ms(row, "TOTAL_ELAPSED_TIME") or 0.0
+        if start is not None:
+            window.append((start, start + seconds))
+        status = str(row.get("EXECUTION_STATUS") or "SUCCESS").lower()
+        current.add(
+            "statement", str(row.get("QUERY_TYPE") or "UNKNOWN"),
+            start if start is not None else started, seconds,
+            "ok" if status == "success" else "error",
+            query_id=row.get("QUERY_ID"),
+            text=" ".join(line for line in text.splitlines()
+                          if not line.lstrip().startswith("--")).strip()[:200],
+            **({"file": sql_file} if sql_file else {}),
+            compile_seconds=_ms(row, "COMPILATION_TIME"),
+            execute_seconds=_ms(row, "EXECUTION_TIME"),
+            queued_seconds=_ms(row, "QUEUED_TIME"),
+            rows=row.get("ROWS_PRODUCED"),
+        )
+    server = max(e for _, e in window) - min(s for s, _ in window) if window else 0.0
+    current.add("connect", "snow start-up and login", started, wall - server, derived=True,
+                statements=len(rows))
+
+
+def run_snow(cmd: list[str], current: Step, capture: bool = False) -> subprocess.CompletedProcess:
+    """Run a ``snow sql`` command line, recording spawn, connect and statement spans.
+
+    ``cmd`` must point at a :func:`traced_script` when ``current`` is
+    enabled.  With ``capture`` the output (result rows and stderr) is
+    returned in ``stdout`` instead of being printed.
+    """
+    if not current.enabled:
+        if capture:
+            return subprocess.run(cmd, env=os.environ, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, text=True)
+        return subprocess.run(cmd, env=os.environ)
+
+    started, t0 = time.time(), time.perf_counter()
+    process = subprocess.Popen(cmd + ["--format", "json"], env=os.environ, text=True,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE if capture else None)
+    current.add("spawn", cmd[0], started, time.perf_counter() - t0, pid=process.pid)
+    stdout, stderr = process.communicate()
+    wall = time.perf_counter() - t0
+
+    lines = []
+    try:
+        results = _results(stdout)
+    except ValueError:
+        results = []
+        lines.append(stdout.rstrip())
+    history = results.pop() if results and _is_history(results[-1]) else None
+    for rows in results:
+        for row in rows:
+            values = row.values() if isinstance(row, dict) else [row]
+            lines.append("  " + " | ".join(str(v) for v in values))
+    if history:
+        record_statements(current, history, started, wall)
+    if process.returncode != 0:
+        current.fail(process.returncode)
+
+    output = "\n".join(line for line in lines if line)
+    if capture:
+        return subprocess.CompletedProcess(cmd, process.returncode,
+                                           output + ("\n" if output else "") + (stderr or ""))
+    if output:
+        click.echo(output)
+    return subprocess.CompletedProcess(cmd, process.returncode)
+
+
+# -- scc-telemetry -----------------------------------------------------------
+
+
+def load(path: Path) -> list[dict]:
+    """Spans in a run log; unreadable lines are skipped."""
+    spans = []
+    with path.open() as log:
+        for line in log:
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def summarize(spans: list[dict], top: int) -> dict:
+    """Slowest steps (by total seconds) and statements across ``spans``."""
+    steps = defaultdict(list)
+    phases = defaultdict(lambda: defaultdict(float))
+    names = {s["span"]: s["name"] for s in spans if s["kind"] == "step"}
+    for s in spans:
+        if s["kind"] == "step":
+            steps[s["name"]].append(s)
+        elif s["kind"] in ("spawn", "connect", "statement") and s["parent"] in names:
+            phases[names[s["parent"]]][s["kind"]] += s["seconds"]
+    step_rows = sorted((
+        {
+            "step": name,
+            "runs": len(items),
+            "failed": sum(i["status"] != "ok" for i in items),
+            "total": sum(i["seconds"] for i in items),
+            "max": max(i["seconds"] for i in items),
+            **{kind: phases[name].get(kind, 0.0) for kind in ("spawn", "connect", "statement")},
+        } for name, items in steps.items()
+    ), key=lambda r: r["total"], reverse=True)
+    statements = sorted((s for s in spans if s["kind"] == "statement"),
+                        key=lambda s: s["seconds"], reverse=True)[:top]
+    return {
+        "steps": step_rows[:top],
+        "statements": [
+            {
+                "step": names.get(s["parent"], "?"),
+                "file": s["attrs"].get("file"),
+                "type": s["name"],
+                "seconds": s["seconds"],
+                "query_id": s["attrs"].get("query_id"),
+                "text": s["attrs"].get("text", ""),
+            } for s in statements
+        ],
+    }
+
+
+@click.command(cls=DaemonCommand)
+@click.option("--log", "log_path", default=None, type=click.Path(dir_okay=False),
+              help=f"Run log to read (default: ${_FILE_ENV} or {_DEFAULT_FILE})")
+@click.option("--run", "run_id", default=None, help="Only this run (default: the latest one)")
+@click.option("--all", "all_runs", is_flag=True, help="Aggregate every run in the log")
+@click.option("--top", default=10, show_default=True, type=click.IntRange(1),
+              help="Steps and statements to list")
+@click.option("--json", "as_json", is_flag=True, help="Print the summary as JSON")
+def telemetry(log_path: str | None, run_id: str | None, all_runs: bool, top: int,
+              as_json: bool) -> None:
+    """Summarize a telemetry run log: slowest steps and statements.
+
+    Reads the JSON lines the scc-* commands append while SCC_TELEMETRY
+    includes "file", and reports where the time went: per step the
+    runs, total and maximum seconds split into spawn, connect and
+    statement time, then the slowest individual statements.
+    """
+    path = Path(log_path) if log_path else log_file()
+    if not path.is_file():
+        click.echo(f"No telemetry log at {path}; run an scc-* command with"
+                   f" {_SINK_ENV}=file first.", err=True)
+        sys.exit(1)
+    spans = load(path)
+    commands = [s for s in spans if s["kind"] == "command"]
+    if run_id:
+        spans = [s for s in spans if s["run"].startswith(run_id)]
+    elif not all_runs and commands:
+        run_id = commands[-1]["run"]
+        spans = [s for s in spans if s["run"] == run_id]
+    if not spans:
+        click.echo(f"No spans for run {run_id} in {path}", err=True)
+        sys.exit(1)
+
+    summary = summarize(spans, top)
+    runs = [s for s in spans if s["kind"] == "command"]
+    summary["runs"] = [{"run": s["run"], "command": s["name"], "seconds": s["seconds"],
+                        "status": s["status"]} for s in runs]
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+        return
+
+    for r in summary["runs"][-top:]:
+        click.echo(f"Run {r['run']}: {r['command']} {r['seconds']:.2f}s ({r['status']})")
+    if len(summary["runs"]) > top:
+        click.echo(f"  ... {len(summary['runs']) - top} earlier run(s)")
+    click.echo("")
+    click.echo(f"{'Step':<24} {'Runs':>4} {'Failed':>6} {'Total':>8} {'Max':>8}"
+               f" {'Spawn':>7} {'Connect':>8} {'SQL':>8}")
+    for r in summary["steps"]:
+        click.echo(f"{r['step']:<24} {r['runs']:>4} {r['failed']:>6} {r['total']:>8.2f}"
+                   f" {r['max']:>8.2f} {r['spawn']:>7.2f} {r['connect']:>8.2f}"
+                   f" {r['statement']:>8.2f}")
+    if summary["statements"]:
+        click.echo("")
+        click.echo(f"{'Seconds':>8}  {'Step':<28} {'Type':<10} Statement")
+        for s in summary["statements"]:
+            where = f"{s['step']}:{s['file']}" if s["file"] else s["step"]
+            click.echo(f"{s['seconds']:>8.2f}  {where:<28} {s['type']:<10} {s['text'][:60]}")
+    else:
+        click.echo("\nNo statement timings recorded (did snow sql return its query history?)")
@@ -0,0 +1,44 @@
+--!jinja
+-- Smart Crowd Counter - Batch Analysis (scc-analyze --backend cortex)
+-- Uploads one batch of local images to a temporary stage and counts people
+-- and raised hands with the same structured AI_COMPLETE call as
+-- REFRESH_SMART_CROWD_COUNTER. Nothing is stored: the stage is dropped
+-- when the session ends and the results are only returned.
+--
+-- Variables: demo_role, database, schema, ai_model,
+--            files (list of {path, folder}; folder keeps names unique)
+
+USE ROLE {{demo_role}};
+USE SCHEMA {{database}}.{{schema}};
+
+CREATE TEMPORARY STAGE SCC_ANALYZE
+  ENCRYPTION = (TYPE = 'SNOWFLAKE_SSE')
+  DIRECTORY = (ENABLE = TRUE);
+
+{% for file in files %}
+PUT 'file://{{ file.path }}' @SCC_ANALYZE/{{ file.folder }}/ AUTO_COMPRESS = FALSE;
+{% endfor %}
+
+ALTER STAGE SCC_ANALYZE REFRESH;
+
+SELECT
+  relative_path,
+  TO_VARCHAR(AI_COMPLETE(
+    '{{ai_model}}',
+    'Count the people in this conference photo and how many of them have a hand raised. '
+    || 'If no people are visible, use zeros.',
+    TO_FILE('@SCC_ANALYZE', relative_path),
+    {},
+    {
+      'type': 'json',
+      'schema': {
+        'type': 'object',
+        'properties': {
+          'total_attendees': {'type': 'integer'},
+          'raised_hands': {'type': 'integer'}
+        },
+        'required': ['total_attendees', 'raised_hands']
+      }
+    }
+  )) AS response
+FROM DIRECTORY(@SCC_ANALYZE);
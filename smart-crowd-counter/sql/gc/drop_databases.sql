@@ -0,0 +1,17 @@
+--!jinja
+-- Smart Crowd Counter - scc-gc: drop a batch of demo databases
+-- Each database is owned by its demo role (sql/up/database.sql), so the
+-- admin role takes ownership first, then drops it with everything in it.
+-- Runs before gc/drop_roles.sql, as cleanup.sql runs before cleanup_role.sql.
+--
+-- Usage (scc-gc renders it with the batch, one entry per database):
+--   --variable admin_role=$ADMIN_ROLE
+--   databases = [{"name": ..., "owner": ...}, ...]
+
+USE ROLE {{admin_role}};
+{% for db in databases %}
+{% if db.owner != admin_role %}
+GRANT OWNERSHIP ON DATABASE {{db.name}} TO ROLE {{admin_role}} REVOKE CURRENT GRANTS;
+{% endif %}
+DROP DATABASE IF EXISTS {{db.name}};
+{% endfor %}
@@ -0,0 +1,17 @@
+--!jinja
+-- Smart Crowd Counter - scc-gc: drop a batch of demo roles
+-- Dropping a role also removes its grants to users, so no REVOKE is
+-- needed (cleanup_role.sql revokes from the one user it knows about).
+-- Run this AFTER gc/drop_databases.sql.
+--
+-- Usage (scc-gc renders it with the batch, one entry per role):
+--   --variable admin_role=$ADMIN_ROLE
+--   roles = [{"name": ..., "owner": ...}, ...]
+
+USE ROLE {{admin_role}};
+{% for role in roles %}
+{% if role.owner != admin_role %}
+GRANT OWNERSHIP ON ROLE {{role.name}} TO ROLE {{admin_role}} REVOKE CURRENT GRANTS;
+{% endif %}
+DROP ROLE IF EXISTS {{role.name}};
+{% endfor %}
@@ -0,0 +1,14 @@
+--!jinja
+-- Smart Crowd Counter - scc-gc discovery
+-- Lists demo databases or roles whose name matches a LIKE pattern.
+-- scc-gc runs it with --format json and filters the rows by created_on.
+--
+-- Usage:
+--   snow sql -f sql/gc/show.sql --format json \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable kind=DATABASES \
+--     --variable pattern=%_CROWD_COUNTER_DB
+
+USE ROLE {{admin_role}};
+SHOW {{kind}} LIKE '{{pattern}}';
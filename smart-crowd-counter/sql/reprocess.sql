@@ -0,0 +1,19 @@
+--!jinja
+-- Smart Crowd Counter - Re-analyze Images
+-- Forces AI_COMPLETE to run again for specific stage images (or all of
+-- them), regardless of whether their ETag changed. New or changed images
+-- are picked up in the same call.
+--
+-- Usage:
+--   snow sql -f sql/reprocess.sql \
+--     --enable-templating ALL \
+--     --variable demo_role=$DEMO_ROLE \
+--     --variable database=$DEMO_DATABASE \
+--     --variable schema=$DEMO_SCHEMA \
+--     --variable paths='["session1.jpg", "session2.png"]'   # or '["*"]' for all
+
+USE ROLE {{demo_role}};
+USE DATABASE {{database}};
+USE SCHEMA {{schema}};
+
+CALL REFRESH_SMART_CROWD_COUNTER(PARSE_JSON('{{paths}}')::ARRAY);
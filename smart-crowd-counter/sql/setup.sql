@@ -1,6 +1,7 @@
 --!jinja
 -- Smart Crowd Counter - Schema Setup
--- Creates schema, stage, and AI-powered view for image analysis
+-- Creates schema, stage, materialized AI results table, refresh procedure,
+-- and the read-only view the app queries
 -- (Database is created by create_role.sql and owned by the demo role)
 --
 -- Prerequisites:
@@ -40,69 +41,219 @@ CREATE STAGE IF NOT EXISTS {{stage}}
   COMMENT = 'Stage for conference session photos';
 
 -- ============================================================================
--- AI-Powered View for Image Analysis
+-- Materialized AI Results
 -- ============================================================================
--- This view processes images using Cortex AISQL to:
--- 1. Count total attendees in each photo
--- 2. Detect raised hands
--- 3. Generate descriptive captions
+-- AI_COMPLETE runs once per image version instead of on every read:
+-- results are stored keyed by relative path + ETag, and
+-- REFRESH_SMART_CROWD_COUNTER() only analyzes images that are new or whose
+-- ETag changed, then drops rows for images no longer on the stage.
 --
 -- Reference: https://docs.snowflake.com/en/user-guide/snowflake-cortex/aisql
 
-CREATE OR REPLACE VIEW SMART_CROWD_COUNTER AS
-WITH image_files AS (
-  -- Get all supported images from the stage directory
-  SELECT
-    relative_path AS name,
-    TO_FILE(CONCAT('@{{database}}.{{schema}}.{{stage}}/', relative_path)) AS file,
-    last_modified
-  FROM DIRECTORY('@{{database}}.{{schema}}.{{stage}}')
-  WHERE LOWER(relative_path) LIKE '%.jpg'
-    OR LOWER(relative_path) LIKE '%.jpeg'
-    OR LOWER(relative_path) LIKE '%.png'
-),
-processed_images AS (
-  -- Analyze each image for attendee count and raised hands
-  SELECT
-    name,
-    file,
-    last_modified,
-    AI_COMPLETE(
-      '{{ai_model}}',
-      'Analyze this image and count people and raised hands. '
-      || 'Return JSON only with this exact structure: '
-      || '{"total_attendees": N, "raised_hands": N, "percentage_with_hands_up": N.NN}. '
-      || 'Calculate percentage as (raised_hands/total_attendees)*100, rounded to 2 decimals. '
-      || 'If no people are visible, return zeros.',
-      file
-    ) AS attendees_count
-  FROM image_files
+CREATE TABLE IF NOT EXISTS SMART_CROWD_COUNTER_RESULTS (
+  name VARCHAR NOT NULL,
+  etag VARCHAR NOT NULL,
+  file_name FILE,
+  last_modified TIMESTAMP_LTZ,
+  caption VARCHAR,
+  raw VARCHAR,
+  total_attendees INTEGER,
+  raised_hands INTEGER,
+  percentage_with_hands_up FLOAT,
+  analyzed_at TIMESTAMP_LTZ,
+  PRIMARY KEY (name)
 )
+COMMENT = 'Cortex AISQL results per stage image (one row per relative path)';
+
+-- Added after the first release; existing rows keep NULL until re-analyzed
+-- and the summary view falls back to the filename and caption for them.
+ALTER TABLE SMART_CROWD_COUNTER_RESULTS ADD COLUMN IF NOT EXISTS event_code VARCHAR;
+ALTER TABLE SMART_CROWD_COUNTER_RESULTS ADD COLUMN IF NOT EXISTS city VARCHAR;
+
+-- Analyze new/changed images and prune deleted ones.
+-- REPROCESS lists relative paths to re-analyze even if unchanged;
+-- ['*'] re-analyzes every image. Returns a short summary string.
+CREATE OR REPLACE PROCEDURE REFRESH_SMART_CROWD_COUNTER(REPROCESS ARRAY DEFAULT ARRAY_CONSTRUCT())
+  RETURNS VARCHAR
+  LANGUAGE SQL
+  EXECUTE AS OWNER
+AS
+$$
+DECLARE
+  analyzed INTEGER DEFAULT 0;
+  removed INTEGER DEFAULT 0;
+BEGIN
+  MERGE INTO SMART_CROWD_COUNTER_RESULTS t
+  USING (
+    WITH pending_images AS (
+      -- Only images that have no result for their current ETag
+      SELECT
+        d.relative_path AS name,
+        d.etag,
+        TO_FILE(CONCAT('@{{database}}.{{schema}}.{{stage}}/', d.relative_path)) AS file,
+        d.last_modified
+      FROM DIRECTORY('@{{database}}.{{schema}}.{{stage}}') d
+      LEFT JOIN SMART_CROWD_COUNTER_RESULTS r
+        ON r.name = d.relative_path AND r.etag = d.etag
+      WHERE (LOWER(d.relative_path) LIKE '%.jpg'
+          OR LOWER(d.relative_path) LIKE '%.jpeg'
+          OR LOWER(d.relative_path) LIKE '%.png')
+        -- Originals kept by the app's upload options are never analyzed
+        AND NOT STARTSWITH(d.relative_path, 'originals/')
+        AND (r.name IS NULL
+          OR ARRAY_CONTAINS(d.relative_path::VARIANT, :REPROCESS)
+          OR ARRAY_CONTAINS('*'::VARIANT, :REPROCESS))
+    ),
+    analyzed_images AS (
+      -- One structured-output call per image returns counts and caption
+      -- together; response_format constrains the reply to this schema
+      SELECT
+        name,
+        etag,
+        file,
+        last_modified,
+        TO_VARCHAR(AI_COMPLETE(
+          '{{ai_model}}',
+          'Count the people in this conference photo and how many of them have a hand raised. '
+          || 'Also write a brief caption (under 10 words) in the form '
+          || 'Event Name - Location - Session, based on the filename: ' || name || '. '
+          || 'Filename codes: SUM=Summit, NS=Northstar, SWT=Snowflake World Tour; '
+          || 'location codes like PUNE, DELHI, MEL are cities; add "Workshop" if the '
+          || 'filename suggests a hands-on session. If no people are visible, use zeros. '
+          || 'Return the filename''s event code (SUM, NS or SWT, else OTHER) as event_code '
+          || 'and its city in upper case (else UNKNOWN) as city.',
+          file,
+          {},
+          {
+            'type': 'json',
+            'schema': {
+              'type': 'object',
+              'properties': {
+                'total_attendees': {'type': 'integer'},
+                'raised_hands': {'type': 'integer'},
+                'caption': {'type': 'string'},
+                'event_code': {'type': 'string'},
+                'city': {'type': 'string'}
+              },
+              'required': ['total_attendees', 'raised_hands', 'caption', 'event_code', 'city']
+            }
+          }
+        )) AS raw
+      FROM pending_images
+    ),
+    parsed_images AS (
+      SELECT *, TRY_PARSE_JSON(raw) AS result FROM analyzed_images
+    )
+    SELECT
+      name,
+      etag,
+      file AS file_name,
+      last_modified,
+      result:caption::VARCHAR AS caption,
+      raw,
+      result:total_attendees::INTEGER AS total_attendees,
+      result:raised_hands::INTEGER AS raised_hands,
+      -- Derived here rather than asked of the model
+      IFF(result:total_attendees::INTEGER > 0,
+          ROUND(result:raised_hands::INTEGER * 100 / result:total_attendees::INTEGER, 2),
+          0)::FLOAT AS percentage_with_hands_up,
+      UPPER(NULLIF(TRIM(result:event_code::VARCHAR), '')) AS event_code,
+      UPPER(NULLIF(TRIM(result:city::VARCHAR), '')) AS city
+    FROM parsed_images
+  ) s
+  ON t.name = s.name
+  WHEN MATCHED THEN UPDATE SET
+    etag = s.etag,
+    file_name = s.file_name,
+    last_modified = s.last_modified,
+    caption = s.caption,
+    raw = s.raw,
+    total_attendees = s.total_attendees,
+    raised_hands = s.raised_hands,
+    percentage_with_hands_up = s.percentage_with_hands_up,
+    event_code = s.event_code,
+    city = s.city,
+    analyzed_at = CURRENT_TIMESTAMP()
+  WHEN NOT MATCHED THEN INSERT (
+    name, etag, file_name, last_modified, caption, raw,
+    total_attendees, raised_hands, percentage_with_hands_up, event_code, city, analyzed_at
+  ) VALUES (
+    s.name, s.etag, s.file_name, s.last_modified, s.caption, s.raw,
+    s.total_attendees, s.raised_hands, s.percentage_with_hands_up, s.event_code, s.city,
+    CURRENT_TIMESTAMP()
+  );
+  analyzed := SQLROWCOUNT;
+
+  DELETE FROM SMART_CROWD_COUNTER_RESULTS
+  WHERE name NOT IN (
+    SELECT relative_path FROM DIRECTORY('@{{database}}.{{schema}}.{{stage}}')
+  );
+  removed := SQLROWCOUNT;
+
+  RETURN analyzed || ' image(s) analyzed, ' || removed || ' removed';
+END;
+$$;
+
+-- ============================================================================
+-- Read-only View over the Stored Results
+-- ============================================================================
+-- Same columns the app has always read (plus LAST_MODIFIED / ANALYZED_AT);
+-- reading it never calls AI_COMPLETE.
+
+CREATE OR REPLACE VIEW SMART_CROWD_COUNTER AS
 SELECT
   name,
-  file AS file_name,
-  -- Generate caption based on filename patterns
-  AI_COMPLETE(
-    '{{ai_model}}',
-    'Create a brief caption for a conference photo with filename: ' || name || '. '
-    || 'Context: SUM=Summit, NS=Northstar, SWT=Snowflake World Tour. '
-    || 'Location codes like PUNE, DELHI, MEL indicate cities. '
-    || 'Format: Event Name - Location - Session. '
-    || 'Add "Workshop" if filename suggests hands-on session. '
-    || 'Keep it under 10 words.'
-  ) AS caption,
-  attendees_count AS raw,
-  TRY_PARSE_JSON(attendees_count):total_attendees::INTEGER AS total_attendees,
-  TRY_PARSE_JSON(attendees_count):raised_hands::INTEGER AS raised_hands,
-  TRY_PARSE_JSON(attendees_count):percentage_with_hands_up::FLOAT AS percentage_with_hands_up
-FROM processed_images
+  file_name,
+  caption,
+  raw,
+  total_attendees,
+  raised_hands,
+  percentage_with_hands_up,
+  last_modified,
+  analyzed_at
+FROM SMART_CROWD_COUNTER_RESULTS
 ORDER BY name;
 
+-- ============================================================================
+-- Aggregates by Event and City
+-- ============================================================================
+-- One row per event code and one per city (GROUPING SETS, one scan), so
+-- the app's dashboard never pulls per-photo rows. Rows analyzed before
+-- event_code/city existed fall back to the SUM/NS/SWT token in the
+-- filename and the Location part of the caption.
+
+CREATE OR REPLACE VIEW SMART_CROWD_COUNTER_SUMMARY AS
+WITH labeled AS (
+  SELECT
+    COALESCE(
+      event_code,
+      REGEXP_SUBSTR(UPPER(name), '(^|[^A-Z])(SUM|NS|SWT)([^A-Z]|$)', 1, 1, 'e', 2),
+      'OTHER'
+    ) AS event_code,
+    COALESCE(city, UPPER(NULLIF(TRIM(SPLIT_PART(caption, ' - ', 2)), '')), 'UNKNOWN') AS city,
+    total_attendees,
+    raised_hands,
+    analyzed_at
+  FROM SMART_CROWD_COUNTER_RESULTS
+)
+SELECT
+  IFF(GROUPING(event_code) = 0, 'EVENT', 'CITY') AS dimension,
+  IFF(GROUPING(event_code) = 0, event_code, city) AS value,
+  COUNT(*) AS photos,
+  SUM(total_attendees) AS total_attendees,
+  SUM(raised_hands) AS raised_hands,
+  ROUND(SUM(raised_hands) * 100 / NULLIF(SUM(total_attendees), 0), 2)::FLOAT AS conversion,
+  MAX(analyzed_at) AS last_analyzed_at
+FROM labeled
+GROUP BY GROUPING SETS ((event_code), (city));
+
 -- ============================================================================
 -- Verify Setup
 -- ============================================================================
 
 SHOW STAGES LIKE '{{stage}}' IN SCHEMA {{database}}.{{schema}};
-SHOW VIEWS LIKE 'SMART_CROWD_COUNTER' IN SCHEMA {{database}}.{{schema}};
+SHOW TABLES LIKE 'SMART_CROWD_COUNTER_RESULTS' IN SCHEMA {{database}}.{{schema}};
+SHOW PROCEDURES LIKE 'REFRESH_SMART_CROWD_COUNTER' IN SCHEMA {{database}}.{{schema}};
+SHOW VIEWS LIKE 'SMART_CROWD_COUNTER%' IN SCHEMA {{database}}.{{schema}};
 
 SELECT 'Setup complete! Upload images to stage: @{{database}}.{{schema}}.{{stage}}' AS status;
@@ -0,0 +1,16 @@
+--!jinja
+-- Smart Crowd Counter - scc-up step: demo database
+-- Creates the database and transfers ownership to the demo role.
+-- Requires the demo role (sql/up/role.sql).
+--
+-- Usage:
+--   snow sql -f sql/up/database.sql \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable demo_role=$DEMO_ROLE \
+--     --variable database=$DEMO_DATABASE
+
+USE ROLE {{admin_role}};
+
+CREATE DATABASE IF NOT EXISTS {{database}};
+GRANT OWNERSHIP ON DATABASE {{database}} TO ROLE {{demo_role}} COPY CURRENT GRANTS;
@@ -0,0 +1,17 @@
+--!jinja
+-- Smart Crowd Counter - scc-up step: demo role
+-- Creates the least-privilege demo role and grants it to the current user.
+-- Same statements as the role section of create_role.sql, split out so
+-- scc-up can run it in parallel with warehouse creation.
+--
+-- Usage:
+--   snow sql -f sql/up/role.sql \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable demo_role=$DEMO_ROLE \
+--     --variable snowflake_user=$SNOWFLAKE_USER
+
+USE ROLE {{admin_role}};
+
+CREATE ROLE IF NOT EXISTS {{demo_role}};
+GRANT ROLE {{demo_role}} TO USER {{snowflake_user}};
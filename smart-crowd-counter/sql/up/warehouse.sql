@@ -0,0 +1,19 @@
+--!jinja
+-- Smart Crowd Counter - scc-up step: warehouse
+-- Creates the warehouse only; grants are a separate step so this can run
+-- before the demo role exists.
+--
+-- Usage:
+--   snow sql -f sql/up/warehouse.sql \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable warehouse=$SNOWFLAKE_WAREHOUSE
+
+USE ROLE {{admin_role}};
+
+CREATE WAREHOUSE IF NOT EXISTS {{warehouse}}
+  WAREHOUSE_SIZE = 'XSMALL'
+  AUTO_SUSPEND = 60
+  AUTO_RESUME = TRUE
+  INITIALLY_SUSPENDED = TRUE
+  COMMENT = 'Warehouse for Smart Crowd Counter demo';
@@ -0,0 +1,16 @@
+--!jinja
+-- Smart Crowd Counter - scc-up step: warehouse grants
+-- Grants USAGE + OPERATE on the warehouse to the demo role.
+-- Requires both the demo role and the warehouse.
+--
+-- Usage:
+--   snow sql -f sql/up/warehouse_grants.sql \
+--     --enable-templating ALL \
+--     --variable admin_role=$ADMIN_ROLE \
+--     --variable demo_role=$DEMO_ROLE \
+--     --variable warehouse=$SNOWFLAKE_WAREHOUSE
+
+USE ROLE {{admin_role}};
+
+GRANT USAGE ON WAREHOUSE {{warehouse}} TO ROLE {{demo_role}};
+GRANT OPERATE ON WAREHOUSE {{warehouse}} TO ROLE {{demo_role}};